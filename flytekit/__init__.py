@@ -178,6 +178,7 @@ Task Utilities
    :toctree: generated/
 
    HashMethod
+   Compression
 
 Documentation
 =============
@@ -210,6 +211,7 @@ from flytekit.core.array_node_map_task import map_task
 from flytekit.core.base_sql_task import SQLTask
 from flytekit.core.base_task import SecurityContext, TaskMetadata, kwtypes
 from flytekit.core.checkpointer import Checkpoint
+from flytekit.core.compression import Compression
 from flytekit.core.condition import conditional
 from flytekit.core.container_task import ContainerTask
 from flytekit.core.context_manager import ExecutionParameters, FlyteContext, FlyteContextManager
@@ -22,6 +22,7 @@ from flytekit.configuration import (
 )
 from flytekit.core import constants as _constants
 from flytekit.core import utils
+from flytekit.core.array_node_map_task import ArrayNodeMapTask
 from flytekit.core.base_task import IgnoreOutputs, PythonTask
 from flytekit.core.checkpointer import SyncCheckpoint
 from flytekit.core.context_manager import (
@@ -43,6 +44,7 @@ from flytekit.models import literals as _literal_models
 from flytekit.models.core import errors as _error_models
 from flytekit.models.core import execution as _execution_models
 from flytekit.models.core import identifier as _identifier
+from flytekit.models.core import types as _core_types
 from flytekit.tools.fast_registration import download_distribution as _download_distribution
 from flytekit.tools.module_loader import load_object_from_module
 
@@ -69,6 +71,40 @@ def _compute_array_job_index():
     return offset
 
 
+def _prefetch_blobs(ctx: FlyteContext, lit: _literal_models.Literal):
+    if lit.collection:
+        for v in lit.collection.literals:
+            _prefetch_blobs(ctx, v)
+    elif lit.map:
+        for v in lit.map.literals.values():
+            _prefetch_blobs(ctx, v)
+    elif lit.scalar:
+        if lit.scalar.blob and ctx.file_access.is_remote(lit.scalar.blob.uri):
+            is_multipart = (
+                lit.scalar.blob.metadata.type.dimensionality == _core_types.BlobType.BlobDimensionality.MULTIPART
+            )
+            ctx.file_access.prefetch_data(lit.scalar.blob.uri, is_multipart=is_multipart)
+        elif lit.scalar.union:
+            _prefetch_blobs(ctx, lit.scalar.union.value)
+
+
+def _prefetch_inputs(ctx: FlyteContext, inputs_path: str):
+    """
+    Downloads the inputs file and starts downloading every remote blob (FlyteFile, FlyteDirectory) in it in background
+    threads, so that data transfer overlaps with loading the task and user setup. The downloads are picked up by the
+    FileAccessProvider when the inputs are actually accessed, user code only waits for the blobs it touches.
+    Failures are only logged here, they surface again when the inputs are read in _dispatch_execute.
+    """
+    try:
+        local_inputs_file = ctx.file_access.prefetch_data(inputs_path).result()
+        input_proto = utils.load_proto_from_file(_literals_pb2.LiteralMap, local_inputs_file)
+        idl_input_literals = _literal_models.LiteralMap.from_flyte_idl(input_proto)
+        for lit in idl_input_literals.literals.values():
+            _prefetch_blobs(ctx, lit)
+    except Exception as e:
+        logger.warning(f"Failed to prefetch inputs from {inputs_path}, they will be downloaded on access. Error: {e}")
+
+
 def _dispatch_execute(
     ctx: FlyteContext,
     task_def: PythonTask,
@@ -90,8 +126,12 @@ def _dispatch_execute(
         # Step1
         local_inputs_file = os.path.join(ctx.execution_state.working_dir, "inputs.pb")
         ctx.file_access.get_data(inputs_path, local_inputs_file)
-        input_proto = utils.load_proto_from_file(_literals_pb2.LiteralMap, local_inputs_file)
-        idl_input_literals = _literal_models.LiteralMap.from_flyte_idl(input_proto)
+        if isinstance(task_def, ArrayNodeMapTask):
+            # Array jobs only parse the elements of the mapped inputs at their own index
+            idl_input_literals = task_def.read_inputs(local_inputs_file)
+        else:
+            input_proto = utils.load_proto_from_file(_literals_pb2.LiteralMap, local_inputs_file)
+            idl_input_literals = _literal_models.LiteralMap.from_flyte_idl(input_proto)
 
         # Step2
         # Decorate the dispatch execute function before calling it, this wraps all exceptions into one
@@ -366,15 +406,23 @@ def _execute_task(
         dynamic_addl_distro,
         dynamic_dest_dir,
     ) as ctx:
-        resolver_obj = load_object_from_module(resolver)
-        # Use the resolver to load the actual task object
-        _task_def = resolver_obj.load_task(loader_args=resolver_args)
-        if test:
-            logger.info(
-                f"Test detected, returning. Args were {inputs} {output_prefix} {raw_output_data_prefix} {resolver} {resolver_args}"
-            )
-            return
-        _handle_annotated_task(ctx, _task_def, inputs, output_prefix)
+        # Map tasks are excluded on purpose, every array job would download the blobs of all of its siblings.
+        prefetch = not test and os.environ.get(_constants.PREFETCH_INPUTS_ENV_VAR, "").lower() == "true"
+        if prefetch:
+            _prefetch_inputs(ctx, inputs)
+        try:
+            resolver_obj = load_object_from_module(resolver)
+            # Use the resolver to load the actual task object
+            _task_def = resolver_obj.load_task(loader_args=resolver_args)
+            if test:
+                logger.info(
+                    f"Test detected, returning. Args were {inputs} {output_prefix} {raw_output_data_prefix} {resolver} {resolver_args}"
+                )
+                return
+            _handle_annotated_task(ctx, _task_def, inputs, output_prefix)
+        finally:
+            if prefetch:
+                ctx.file_access.cancel_prefetches()
 
 
 @_scopes.system_entry_point
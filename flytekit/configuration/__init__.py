@@ -600,6 +600,9 @@ class DataConfig(object):
     s3: S3Config = S3Config()
     gcs: GCSConfig = GCSConfig()
     azure: AzureBlobStorageConfig = AzureBlobStorageConfig()
+    block_size: typing.Optional[int] = None
+    max_concurrency: typing.Optional[int] = None
+    shared_cache_dir: typing.Optional[str] = None
 
     @classmethod
     def auto(cls, config_file: typing.Union[str, ConfigFile] = None) -> DataConfig:
@@ -608,6 +611,9 @@ class DataConfig(object):
             azure=AzureBlobStorageConfig.auto(config_file),
             s3=S3Config.auto(config_file),
             gcs=GCSConfig.auto(config_file),
+            block_size=_internal.Data.BLOCK_SIZE.read(config_file),
+            max_concurrency=_internal.Data.MAX_CONCURRENCY.read(config_file),
+            shared_cache_dir=_internal.Data.SHARED_CACHE_DIR.read(config_file),
         )
 
 
@@ -619,6 +625,14 @@ class LocalConfig(object):
 
     cache_enabled: bool = True
     cache_overwrite: bool = False
+    map_executor: str = "serial"
+    workflow_concurrency: int = 1
+    workflow_executor: str = "thread"
+    pipeline_map_tasks: bool = False
+    eager_executor: str = "thread"
+    eager_concurrency: typing.Optional[int] = None
+    cpu: typing.Optional[str] = None
+    memory: typing.Optional[str] = None
 
     @classmethod
     def auto(cls, config_file: typing.Union[str, ConfigFile] = None) -> LocalConfig:
@@ -626,6 +640,14 @@ class LocalConfig(object):
         kwargs = {}
         kwargs = set_if_exists(kwargs, "cache_enabled", _internal.Local.CACHE_ENABLED.read(config_file))
         kwargs = set_if_exists(kwargs, "cache_overwrite", _internal.Local.CACHE_OVERWRITE.read(config_file))
+        kwargs = set_if_exists(kwargs, "map_executor", _internal.Local.MAP_EXECUTOR.read(config_file))
+        kwargs = set_if_exists(kwargs, "workflow_concurrency", _internal.Local.WORKFLOW_CONCURRENCY.read(config_file))
+        kwargs = set_if_exists(kwargs, "workflow_executor", _internal.Local.WORKFLOW_EXECUTOR.read(config_file))
+        kwargs = set_if_exists(kwargs, "pipeline_map_tasks", _internal.Local.PIPELINE_MAP_TASKS.read(config_file))
+        kwargs = set_if_exists(kwargs, "eager_executor", _internal.Local.EAGER_EXECUTOR.read(config_file))
+        kwargs = set_if_exists(kwargs, "eager_concurrency", _internal.Local.EAGER_CONCURRENCY.read(config_file))
+        kwargs = set_if_exists(kwargs, "cpu", _internal.Local.CPU.read(config_file))
+        kwargs = set_if_exists(kwargs, "memory", _internal.Local.MEMORY.read(config_file))
         return LocalConfig(**kwargs)
 
 
@@ -66,10 +66,71 @@ class AZURE(object):
     CLIENT_SECRET = ConfigEntry(LegacyConfigEntry(SECTION, "client_secret"))
 
 
+class Data(object):
+    SECTION = "data"
+    BLOCK_SIZE = ConfigEntry(LegacyConfigEntry(SECTION, "block_size", int))
+    """
+    Part size in bytes of the multipart uploads of streamed writes, and read-ahead size of streamed reads.
+    """
+    MAX_CONCURRENCY = ConfigEntry(LegacyConfigEntry(SECTION, "max_concurrency", int))
+    """
+    Number of parts an object store upload sends concurrently, and of files read concurrently when decoding a
+    StructuredDataset made of many files.
+    """
+    SHARED_CACHE_DIR = ConfigEntry(LegacyConfigEntry(SECTION, "shared_cache_dir"))
+    """
+    Node local directory, e.g. a host path mounted into every pod, where inputs that many tasks read, like the bound
+    inputs of a map task, are downloaded once and shared by all tasks running on the node. Every task gets its own
+    copy of the data. Replaced remote data is downloaded again and its old copy removed, but the data of remote paths
+    that are not read anymore is never removed by flytekit, the directory has to be cleaned up by other means.
+    """
+
+
 class Local(object):
     SECTION = "local"
     CACHE_ENABLED = ConfigEntry(LegacyConfigEntry(SECTION, "cache_enabled", bool))
     CACHE_OVERWRITE = ConfigEntry(LegacyConfigEntry(SECTION, "cache_overwrite", bool))
+    MAP_EXECUTOR = ConfigEntry(LegacyConfigEntry(SECTION, "map_executor"))
+    """
+    How the instances of a map task run in local executions: ``serial`` (the default, one after the other in the
+    current process), ``thread`` (a thread pool, for I/O bound tasks) or ``process`` (a pool of forked processes, for
+    CPU bound tasks whose outputs and exceptions can be pickled, and that have no side effects on the current process).
+    """
+    WORKFLOW_CONCURRENCY = ConfigEntry(LegacyConfigEntry(SECTION, "workflow_concurrency", int))
+    """
+    Maximum number of nodes of a workflow that run at the same time in local executions. Nodes run one after the other
+    in the order they were declared if this is not more than one.
+    """
+    WORKFLOW_EXECUTOR = ConfigEntry(LegacyConfigEntry(SECTION, "workflow_executor"))
+    """
+    Whether the nodes of a workflow run in a ``thread`` pool or in a pool of forked processes (``process``) in local
+    executions, when ``workflow_concurrency`` is more than one.
+    """
+    PIPELINE_MAP_TASKS = ConfigEntry(LegacyConfigEntry(SECTION, "pipeline_map_tasks", bool))
+    """
+    In local executions, feed every output of a map task to the map task that maps over them as soon as it is
+    available, rather than after all instances of the first map task completed.
+    """
+    CPU = ConfigEntry(LegacyConfigEntry(SECTION, "cpu"))
+    """
+    Number of CPUs, e.g. ``8`` or ``3500m``, that the tasks running concurrently in local executions may request in
+    total. All CPUs of the machine by default.
+    """
+    MEMORY = ConfigEntry(LegacyConfigEntry(SECTION, "memory"))
+    """
+    Memory, e.g. ``16Gi``, that the tasks running concurrently in local executions may request in total. The physical
+    memory of the machine by default.
+    """
+    EAGER_EXECUTOR = ConfigEntry(LegacyConfigEntry(SECTION, "eager_executor"))
+    """
+    Where the tasks awaited by an eager workflow run in local executions: in a ``thread`` pool, in a forked ``process``
+    per task, or ``serial`` on the event loop, one after the other.
+    """
+    EAGER_CONCURRENCY = ConfigEntry(LegacyConfigEntry(SECTION, "eager_concurrency", int))
+    """
+    Maximum number of tasks of an eager workflow that run at the same time in local executions, the number of CPUs if
+    not set.
+    """
 
 
 class Credentials(object):
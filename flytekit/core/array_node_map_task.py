@@ -2,20 +2,22 @@
 import functools
 import hashlib
 import logging
-import math
 import os  # TODO: use flytekit logger
 from contextlib import contextmanager
-from typing import Any, Dict, List, Optional, Set, Union, cast
+from typing import Any, Coroutine, Dict, List, Optional, Set, Tuple, Union, cast
 
 from flytekit.configuration import SerializationSettings
 from flytekit.core import tracker
 from flytekit.core.base_task import PythonTask, TaskResolverMixin
 from flytekit.core.context_manager import ExecutionState, FlyteContext, FlyteContextManager
 from flytekit.core.interface import transform_interface_to_list_interface
+from flytekit.core.literal_slicing import read_sliced_literal_map
+from flytekit.core.map_executor import MapStage, execute_mapped
 from flytekit.core.python_function_task import PythonFunctionTask, PythonInstanceTask
 from flytekit.core.utils import timeit
 from flytekit.exceptions import scopes as exception_scopes
-from flytekit.loggers import logger
+from flytekit.models import dynamic_job as _dynamic_job
+from flytekit.models import literals as _literal_models
 from flytekit.models.array_job import ArrayJob
 from flytekit.models.core.workflow import NodeMetadata
 from flytekit.models.interface import Variable
@@ -87,6 +89,8 @@ class ArrayNodeMapTask(PythonTask):
         self._concurrency: Optional[int] = concurrency
         self._min_successes: Optional[int] = min_successes
         self._min_success_ratio: Optional[float] = min_success_ratio
+        # Set while the inputs of an array job only hold the elements of its own index, see dispatch_execute
+        self._inputs_sliced = False
         self._collection_interface = collection_interface
 
         if "metadata" not in kwargs and actual_task.metadata:
@@ -208,6 +212,50 @@ class ArrayNodeMapTask(PythonTask):
             kwargs = {**self._partial.keywords, **kwargs}
         return super().__call__(*args, **kwargs)
 
+    def dispatch_execute(
+        self, ctx: FlyteContext, input_literal_map: _literal_models.LiteralMap
+    ) -> Union[_literal_models.LiteralMap, _dynamic_job.DynamicJobSpec, Coroutine]:
+        """
+        In an array job, only the elements of the mapped inputs at the index of the job are converted to Python
+        values, rather than all of them, and the blobs of the bound inputs, that every job reads, are shared by the
+        jobs running on the same node, see :py:meth:`flytekit.core.data_persistence.FileAccessProvider.share_data`.
+        """
+        if not (ctx.execution_state and ctx.execution_state.mode == ExecutionState.Mode.TASK_EXECUTION):
+            return super().dispatch_execute(ctx, input_literal_map)
+
+        start, end = self._input_slice()
+        literals = {}
+        for k, v in input_literal_map.literals.items():
+            if k in self.bound_inputs or v.collection is None:
+                for uri in _blob_uris(v):
+                    ctx.file_access.share_data(uri)
+                literals[k] = v
+            elif isinstance(input_literal_map, _SlicedInputs):
+                literals[k] = v
+            else:
+                literals[k] = _literal_models.Literal(
+                    collection=_literal_models.LiteralCollection(literals=v.collection.literals[start:end])
+                )
+        self._inputs_sliced = True
+        try:
+            return super().dispatch_execute(ctx, _literal_models.LiteralMap(literals=literals))
+        finally:
+            self._inputs_sliced = False
+
+    def read_inputs(self, path: str) -> _literal_models.LiteralMap:
+        """
+        Reads the inputs of an array job from the inputs file at ``path``, parsing only the elements of the mapped
+        inputs at the index of the job rather than all of them.
+        """
+        start, end = self._input_slice()
+        with open(path, "rb") as f:
+            pb = read_sliced_literal_map(f, lambda k: k not in self.bound_inputs, start, end)
+        return _SlicedInputs.from_flyte_idl(pb)
+
+    def _input_slice(self) -> Tuple[int, int]:
+        task_index = self._compute_array_job_index()
+        return task_index, task_index + 1
+
     def execute(self, **kwargs) -> Any:
         ctx = FlyteContextManager.current_context()
         if ctx.execution_state and ctx.execution_state.mode == ExecutionState.Mode.TASK_EXECUTION:
@@ -216,7 +264,8 @@ class ArrayNodeMapTask(PythonTask):
         return self._raw_execute(**kwargs)
 
     def _execute_map_task(self, _: FlyteContext, **kwargs) -> Any:
-        task_index = self._compute_array_job_index()
+        # Sliced inputs start at the first element of this job
+        task_index = 0 if self._inputs_sliced else self._compute_array_job_index()
         map_task_inputs = {}
         for k in self.interface.inputs.keys():
             v = kwargs[k]
@@ -248,7 +297,7 @@ class ArrayNodeMapTask(PythonTask):
 
         ctx = FlyteContextManager.current_context()
         if ctx.execution_state and ctx.execution_state.is_local_execution():
-            # In workflow execution mode we actually need to use the parent (mapper) task output interface.
+            # In workflow execution mode we actually need to use the parent (mapper) task output interface
             return self.interface.outputs
         return self.python_function_task.interface.outputs
 
@@ -261,10 +310,24 @@ class ArrayNodeMapTask(PythonTask):
         """
         ctx = FlyteContextManager.current_context()
         if ctx.execution_state and ctx.execution_state.is_local_execution():
-            # In workflow execution mode we actually need to use the parent (mapper) task output interface.
+            # In workflow execution mode we actually need to use the parent (mapper) task output interface
             return self._python_interface.outputs[k]
         return self.python_function_task.python_interface.outputs[k]
 
+    def local_stage(self, inputs: Dict[str, Any], link: Optional[str] = None) -> MapStage:
+        """
+        Returns the instances to run for the given native inputs in a local execution.
+        """
+        return MapStage(
+            self._run_task,
+            inputs,
+            self.bound_inputs,
+            min_successes=self._min_successes,
+            min_success_ratio=self._min_success_ratio,
+            concurrency=self._concurrency,
+            link=link,
+        )
+
     def _raw_execute(self, **kwargs) -> Any:
         """
         This is called during locally run executions. Unlike array task execution on the Flyte platform, _raw_execute
@@ -273,43 +336,16 @@ class ArrayNodeMapTask(PythonTask):
         outputs_expected = True
         if not self.interface.outputs:
             outputs_expected = False
-        outputs = []
-
-        mapped_tasks_count = 0
-        if self._run_task.interface.inputs.items():
-            for k in self._run_task.interface.inputs.keys():
-                v = kwargs[k]
-                if isinstance(v, list) and k not in self.bound_inputs:
-                    mapped_tasks_count = len(v)
-                    break
-
-        failed_count = 0
-        min_successes = mapped_tasks_count
-        if self._min_successes:
-            min_successes = self._min_successes
-        elif self._min_success_ratio:
-            min_successes = math.ceil(min_successes * self._min_success_ratio)
-
-        for i in range(mapped_tasks_count):
-            single_instance_inputs = {}
-            for k in self.interface.inputs.keys():
-                v = kwargs[k]
-                if isinstance(v, list) and k not in self._bound_inputs:
-                    single_instance_inputs[k] = kwargs[k][i]
-                else:
-                    single_instance_inputs[k] = kwargs[k]
-            try:
-                o = exception_scopes.user_entry_point(self._run_task.execute)(**single_instance_inputs)
-                if outputs_expected:
-                    outputs.append(o)
-            except Exception as exc:
-                outputs.append(None)
-                failed_count += 1
-                if mapped_tasks_count - failed_count < min_successes:
-                    logger.error("The number of successful tasks is lower than the minimum ratio")
-                    raise exc
-
-        return outputs
+
+        stage = self.local_stage(kwargs)
+        outputs = execute_mapped(
+            stage.task,
+            stage.count,
+            stage.instance_inputs,
+            stage.required_successes(stage.count),
+            concurrency=stage.concurrency,
+        )
+        return outputs if outputs_expected else []
 
 
 def map_task(
@@ -332,7 +368,31 @@ def map_task(
     :param min_success_ratio: If specified, this determines the minimum fraction of total jobs which can complete
         successfully before terminating this task and marking it successful.
     """
-    return ArrayNodeMapTask(task_function, concurrency=concurrency, min_success_ratio=min_success_ratio, **kwargs)
+    return ArrayNodeMapTask(
+        task_function,
+        concurrency=concurrency,
+        min_success_ratio=min_success_ratio,
+        **kwargs,
+    )
+
+
+class _SlicedInputs(_literal_models.LiteralMap):
+    """
+    Inputs of an array job whose mapped collections only hold the elements at the index of the job already.
+    """
+
+
+def _blob_uris(lit: _literal_models.Literal) -> List[str]:
+    if lit.collection:
+        return [uri for v in lit.collection.literals for uri in _blob_uris(v)]
+    if lit.map:
+        return [uri for v in lit.map.literals.values() for uri in _blob_uris(v)]
+    if lit.scalar:
+        if lit.scalar.blob:
+            return [lit.scalar.blob.uri]
+        if lit.scalar.union:
+            return _blob_uris(lit.scalar.union.value)
+    return []
 
 
 class ArrayNodeMapTaskResolver(tracker.TrackedInstance, TaskResolverMixin):
@@ -381,7 +441,9 @@ class ArrayNodeMapTaskResolver(tracker.TrackedInstance, TaskResolverMixin):
         _task_def = resolver_obj.load_task(loader_args=resolver_args)
         bound_inputs = set(bound_vars.split(","))
         return ArrayNodeMapTask(
-            python_function_task=_task_def, max_concurrency=max_concurrency, bound_inputs=bound_inputs
+            python_function_task=_task_def,
+            max_concurrency=max_concurrency,
+            bound_inputs=bound_inputs,
         )
 
     def loader_args(self, settings: SerializationSettings, t: ArrayNodeMapTask) -> List[str]:  # type:ignore
@@ -0,0 +1,154 @@
+import gzip
+import io
+import os
+import shutil
+import typing
+
+from typing_extensions import Annotated, get_args, get_origin
+
+from flytekit.models.literals import Literal
+
+COMPRESSION_METADATA_KEY = "flyte.compression"
+"""
+Key in the metadata of a literal that records the codec its blob was compressed with on upload.
+"""
+
+CODEC_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+_COPY_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+class Compression(object):
+    """
+    This is used to annotate a file-like output (FlyteFile, TextIO, BinaryIO) that should be compressed before it
+    is uploaded. For example,
+
+    @task
+    def t1() -> Annotated[FlyteFile, Compression("zstd")]:
+        ...
+
+    The codec is recorded in the metadata of the output literal, and consumers decompress the data transparently when
+    it is downloaded or opened. Files uploaded to a ``remote_path`` the user chose are never compressed, and neither
+    are files inside dataclasses, whose JSON cannot carry the codec.
+    """
+
+    def __init__(self, codec: str = "zstd"):
+        """
+        :param codec: Either ``gzip`` or ``zstd``. zstd needs the ``zstandard`` package to be installed.
+        """
+        if codec not in CODEC_EXTENSIONS:
+            raise ValueError(f"Unsupported compression codec {codec}, expected one of {list(CODEC_EXTENSIONS)}")
+        self._codec = codec
+
+    @property
+    def codec(self) -> str:
+        return self._codec
+
+
+def get_compression(t: typing.Type) -> typing.Optional[Compression]:
+    if get_origin(t) is Annotated:
+        for annotation in get_args(t)[1:]:
+            if isinstance(annotation, Compression):
+                return annotation
+    return None
+
+
+def get_codec(t: typing.Type) -> typing.Optional[str]:
+    """
+    Returns the codec an output of type ``t`` should be compressed with, i.e. the one of its :py:class:`Compression`
+    annotation if any. Nothing is compressed unless it is annotated.
+    """
+    compression = get_compression(t)
+    return compression.codec if compression is not None else None
+
+
+def get_literal_codec(lv: Literal) -> typing.Optional[str]:
+    """
+    Returns the codec the blob of the given literal was compressed with, if any.
+    """
+    if lv.metadata:
+        return lv.metadata.get(COMPRESSION_METADATA_KEY)
+    return None
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd compression requires the zstandard package, please pip install zstandard") from e
+    return zstandard
+
+
+def wrap_writer(f: typing.BinaryIO, codec: str) -> typing.BinaryIO:
+    """
+    Wraps a binary file handle so that everything written to it is compressed with ``codec``. Closing the returned
+    handle also closes ``f``.
+    """
+    if codec == "gzip":
+        # name and mtime are fixed so that compressing the same contents always gives the same bytes
+        return _ClosingGzipFile(filename="", fileobj=f, mode="wb", mtime=0)
+    if codec == "zstd":
+        return _zstandard().ZstdCompressor().stream_writer(f)
+    raise ValueError(f"Unsupported compression codec {codec}")
+
+
+def wrap_reader(f: typing.BinaryIO, codec: str) -> typing.BinaryIO:
+    """
+    Wraps a binary file handle so that reading from it returns the data decompressed with ``codec``. Closing the
+    returned handle also closes ``f``.
+    """
+    if codec == "gzip":
+        return _ClosingGzipFile(fileobj=f, mode="rb")
+    if codec == "zstd":
+        return io.BufferedReader(_zstandard().ZstdDecompressor().stream_reader(f, read_across_frames=True))
+    raise ValueError(f"Unsupported compression codec {codec}")
+
+
+def compress_file(from_path: str, to_path: str, codec: str):
+    with open(from_path, "rb") as r, wrap_writer(open(to_path, "wb"), codec) as w:
+        shutil.copyfileobj(r, w, _COPY_CHUNK_SIZE)
+
+
+def decompress_file(from_path: str, to_path: str, codec: str):
+    with wrap_reader(open(from_path, "rb"), codec) as r, open(to_path, "wb") as w:
+        shutil.copyfileobj(r, w, _COPY_CHUNK_SIZE)
+
+
+def compress_for_upload(ctx, local_path: str, codec: str) -> str:
+    """
+    Compresses a local file into a new random local directory, so that it keeps its name plus the codec extension when
+    it is uploaded, and returns the path of the compressed file.
+    """
+    compressed_path = os.path.join(
+        ctx.file_access.get_random_local_directory(), os.path.basename(local_path) + CODEC_EXTENSIONS[codec]
+    )
+    compress_file(local_path, compressed_path, codec)
+    return compressed_path
+
+
+def get_decompressed(ctx, remote_path: str, local_path: str, codec: typing.Optional[str]):
+    """
+    Downloads ``remote_path`` to ``local_path``, decompressing it with ``codec`` if one is given.
+    """
+    if not codec:
+        ctx.file_access.get_data(remote_path, local_path, is_multipart=False)
+        return
+    compressed_path = ctx.file_access.get_random_local_path(remote_path)
+    ctx.file_access.get_data(remote_path, compressed_path, is_multipart=False)
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+    decompress_file(compressed_path, local_path, codec)
+    os.remove(compressed_path)
+
+
+class _ClosingGzipFile(gzip.GzipFile):
+    """
+    GzipFile does not close a file object that was passed in, this one does.
+    """
+
+    def close(self):
+        fileobj = self.fileobj
+        try:
+            super().close()
+        finally:
+            if fileobj is not None:
+                fileobj.close()
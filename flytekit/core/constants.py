@@ -9,3 +9,7 @@ GLOBAL_INPUT_NODE_ID = ""
 
 START_NODE_ID = "start-node"
 END_NODE_ID = "end-node"
+
+# Set to "true" in a task's environment to download remote FlyteFile / FlyteDirectory inputs in the background while
+# the task is being loaded.
+PREFETCH_INPUTS_ENV_VAR = "FLYTE_PREFETCH_INPUTS"
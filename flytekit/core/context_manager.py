@@ -14,6 +14,7 @@
 from __future__ import annotations
 
 import datetime as _datetime
+import functools
 import logging as _logging
 import os
 import pathlib
@@ -25,7 +26,7 @@ from contextvars import ContextVar
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Generator, List, Optional, Union
+from typing import Callable, Generator, List, Optional, TypeVar, Union
 
 from flytekit.configuration import Config, SecretsConfig, SerializationSettings
 from flytekit.core import mock_stats, utils
@@ -45,6 +46,8 @@ if typing.TYPE_CHECKING:
 
 # Enables static type checking https://docs.python.org/3/library/typing.html#typing.TYPE_CHECKING
 
+T = TypeVar("T")
+
 flyte_context_Var: ContextVar[typing.List[FlyteContext]] = ContextVar("", default=[])
 
 if typing.TYPE_CHECKING:
@@ -918,6 +921,22 @@ class FlyteContextManager(object):
     def size() -> int:
         return len(flyte_context_Var.get())
 
+    @staticmethod
+    def propagate_context(fn: Callable[..., T]) -> Callable[..., T]:
+        """
+        Returns a function that calls ``fn`` with a copy of the current context stack. New threads start off with an
+        empty stack, so functions submitted to a thread pool should be wrapped with this. The stack is copied, so that
+        contexts pushed by one thread are not seen by the others.
+        """
+        contexts = list(flyte_context_Var.get())
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs) -> T:
+            flyte_context_Var.set(list(contexts))
+            return fn(*args, **kwargs)
+
+        return wrapper
+
     @staticmethod
     def initialize():
         """
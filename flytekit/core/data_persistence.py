@@ -17,11 +17,16 @@ simple implementation that ships with the core.
    FileAccessProvider
 
 """
+import hashlib
 import io
 import os
 import pathlib
+import queue
+import shutil
 import tempfile
+import threading
 import typing
+from concurrent.futures import Future
 from time import sleep
 from typing import Any, Dict, Optional, Union, cast
 from uuid import UUID
@@ -47,6 +52,23 @@ _ANON = "anon"
 
 Uploadable = typing.Union[str, os.PathLike, pathlib.Path, bytes, io.BufferedReader, io.BytesIO, io.StringIO]
 
+_DIGEST_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Keys of the fsspec info of an object that change when it is replaced, in order of preference
+_VERSION_INFO_KEYS = ("ETag", "etag", "VersionId", "generation", "mtime", "LastModified", "last_modified", "created")
+
+
+def file_digest(path: Union[str, os.PathLike], algorithm: str = "sha256") -> str:
+    """
+    Returns the hex digest of the file at path, reading it in chunks so that large files are never fully loaded
+    into memory.
+    """
+    h = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        while chunk := f.read(_DIGEST_CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
+
 
 def s3_setup_args(s3_cfg: configuration.S3Config, anonymous: bool = False) -> Dict[str, Any]:
     kwargs: Dict[str, Any] = {
@@ -68,6 +90,18 @@ def s3_setup_args(s3_cfg: configuration.S3Config, anonymous: bool = False) -> Di
     return kwargs
 
 
+def s3_transfer_args(data_config: DataConfig) -> Dict[str, Any]:
+    """
+    Part size and concurrency of s3fs transfers, if configured. The part size is also the read-ahead of reads.
+    """
+    kwargs: Dict[str, Any] = {}
+    if data_config.block_size:
+        kwargs["default_block_size"] = data_config.block_size
+    if data_config.max_concurrency:
+        kwargs["max_concurrency"] = data_config.max_concurrency
+    return kwargs
+
+
 def azure_setup_args(azure_cfg: configuration.AzureBlobStorageConfig, anonymous: bool = False) -> Dict[str, Any]:
     kwargs: Dict[str, Any] = {}
 
@@ -93,7 +127,7 @@ def get_fsspec_storage_options(
     if protocol == "file":
         return {"auto_mkdir": True, **kwargs}
     if protocol == "s3":
-        return {**s3_setup_args(data_config.s3, anonymous=anonymous), **kwargs}
+        return {**s3_setup_args(data_config.s3, anonymous=anonymous), **s3_transfer_args(data_config), **kwargs}
     if protocol == "gs":
         if anonymous:
             kwargs["token"] = _ANON
@@ -121,6 +155,42 @@ def retry_request(func, *args, **kwargs):
                 raise e
 
 
+class _DaemonThreadPool(object):
+    """
+    Runs functions in up to max_workers daemon threads. Unlike the threads of a ThreadPoolExecutor, which are joined at
+    interpreter exit, they do not keep the process alive once nobody waits for their results anymore.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str):
+        self._max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._threads: typing.List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(self, fn: typing.Callable[[], Any]) -> Future:
+        f: Future = Future()
+        self._queue.put((f, fn))
+        with self._lock:
+            if len(self._threads) < self._max_workers:
+                t = threading.Thread(
+                    target=self._work, name=f"{self._thread_name_prefix}_{len(self._threads)}", daemon=True
+                )
+                t.start()
+                self._threads.append(t)
+        return f
+
+    def _work(self):
+        while True:
+            f, fn = self._queue.get()
+            if not f.set_running_or_notify_cancel():
+                continue
+            try:
+                f.set_result(fn())
+            except BaseException as e:
+                f.set_exception(e)
+
+
 class FileAccessProvider(object):
     """
     This is the class that is available through the FlyteContext and can be used for persisting data to the remote
@@ -148,6 +218,8 @@ class FileAccessProvider(object):
         self._local = fsspec.filesystem(None)
 
         self._data_config = data_config if data_config else DataConfig.auto()
+        # Filesystems by protocol and arguments, so that their clients and connection pools are reused
+        self._filesystems: Dict[typing.Tuple, fsspec.AbstractFileSystem] = {}
         self._default_protocol = get_protocol(str(raw_output_prefix))
         self._default_remote = cast(fsspec.AbstractFileSystem, self.get_filesystem(self._default_protocol))
         if os.name == "nt" and raw_output_prefix.startswith("file://"):
@@ -157,6 +229,12 @@ class FileAccessProvider(object):
             if raw_output_prefix.endswith(self.sep(self._default_remote))
             else raw_output_prefix + self.sep(self._default_remote)
         )
+        # Background downloads started by prefetch_data, keyed by remote path
+        self._prefetch_lock = threading.Lock()
+        self._prefetch_executor: typing.Optional[_DaemonThreadPool] = None
+        self._prefetched: Dict[str, typing.Tuple[bool, Future]] = {}
+        # Remote paths that get_data downloads through the shared cache directory, see share_data
+        self._shared: typing.Set[str] = set()
 
     @property
     def raw_output_prefix(self) -> str:
@@ -178,11 +256,24 @@ class FileAccessProvider(object):
     ) -> fsspec.AbstractFileSystem:
         if not protocol:
             return self._default_remote
+        try:
+            key = (protocol, anonymous, tuple(sorted(kwargs.items())))
+            fs = self._filesystems.get(key)
+        except TypeError:
+            # Some argument isn't hashable, don't pool this one
+            return self._new_filesystem(protocol, anonymous, **kwargs)
+        if fs is None:
+            fs = self._new_filesystem(protocol, anonymous, **kwargs)
+            self._filesystems[key] = fs
+        return fs
+
+    def _new_filesystem(self, protocol: str, anonymous: bool, **kwargs) -> fsspec.AbstractFileSystem:
         if protocol == "file":
             kwargs["auto_mkdir"] = True
             return FlyteLocalFileSystem(**kwargs)
         elif protocol == "s3":
             s3kwargs = s3_setup_args(self._data_config.s3, anonymous=anonymous)
+            s3kwargs.update(s3_transfer_args(self._data_config))
             s3kwargs.update(kwargs)
             return fsspec.filesystem(protocol, **s3kwargs)  # type: ignore
         elif protocol == "gs":
@@ -200,6 +291,19 @@ class FileAccessProvider(object):
         protocol = get_protocol(path)
         return self.get_filesystem(protocol, anonymous=anonymous, **kwargs)
 
+    def open(self, path: str, mode: str = "rb", anonymous: bool = False, **kwargs) -> typing.IO:
+        """
+        Opens a local or remote path as a stream, e.g. for encoders to write to directly. Writes to object stores are
+        multipart uploads of ``block_size`` parts and reads are buffered with a read-ahead of ``block_size``, as set in
+        the DataConfig.
+        """
+        fs = self.get_filesystem_for_path(path, anonymous=anonymous)
+        if self._data_config.block_size:
+            kwargs.setdefault("block_size", self._data_config.block_size)
+        if "r" in mode:
+            kwargs.setdefault("cache_type", "readahead")
+        return fs.open(path, mode, **kwargs)
+
     @staticmethod
     def is_remote(path: Union[str, os.PathLike]) -> bool:
         """
@@ -405,6 +509,42 @@ class FileAccessProvider(object):
 
         raise FlyteAssertion(f"Unsupported lpath type {type(lpath)}")
 
+    def put_content_addressed(
+        self,
+        local_path: Union[str, os.PathLike],
+        store: Optional[str] = None,
+        algorithm: str = "sha256",
+        **kwargs,
+    ) -> typing.Tuple[str, str]:
+        """
+        Uploads a local file under a key derived from the digest of its contents. If an object already exists at
+        that key, the upload is skipped entirely.
+
+        Writes to:
+            <store>/<algorithm>/<digest>/<file name>
+
+        :param local_path: Path to the local file to upload
+        :param store: Remote prefix under which content addressed files are stored. Defaults to a ``cas`` folder
+            under the raw output prefix, which only deduplicates within that prefix, so pass a stable location to
+            deduplicate across executions.
+        :param algorithm: Any hash algorithm supported by hashlib
+        :param kwargs: Additional kwargs are passed into the fsspec put() call
+        :return: Returns the final path the data lives at and the hex digest of the file
+        """
+        local_path = str(local_path)
+        if not os.path.isfile(local_path):
+            raise FlyteAssertion(f"File {local_path} does not exist or is not a file")
+        with timeit(f"Compute {algorithm} digest of {local_path}"):
+            digest = file_digest(local_path, algorithm)
+
+        store = store or self.join(self.raw_output_prefix, "cas")
+        fs = self.get_filesystem_for_path(store)
+        to_path = self.join(store, algorithm, digest, self.get_file_tail(local_path), fs=fs)
+        if self.exists(to_path):
+            logger.debug(f"Content addressed file {to_path} already exists, skipping upload of {local_path}")
+            return to_path, digest
+        return self.put_data(local_path, to_path, **kwargs), digest
+
     @staticmethod
     def get_random_string() -> str:
         return UUID(int=random.getrandbits(128)).hex
@@ -497,12 +637,170 @@ class FileAccessProvider(object):
         """
         return self.put_data(local_path, remote_path, is_multipart=True, **kwargs)
 
+    def prefetch_data(self, remote_path: str, is_multipart: bool = False) -> Future:
+        """
+        Starts downloading remote_path in a background thread and returns a future of the local path it is downloaded
+        to. A later get_data call for the same remote path waits only for this download and then moves the data to
+        the requested local path, instead of downloading it again.
+
+        :param remote_path:
+        :param is_multipart:
+        """
+        with self._prefetch_lock:
+            if remote_path in self._prefetched:
+                return self._prefetched[remote_path][1]
+            if self._prefetch_executor is None:
+                self._prefetch_executor = _DaemonThreadPool(
+                    max_workers=min(32, (os.cpu_count() or 1) + 4), thread_name_prefix="flyte-prefetch"
+                )
+            local_path = self.get_random_local_directory() if is_multipart else self.get_random_local_path(remote_path)
+
+            def _download() -> str:
+                pathlib.Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+                with timeit(f"Prefetch data to local from {remote_path}"):
+                    self.get(remote_path, to_path=local_path, recursive=is_multipart)
+                return local_path
+
+            logger.debug(f"Prefetching {remote_path} to {local_path}")
+            f = self._prefetch_executor.submit(_download)
+            self._prefetched[remote_path] = (is_multipart, f)
+            return f
+
+    def is_prefetching(self, remote_path: str) -> bool:
+        """
+        Returns True if remote_path was prefetched and the data wasn't claimed by a get_data call yet.
+        """
+        with self._prefetch_lock:
+            return remote_path in self._prefetched
+
+    def cancel_prefetches(self):
+        """
+        Cancels all prefetches that haven't started yet. Downloads that are already running are not interrupted, but
+        as they run in daemon threads they do not delay the exit of the process either.
+        """
+        with self._prefetch_lock:
+            for _, f in self._prefetched.values():
+                f.cancel()
+            self._prefetched.clear()
+
+    def _claim_prefetched(self, remote_path: str, local_path: str, is_multipart: bool) -> bool:
+        """
+        Moves prefetched data for remote_path to local_path, waiting for the prefetch to finish if necessary.
+        Returns False if there is no usable prefetch, in which case the caller should download as usual.
+        """
+        with self._prefetch_lock:
+            if remote_path not in self._prefetched or self._prefetched[remote_path][0] != is_multipart:
+                return False
+            _, f = self._prefetched.pop(remote_path)
+        try:
+            prefetched_path = f.result()
+        except Exception as e:
+            logger.warning(f"Prefetching {remote_path} failed, downloading it again. Error: {e}")
+            return False
+        if os.path.isdir(local_path) and os.listdir(local_path):
+            # Merged into the existing directory, like a download into it would be
+            shutil.copytree(prefetched_path, local_path, copy_function=shutil.move, dirs_exist_ok=True)
+            shutil.rmtree(prefetched_path)
+        else:
+            if os.path.isdir(local_path):
+                os.rmdir(local_path)
+            pathlib.Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(prefetched_path, local_path)
+        logger.debug(f"Using prefetched data for {remote_path}")
+        return True
+
+    def share_data(self, remote_path: str):
+        """
+        Marks remote_path as data that many tasks on the same node read, e.g. a bound input of a map task. If a shared
+        cache directory is configured, get_data downloads it only once per node into that directory, and copies it to
+        the requested local path, so that a task modifying its copy does not affect the other tasks. The cache is keyed
+        on the version of the remote data, and only the latest version of every remote path is kept. Data of remote
+        paths that are not read anymore is never removed by flytekit.
+        """
+        if self._data_config.shared_cache_dir and self.is_remote(remote_path):
+            self._shared.add(remote_path)
+
+    def _shared_version(self, remote_path: str, is_multipart: bool) -> str:
+        """
+        Returns a digest of the names, sizes and versions, i.e. ETags, generations or modification times, of the
+        objects under remote_path, which changes whenever they are replaced.
+        """
+        fs = self.get_filesystem_for_path(remote_path)
+        infos = fs.find(remote_path, detail=True).values() if is_multipart else [fs.info(remote_path)]
+        h = hashlib.sha256()
+        for info in sorted(infos, key=lambda i: i["name"]):
+            version = next((info[k] for k in _VERSION_INFO_KEYS if info.get(k) is not None), None)
+            h.update(f"{info['name']}:{info.get('size')}:{version}\n".encode("utf-8"))
+        return h.hexdigest()
+
+    def _get_shared(self, remote_path: str, local_path: str, is_multipart: bool) -> bool:
+        """
+        Copies the data of remote_path in the shared cache directory to local_path, downloading it first unless another
+        task already did. Returns False if remote_path is not shared, in which case the caller should download as
+        usual.
+        """
+        if remote_path not in self._shared:
+            return False
+        try:
+            import fcntl
+        except ImportError:
+            return False
+        if os.path.isdir(local_path):
+            if os.listdir(local_path):
+                return False
+            os.rmdir(local_path)
+
+        try:
+            version = self._shared_version(remote_path, is_multipart)
+        except Exception as e:
+            logger.warning(f"Failed to get the version of {remote_path}, not sharing it. Error: {e}")
+            return False
+        shared_dir = os.path.join(
+            cast(str, self._data_config.shared_cache_dir), hashlib.sha256(remote_path.encode("utf-8")).hexdigest()
+        )
+        shared_path = os.path.join(shared_dir, version)
+        pathlib.Path(shared_dir).mkdir(parents=True, exist_ok=True)
+        with open(os.path.join(shared_dir, ".lock"), "w") as lock:
+            # Tasks on the same node wait for the one that downloads the data
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if not os.path.exists(shared_path):
+                partial_path = os.path.join(shared_dir, ".partial")
+                shutil.rmtree(partial_path, ignore_errors=True)
+                if is_multipart:
+                    pathlib.Path(partial_path).mkdir()
+                with timeit(f"Download shared data from {remote_path}"):
+                    self.get(remote_path, to_path=partial_path, recursive=is_multipart)
+                os.rename(partial_path, shared_path)
+                # Older versions of the data are not read anymore, nobody is copying them while the lock is held
+                for name in os.listdir(shared_dir):
+                    if name in (version, ".lock"):
+                        continue
+                    old_path = os.path.join(shared_dir, name)
+                    if os.path.isdir(old_path):
+                        shutil.rmtree(old_path, ignore_errors=True)
+                    else:
+                        os.remove(old_path)
+            # Other tasks may copy the data at the same time, but it is not replaced until they are done
+            fcntl.flock(lock, fcntl.LOCK_SH)
+            pathlib.Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+            # Copied rather than linked, tasks may write to their inputs and must not corrupt the data of the others
+            if is_multipart:
+                shutil.copytree(shared_path, local_path)
+            else:
+                shutil.copyfile(shared_path, local_path)
+        logger.debug(f"Using shared data for {remote_path} from {shared_path}")
+        return True
+
     def get_data(self, remote_path: str, local_path: str, is_multipart: bool = False, **kwargs):
         """
         :param remote_path:
         :param local_path:
         :param is_multipart:
         """
+        if self._claim_prefetched(remote_path, local_path, is_multipart):
+            return
+        if self._get_shared(remote_path, local_path, is_multipart):
+            return
         try:
             pathlib.Path(local_path).parent.mkdir(parents=True, exist_ok=True)
             with timeit(f"Download data to local from {remote_path}"):
@@ -5,7 +5,6 @@ a reference task as well as run-time parameters that limit execution concurrency
 import functools
 import hashlib
 import logging
-import math
 import os
 import typing
 from contextlib import contextmanager
@@ -17,11 +16,11 @@ from flytekit.core.base_task import PythonTask, Task, TaskResolverMixin
 from flytekit.core.constants import CONTAINER_ARRAY_TASK
 from flytekit.core.context_manager import ExecutionState, FlyteContext, FlyteContextManager
 from flytekit.core.interface import transform_interface_to_list_interface
+from flytekit.core.map_executor import MapStage, execute_mapped
 from flytekit.core.python_function_task import PythonFunctionTask, PythonInstanceTask
 from flytekit.core.tracker import TrackedInstance
 from flytekit.core.utils import timeit
 from flytekit.exceptions import scopes as exception_scopes
-from flytekit.loggers import logger
 from flytekit.models.array_job import ArrayJob
 from flytekit.models.interface import Variable
 from flytekit.models.task import Container, K8sPod, Sql
@@ -255,6 +254,20 @@ class MapPythonTask(PythonTask):
                 map_task_inputs[k] = v
         return exception_scopes.user_entry_point(self._run_task.execute)(**map_task_inputs)
 
+    def local_stage(self, inputs: Dict[str, Any], link: Optional[str] = None) -> MapStage:
+        """
+        Returns the instances to run for the given native inputs in a local execution.
+        """
+        return MapStage(
+            self._run_task,
+            inputs,
+            self.bound_inputs,
+            min_successes=None,
+            min_success_ratio=self._min_success_ratio,
+            concurrency=self._max_concurrency,
+            link=link,
+        )
+
     def _raw_execute(self, **kwargs) -> Any:
         """
         This is called during locally run executions. Unlike array task execution on the Flyte platform, _raw_execute
@@ -263,41 +276,16 @@ class MapPythonTask(PythonTask):
         outputs_expected = True
         if not self.interface.outputs:
             outputs_expected = False
-        outputs = []
-
-        mapped_tasks_count = 0
-        if self._run_task.interface.inputs.items():
-            for k in self._run_task.interface.inputs.keys():
-                v = kwargs[k]
-                if isinstance(v, list) and k not in self.bound_inputs:
-                    mapped_tasks_count = len(v)
-                    break
-
-        failed_count = 0
-        min_successes = mapped_tasks_count
-        if self._min_success_ratio:
-            min_successes = math.ceil(min_successes * self._min_success_ratio)
-
-        for i in range(mapped_tasks_count):
-            single_instance_inputs = {}
-            for k in self.interface.inputs.keys():
-                v = kwargs[k]
-                if isinstance(v, list) and k not in self.bound_inputs:
-                    single_instance_inputs[k] = kwargs[k][i]
-                else:
-                    single_instance_inputs[k] = kwargs[k]
-            try:
-                o = exception_scopes.user_entry_point(self._run_task.execute)(**single_instance_inputs)
-                if outputs_expected:
-                    outputs.append(o)
-            except Exception as exc:
-                outputs.append(None)
-                failed_count += 1
-                if mapped_tasks_count - failed_count < min_successes:
-                    logger.error("The number of successful tasks is lower than the minimum ratio")
-                    raise exc
-
-        return outputs
+
+        stage = self.local_stage(kwargs)
+        outputs = execute_mapped(
+            stage.task,
+            stage.count,
+            stage.instance_inputs,
+            stage.required_successes(stage.count),
+            concurrency=stage.concurrency,
+        )
+        return outputs if outputs_expected else []
 
 
 def map_task(
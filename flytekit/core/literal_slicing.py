@@ -0,0 +1,118 @@
+"""
+Reads parts of serialized literal maps without parsing all of them. An array job only needs the elements of the mapped
+inputs at its own index, but the inputs file holds every element of every mapped input. The protobuf wire format
+prefixes every element of a collection with its length, so the elements of other jobs are skipped by seeking past
+them, and only the elements of this job are parsed.
+"""
+import typing
+
+from flyteidl.core import literals_pb2 as _literals_pb2
+
+_VARINT = 0
+_I64 = 1
+_LEN = 2
+_I32 = 5
+
+# Field numbers in flyteidl/core/literals.proto
+_LITERAL_MAP_LITERALS = 1
+_MAP_ENTRY_KEY = 1
+_MAP_ENTRY_VALUE = 2
+_LITERAL_COLLECTION = 2
+_LITERAL_COLLECTION_LITERALS = 1
+
+
+def _read_varint(f: typing.BinaryIO) -> int:
+    result = 0
+    shift = 0
+    while True:
+        b = f.read(1)
+        if not b:
+            raise EOFError("Truncated varint in serialized protobuf")
+        result |= (b[0] & 0x7F) << shift
+        if not b[0] & 0x80:
+            return result
+        shift += 7
+
+
+def _fields(f: typing.BinaryIO, start: int, end: int) -> typing.Iterator[typing.Tuple[int, int, int]]:
+    """
+    Yields ``(field_number, offset, length)`` of the length delimited fields of the message between ``start`` and
+    ``end`` of ``f``. Other fields are skipped, as is the content of every field the caller did not read.
+    """
+    pos = start
+    while pos < end:
+        f.seek(pos)
+        tag = _read_varint(f)
+        number, wire_type = tag >> 3, tag & 0x7
+        if wire_type == _VARINT:
+            _read_varint(f)
+            pos = f.tell()
+        elif wire_type == _I64:
+            pos = f.tell() + 8
+        elif wire_type == _I32:
+            pos = f.tell() + 4
+        elif wire_type == _LEN:
+            length = _read_varint(f)
+            offset = f.tell()
+            yield number, offset, length
+            pos = offset + length
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire_type}")
+
+
+def _parse(f: typing.BinaryIO, pb2_type, offset: int, length: int):
+    f.seek(offset)
+    out = pb2_type()
+    out.ParseFromString(f.read(length))
+    return out
+
+
+def _sliced_literal(f: typing.BinaryIO, offset: int, length: int, start: int, end: int) -> _literals_pb2.Literal:
+    for number, collection_offset, collection_length in _fields(f, offset, offset + length):
+        if number != _LITERAL_COLLECTION:
+            continue
+        literals = []
+        index = 0
+        for n, element_offset, element_length in _fields(f, collection_offset, collection_offset + collection_length):
+            if n != _LITERAL_COLLECTION_LITERALS:
+                continue
+            if start <= index < end:
+                literals.append(_parse(f, _literals_pb2.Literal, element_offset, element_length))
+            index += 1
+            if index >= end:
+                break
+        return _literals_pb2.Literal(collection=_literals_pb2.LiteralCollection(literals=literals))
+    # Not a collection, there is nothing to slice
+    return _parse(f, _literals_pb2.Literal, offset, length)
+
+
+def read_sliced_literal_map(
+    f: typing.BinaryIO, sliced: typing.Callable[[str], bool], start: int, end: int
+) -> _literals_pb2.LiteralMap:
+    """
+    Reads the serialized LiteralMap in ``f``, keeping only the elements from ``start`` to ``end`` of the collections
+    of the literals whose name ``sliced`` returns True for. The other literals are read as they are.
+
+    :param f: A seekable binary file.
+    """
+    f.seek(0, 2)
+    size = f.tell()
+    out = _literals_pb2.LiteralMap()
+    for number, entry_offset, entry_length in _fields(f, 0, size):
+        if number != _LITERAL_MAP_LITERALS:
+            continue
+        key = ""
+        value: typing.Optional[typing.Tuple[int, int]] = None
+        for n, offset, length in _fields(f, entry_offset, entry_offset + entry_length):
+            if n == _MAP_ENTRY_KEY:
+                f.seek(offset)
+                key = f.read(length).decode("utf-8")
+            elif n == _MAP_ENTRY_VALUE:
+                value = (offset, length)
+        if value is None:
+            out.literals[key].CopyFrom(_literals_pb2.Literal())
+        elif sliced(key):
+            out.literals[key].CopyFrom(_sliced_literal(f, value[0], value[1], start, end))
+        else:
+            out.literals[key].CopyFrom(_parse(f, _literals_pb2.Literal, *value))
+    return out
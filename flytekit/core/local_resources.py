@@ -0,0 +1,287 @@
+"""
+Schedules local executions against the resources of the machine, so that running nodes and map task instances
+concurrently does not oversubscribe it. Tasks request the CPU and memory of their ``requests`` (or ``limits``), and
+only start once that much of the local capacity, configured by ``FLYTE_LOCAL_CPU`` and ``FLYTE_LOCAL_MEMORY``, is
+free. Tasks that run in processes of their own are also held to their memory limit.
+"""
+import os
+import re
+import threading
+import typing
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from flytekit.configuration import LocalConfig
+from flytekit.core.resources import ResourceSpec
+from flytekit.loggers import logger
+from flytekit.models import task as _task_models
+
+_MEMORY_UNITS = {
+    "": 1,
+    "k": 1000,
+    "K": 1000,
+    "M": 1000**2,
+    "G": 1000**3,
+    "T": 1000**4,
+    "P": 1000**5,
+    "E": 1000**6,
+    "Ki": 1024,
+    "Mi": 1024**2,
+    "Gi": 1024**3,
+    "Ti": 1024**4,
+    "Pi": 1024**5,
+    "Ei": 1024**6,
+}
+_QUANTITY = re.compile(r"^\s*([0-9.]+(?:[eE][0-9]+)?)\s*([a-zA-Z]*)\s*$")
+
+
+def parse_cpu(value: str) -> float:
+    """
+    Parses a Kubernetes CPU quantity, e.g. ``2`` or ``500m``, into a number of CPUs.
+    """
+    m = _QUANTITY.match(value)
+    if m is None or m.group(2) not in ("", "m"):
+        raise ValueError(f"Invalid CPU quantity {value}")
+    cpu = float(m.group(1))
+    return cpu / 1000 if m.group(2) == "m" else cpu
+
+
+def parse_memory(value: str) -> int:
+    """
+    Parses a Kubernetes memory quantity, e.g. ``2048``, ``500M`` or ``2Gi``, into a number of bytes.
+    """
+    m = _QUANTITY.match(value)
+    if m is None or m.group(2) not in _MEMORY_UNITS:
+        raise ValueError(f"Invalid memory quantity {value}")
+    return int(float(m.group(1)) * _MEMORY_UNITS[m.group(2)])
+
+
+@dataclass(frozen=True)
+class TaskResources(object):
+    """
+    The CPU and memory (in bytes) a task needs to run locally, and the memory it may use at most.
+    """
+
+    cpu: float = 0
+    mem: int = 0
+    mem_limit: typing.Optional[int] = None
+
+
+def max_resources(rs: typing.Iterable[TaskResources]) -> TaskResources:
+    """
+    Returns the most of every resource in ``rs``, for tasks that run one after the other in the same place.
+    """
+    rs = list(rs)
+    mem_limits = [r.mem_limit for r in rs if r.mem_limit]
+    return TaskResources(
+        cpu=max((r.cpu for r in rs), default=0),
+        mem=max((r.mem for r in rs), default=0),
+        mem_limit=max(mem_limits) if mem_limits else None,
+    )
+
+
+def _from_values(
+    request_cpu: typing.Optional[str],
+    request_mem: typing.Optional[str],
+    limit_cpu: typing.Optional[str],
+    limit_mem: typing.Optional[str],
+) -> TaskResources:
+    # As in Kubernetes, a limit without a request also is the request
+    cpu = request_cpu or limit_cpu
+    mem = request_mem or limit_mem
+    return TaskResources(
+        cpu=parse_cpu(cpu) if cpu else 0,
+        mem=parse_memory(mem) if mem else 0,
+        mem_limit=parse_memory(limit_mem) if limit_mem else None,
+    )
+
+
+def task_resources(entity: typing.Any, overrides: typing.Optional[_task_models.Resources] = None) -> TaskResources:
+    """
+    Returns the resources of a task, or of one instance of a map task, taking the resources a node overrides with
+    ``with_overrides`` into account.
+    """
+    if overrides is not None and (overrides.requests or overrides.limits):
+
+        def value(entries: typing.List[_task_models.Resources.ResourceEntry], name: int) -> typing.Optional[str]:
+            return next((e.value for e in entries if e.name == name), None)
+
+        cpu, mem = _task_models.Resources.ResourceName.CPU, _task_models.Resources.ResourceName.MEMORY
+        return _from_values(
+            value(overrides.requests, cpu),
+            value(overrides.requests, mem),
+            value(overrides.limits, cpu),
+            value(overrides.limits, mem),
+        )
+
+    # Map tasks run their instances with the resources of the mapped task
+    entity = getattr(entity, "python_function_task", None) or getattr(entity, "run_task", None) or entity
+    spec = getattr(entity, "resources", None)
+    if not isinstance(spec, ResourceSpec):
+        return TaskResources()
+    return _from_values(spec.requests.cpu, spec.requests.mem, spec.limits.cpu, spec.limits.mem)
+
+
+def _physical_memory() -> typing.Optional[int]:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+class LocalCapacity(object):
+    """
+    The CPU and memory available to the tasks of a local execution. Tasks acquire their resources before they start
+    and release them once they completed. A task that needs more than the whole capacity may still run, but only
+    when nothing else that requested resources does, so that it does not wait forever.
+    """
+
+    def __init__(self, cpu: typing.Optional[float] = None, mem: typing.Optional[int] = None):
+        """
+        :param cpu: Number of CPUs, ``FLYTE_LOCAL_CPU`` or the number of CPUs of the machine by default.
+        :param mem: Memory in bytes, ``FLYTE_LOCAL_MEMORY`` or the physical memory of the machine by default.
+        """
+        config = LocalConfig.auto()
+        if cpu is None:
+            cpu = parse_cpu(config.cpu) if config.cpu else float(os.cpu_count() or 1)
+        if mem is None:
+            mem = parse_memory(config.memory) if config.memory else _physical_memory()
+        self.cpu = cpu
+        self.mem = mem
+        self._used_cpu = 0.0
+        self._used_mem = 0
+        self._running = 0
+        self._released = threading.Condition()
+
+    def _fits(self, r: TaskResources) -> bool:
+        if self._running == 0:
+            return True
+        if r.cpu and self._used_cpu + r.cpu > self.cpu:
+            return False
+        return not (r.mem and self.mem is not None and self._used_mem + r.mem > self.mem)
+
+    def _acquire(self, r: TaskResources):
+        self._used_cpu += r.cpu
+        self._used_mem += r.mem
+        if r.cpu or r.mem:
+            self._running += 1
+
+    def try_acquire(self, r: TaskResources) -> bool:
+        """
+        Acquires the resources of a task if they are free, and returns whether they were.
+        """
+        with self._released:
+            if not self._fits(r):
+                return False
+            self._acquire(r)
+            return True
+
+    def acquire(self, r: TaskResources):
+        """
+        Acquires the resources of a task, waiting until other tasks released enough of them.
+        """
+        with self._released:
+            self._released.wait_for(lambda: self._fits(r))
+            self._acquire(r)
+
+    def release(self, r: TaskResources):
+        with self._released:
+            self._used_cpu -= r.cpu
+            self._used_mem -= r.mem
+            if r.cpu or r.mem:
+                self._running -= 1
+            self._released.notify_all()
+
+    def max_concurrent(self, r: TaskResources) -> typing.Optional[int]:
+        """
+        Returns how many tasks needing ``r`` fit into the whole capacity at the same time, at least one, or None if
+        ``r`` does not request anything.
+        """
+        limits = []
+        if r.cpu:
+            limits.append(int(self.cpu // r.cpu))
+        if r.mem and self.mem is not None:
+            limits.append(self.mem // r.mem)
+        return max(min(limits), 1) if limits else None
+
+
+_capacity_lock = threading.Lock()
+_capacity: typing.Optional[LocalCapacity] = None
+
+
+def local_capacity() -> LocalCapacity:
+    """
+    Returns the capacity shared by the nodes and map task instances of the current local execution.
+    """
+    global _capacity
+    with _capacity_lock:
+        if _capacity is None:
+            _capacity = LocalCapacity()
+        return _capacity
+
+
+def clear_local_capacity():
+    """
+    Drops the capacity of the current local execution. This is done when a local execution ends.
+    """
+    global _capacity
+    with _capacity_lock:
+        _capacity = None
+
+
+def _forget_capacity_after_fork():
+    global _capacity, _capacity_lock
+    # Forked workers cannot see the resources released in the process they were forked from
+    _capacity_lock = threading.Lock()
+    _capacity = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_capacity_after_fork)
+
+
+def _data_size() -> typing.Optional[int]:
+    """
+    Returns the size of the data segment of the current process, what RLIMIT_DATA is checked against, in bytes.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmData:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+@contextmanager
+def memory_limit(limit: typing.Optional[int]):
+    """
+    Limits the memory the current process can allocate to ``limit`` more bytes while in the context, such that
+    exceeding it raises a MemoryError in the task rather than slowing down the machine. This applies to the whole
+    process, so it is only used in processes that run one task at a time.
+
+    Forked workers inherit the memory of the process they were forked from, which counts against RLIMIT_DATA as well,
+    so the limit is added to the memory the process already has rather than replacing it.
+    """
+    if not limit:
+        yield
+        return
+    try:
+        import resource
+    except ImportError:
+        logger.debug("Memory limits are not supported on this platform")
+        yield
+        return
+    baseline = _data_size()
+    if baseline is None:
+        logger.debug("Cannot measure the memory of the process, not limiting the memory of the task")
+        yield
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_DATA)
+    new_soft = baseline + limit if hard == resource.RLIM_INFINITY else min(baseline + limit, hard)
+    resource.setrlimit(resource.RLIMIT_DATA, (new_soft, hard))
+    try:
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_DATA, (soft, hard))
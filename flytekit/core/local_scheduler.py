@@ -0,0 +1,431 @@
+"""
+Runs the nodes of a workflow in local executions. Nodes run one after the other in the order they were declared,
+unless ``FLYTE_LOCAL_WORKFLOW_CONCURRENCY`` is more than one. Then every node runs as soon as the nodes it depends on
+have completed, in a pool of threads or forked processes as configured by ``FLYTE_LOCAL_WORKFLOW_EXECUTOR``, and once
+the resources the node requests are available locally, see :py:mod:`flytekit.core.local_resources`. Map task nodes
+always run in threads, their instances acquire resources from the same capacity as the other nodes.
+
+With ``FLYTE_LOCAL_PIPELINE_MAP_TASKS``, chains of map tasks that map over the outputs of the previous one run as a
+single pipeline, see :py:func:`flytekit.core.map_executor.execute_pipelined`.
+"""
+import multiprocessing
+import typing
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from flytekit.configuration import LocalConfig
+from flytekit.core.context_manager import ExecutionParameters, ExecutionState, FlyteContextManager
+from flytekit.core.local_resources import TaskResources, local_capacity, max_resources, memory_limit, task_resources
+from flytekit.core.map_executor import PROCESS, THREAD, execute_pipelined
+from flytekit.core.node import Node
+from flytekit.core.promise import NodeOutput, Promise, VoidPromise
+from flytekit.core.type_engine import TypeEngine
+from flytekit.exceptions.scopes import FlyteScopedException
+from flytekit.exceptions.user import FlyteValueException
+from flytekit.interfaces import random as _flyte_random
+from flytekit.loggers import logger
+from flytekit.models import literals as _literal_models
+
+WORKFLOW_EXECUTORS = (PROCESS, THREAD)
+
+# Set in forked worker processes by _init_worker, the nodes are inherited rather than pickled
+_worker_nodes: typing.List[Node] = []
+
+
+def get_workflow_concurrency() -> int:
+    return LocalConfig.auto().workflow_concurrency or 1
+
+
+def use_local_scheduler() -> bool:
+    """
+    Whether local executions should run the compiled nodes of a workflow through :py:func:`execute_nodes`, rather
+    than the workflow function, because nodes may run concurrently or map tasks may be pipelined.
+    """
+    config = LocalConfig.auto()
+    return (config.workflow_concurrency or 1) > 1 or config.pipeline_map_tasks
+
+
+def _binding_nodes(binding_data: _literal_models.BindingData) -> typing.Generator[Node, None, None]:
+    if binding_data.promise is not None and isinstance(binding_data.promise, NodeOutput):
+        yield binding_data.promise.node
+    elif binding_data.collection is not None:
+        for bd in binding_data.collection.bindings:
+            yield from _binding_nodes(bd)
+    elif binding_data.map is not None:
+        for bd in binding_data.map.bindings.values():
+            yield from _binding_nodes(bd)
+
+
+def upstream_nodes(node: Node) -> typing.Set[Node]:
+    """
+    Returns the nodes ``node`` depends on, i.e. the ones its bindings take outputs from and the ones it was explicitly
+    chained after.
+    """
+    upstream = set(node.upstream_nodes)
+    for b in node.bindings:
+        upstream.update(_binding_nodes(b.binding))
+    return upstream
+
+
+def node_outputs(node: Node, results: typing.Any) -> typing.Dict[str, Promise]:
+    """
+    Maps the value returned by calling the entity of ``node`` to the names of the outputs of the entity.
+    """
+    entity = node.flyte_entity
+    if isinstance(results, VoidPromise) or results is None:
+        return {}
+
+    expected_output_names = list(entity.python_interface.outputs.keys())
+    # Because we should've already returned in the above check, we just raise an Exception here.
+    if len(expected_output_names) == 0:
+        raise FlyteValueException(results, "Interface output should've been VoidPromise or None.")
+
+    # if there's only one output,
+    if len(expected_output_names) == 1:
+        if entity.python_interface.output_tuple_name and isinstance(results, tuple):
+            return {expected_output_names[0]: results[0]}
+        return {expected_output_names[0]: results}
+
+    if len(results) != len(expected_output_names):
+        raise FlyteValueException(results, f"Different lengths {results} {expected_output_names}")
+    return {expected_output_names[idx]: r for idx, r in enumerate(results)}
+
+
+def _execute_node(node: Node, entity_kwargs: typing.Dict[str, Promise]) -> typing.Dict[str, Promise]:
+    return node_outputs(node, node.flyte_entity(**entity_kwargs))
+
+
+def _init_worker(nodes: typing.List[Node]):
+    global _worker_nodes
+    # The flytekit random generator is not reseeded on fork, without this the workers would create the same "random"
+    # local paths
+    _flyte_random.random.seed()
+    _worker_nodes = nodes
+
+
+def _execute_in_worker(
+    idx: int, entity_literals: typing.Dict[str, _literal_models.Literal], mem_limit: typing.Optional[int] = None
+) -> typing.Dict[str, _literal_models.Literal]:
+    # Promises cannot be pickled, only the literals they hold are sent between the processes
+    entity_kwargs = {k: Promise(var=k, val=v) for k, v in entity_literals.items()}
+    try:
+        with memory_limit(mem_limit):
+            outputs = _execute_node(_worker_nodes[idx], entity_kwargs)
+    except FlyteScopedException as e:
+        # The scoped exception holds on to a traceback, which cannot be sent back to the parent process
+        raise e.value from None
+    return {k: p.val for k, p in outputs.items()}
+
+
+class _Pipeline(typing.NamedTuple):
+    """
+    A chain of map task nodes, where every node maps over the output of the previous one through its ``links`` input.
+    """
+
+    nodes: typing.List[Node]
+    links: typing.List[str]
+
+
+def _is_map_task(node: Node) -> bool:
+    # circular import
+    from flytekit.core.array_node_map_task import ArrayNodeMapTask
+    from flytekit.core.legacy_map_task import MapPythonTask
+
+    return isinstance(node.flyte_entity, (ArrayNodeMapTask, MapPythonTask))
+
+
+def _is_pipelined_map_task(node: Node) -> bool:
+    # Pipelined stages do not go through the local cache
+    return _is_map_task(node) and not node.flyte_entity.metadata.cache
+
+
+def _link(upstream: Node, node: Node) -> typing.Optional[str]:
+    """
+    Returns the name of the mapped input of ``node`` that is bound to the whole output of ``upstream``, if that is
+    the only input that takes anything from ``upstream``.
+    """
+    link = None
+    for b in node.bindings:
+        if upstream not in _binding_nodes(b.binding):
+            continue
+        promise = b.binding.promise
+        if (
+            link is not None
+            or promise is None
+            or promise.attr_path
+            or b.var in node.flyte_entity.bound_inputs
+            or list(upstream.flyte_entity.python_interface.outputs.keys()) != [promise.var]
+        ):
+            return None
+        link = b.var
+    return link
+
+
+def _descendants(node: Node, dependents: typing.Dict[Node, typing.List[Node]]) -> typing.Set[Node]:
+    seen: typing.Set[Node] = set()
+    stack = [node]
+    while stack:
+        for d in dependents[stack.pop()]:
+            if d not in seen:
+                seen.add(d)
+                stack.append(d)
+    return seen
+
+
+def map_task_pipelines(nodes: typing.List[Node]) -> typing.List[_Pipeline]:
+    """
+    Finds the chains of map task nodes that can be pipelined. A node joins the chain of the map task it maps over if
+    it is the only map task mapping over it, and none of its other inputs come from nodes downstream of the start of
+    the chain, which would have to wait for the chain to complete.
+    """
+    index = {node: i for i, node in enumerate(nodes)}
+    dependents: typing.Dict[Node, typing.List[Node]] = {node: [] for node in nodes}
+    for node in nodes:
+        for n in upstream_nodes(node):
+            if n in index:
+                dependents[n].append(node)
+
+    links: typing.Dict[Node, typing.Tuple[Node, str]] = {}
+    for node in nodes:
+        if not _is_pipelined_map_task(node):
+            continue
+        for n in upstream_nodes(node):
+            if n not in index or not _is_pipelined_map_task(n):
+                continue
+            link = _link(n, node)
+            if link is not None and not any(u is n for u, _ in links.values()):
+                links[node] = (n, link)
+                break
+
+    pipelines = []
+    heads = [node for node in nodes if any(u is node for u, _ in links.values()) and node not in links]
+    for head in heads:
+        descendants = _descendants(head, dependents)
+        pipeline = _Pipeline([head], [])
+        while True:
+            nxt = next((n for n, (u, _) in links.items() if u is pipeline.nodes[-1]), None)
+            if nxt is None or any(n in descendants for n in upstream_nodes(nxt) if n is not pipeline.nodes[-1]):
+                break
+            pipeline.nodes.append(nxt)
+            pipeline.links.append(links[nxt][1])
+        if len(pipeline.nodes) > 1:
+            pipelines.append(pipeline)
+    return pipelines
+
+
+def _execute_pipeline(
+    pipeline: _Pipeline, entity_kwargs: typing.List[typing.Dict[str, Promise]]
+) -> typing.Dict[Node, typing.Dict[str, Promise]]:
+    """
+    Runs the map tasks of a pipeline in a local task sandbox, like map task nodes are run on their own, and returns
+    the outputs of every node.
+    """
+    ctx = FlyteContextManager.current_context()
+    es = typing.cast(ExecutionState, ctx.execution_state)
+    params = typing.cast(ExecutionParameters, es.user_space_params).with_task_sandbox().build()
+    with FlyteContextManager.with_context(
+        ctx.with_execution_state(
+            es.with_params(mode=ExecutionState.Mode.LOCAL_TASK_EXECUTION, user_space_params=params)
+        )
+    ) as exec_ctx:
+        stages = []
+        for node, kwargs, link in zip(pipeline.nodes, entity_kwargs, [None, *pipeline.links]):
+            entity = node.flyte_entity
+            literal_map = _literal_models.LiteralMap(literals={k: p.val for k, p in kwargs.items()})
+            native_inputs = TypeEngine.literal_map_to_kwargs(exec_ctx, literal_map, entity.python_interface.inputs)
+            stages.append(entity.local_stage(native_inputs, link=link))
+
+        outputs = {}
+        for node, stage_outputs in zip(pipeline.nodes, execute_pipelined(stages)):
+            entity = node.flyte_entity
+            outputs[node] = {}
+            for name, python_type in entity.python_interface.outputs.items():
+                lv = TypeEngine.to_literal(exec_ctx, stage_outputs, python_type, entity.interface.outputs[name].type)
+                outputs[node][name] = Promise(var=name, val=lv)
+        return outputs
+
+
+class _Scheduler(object):
+    def __init__(self, nodes: typing.List[Node], executor: str, max_workers: int, threads: bool):
+        """
+        :param threads: Whether some nodes always run in threads, see :py:meth:`submit_in_thread`.
+        """
+        self._nodes = nodes
+        self._kind = executor
+        self._executor: Executor
+        self._threads: typing.Optional[ThreadPoolExecutor] = None
+        if executor == PROCESS:
+            self._executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+                initargs=(nodes,),
+            )
+            if threads:
+                self._threads = ThreadPoolExecutor(max_workers=max_workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers)
+            self._threads = self._executor
+
+    def submit(
+        self, idx: int, entity_kwargs: typing.Dict[str, Promise], mem_limit: typing.Optional[int] = None
+    ) -> Future:
+        if self._kind == PROCESS:
+            # Memory can only be limited in processes that run one node at a time
+            return self._executor.submit(
+                _execute_in_worker, idx, {k: p.val for k, p in entity_kwargs.items()}, mem_limit
+            )
+        return self._executor.submit(
+            FlyteContextManager.propagate_context(_execute_node), self._nodes[idx], entity_kwargs
+        )
+
+    def submit_in_thread(self, idx: int, entity_kwargs: typing.Dict[str, Promise]) -> Future:
+        """
+        Runs a map task node in a thread of this process, because its instances fan out to a pool of their own and
+        acquire their resources from the capacity of this process.
+        """
+        return typing.cast(ThreadPoolExecutor, self._threads).submit(
+            FlyteContextManager.propagate_context(_execute_node), self._nodes[idx], entity_kwargs
+        )
+
+    def submit_pipeline(self, pipeline: _Pipeline, entity_kwargs: typing.List[typing.Dict[str, Promise]]) -> Future:
+        return typing.cast(ThreadPoolExecutor, self._threads).submit(
+            FlyteContextManager.propagate_context(_execute_pipeline), pipeline, entity_kwargs
+        )
+
+    def result(self, f: Future, in_thread: bool = False) -> typing.Dict[str, Promise]:
+        if self._kind == PROCESS and not in_thread:
+            return {k: Promise(var=k, val=v) for k, v in f.result().items()}
+        return f.result()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._threads is not None and self._threads is not self._executor:
+            self._threads.shutdown(wait=True, cancel_futures=True)
+
+
+def execute_nodes(
+    nodes: typing.List[Node],
+    intermediate_node_outputs: typing.Dict[Node, typing.Dict[str, Promise]],
+    fail_immediately: bool = True,
+) -> typing.Dict[Node, typing.Dict[str, Promise]]:
+    """
+    Runs the entities of ``nodes``, filling in their inputs from the outputs of the nodes they are bound to, and
+    records the outputs of every node in ``intermediate_node_outputs``, which should already hold the outputs of the
+    global start node, i.e. the inputs of the workflow.
+
+    :param fail_immediately: If False, all nodes that do not depend on a failed node are still run before the error
+        of the first node that failed is raised.
+    """
+    # circular import
+    from flytekit.core.workflow import get_promise_map
+
+    config = LocalConfig.auto()
+    concurrency = config.workflow_concurrency or 1
+    pipelines = map_task_pipelines(nodes) if config.pipeline_map_tasks else []
+    if (concurrency <= 1 and not pipelines) or len(nodes) <= 1:
+        for node in nodes:
+            intermediate_node_outputs[node] = _execute_node(
+                node, get_promise_map(node.bindings, intermediate_node_outputs)
+            )
+        return intermediate_node_outputs
+
+    executor = config.workflow_executor
+    if executor not in WORKFLOW_EXECUTORS:
+        raise ValueError(f"Unsupported local workflow executor {executor}, expected one of {list(WORKFLOW_EXECUTORS)}")
+    if executor == PROCESS and "fork" not in multiprocessing.get_all_start_methods():
+        logger.info("Forking processes is not supported on this platform, running workflow nodes in threads")
+        executor = THREAD
+
+    # Nodes are scheduled in units, a pipeline is one unit, every other node is a unit of its own
+    index = {node: i for i, node in enumerate(nodes)}
+    units: typing.List[typing.Union[Node, _Pipeline]] = []
+    unit_of: typing.Dict[Node, int] = {}
+    for pipeline in pipelines:
+        for node in pipeline.nodes:
+            unit_of[node] = len(units)
+        units.append(pipeline)
+    for node in nodes:
+        if node not in unit_of:
+            unit_of[node] = len(units)
+            units.append(node)
+
+    def unit_nodes(u: int) -> typing.List[Node]:
+        unit = units[u]
+        return unit.nodes if isinstance(unit, _Pipeline) else [unit]
+
+    def unit_position(u: int) -> int:
+        return min(index[n] for n in unit_nodes(u))
+
+    def unit_resources(u: int) -> TaskResources:
+        if isinstance(units[u], _Pipeline) or _is_map_task(units[u]):
+            # Map task instances acquire their resources one by one
+            return TaskResources()
+        return max_resources(task_resources(n.flyte_entity, n._resources) for n in unit_nodes(u))
+
+    waiting_on: typing.Dict[int, int] = {}
+    dependents: typing.Dict[int, typing.List[int]] = {u: [] for u in range(len(units))}
+    for u in range(len(units)):
+        upstream = {unit_of[n] for node in unit_nodes(u) for n in upstream_nodes(node) if n in index} - {u}
+        waiting_on[u] = len(upstream)
+        for d in upstream:
+            dependents[d].append(u)
+
+    resources = [unit_resources(u) for u in range(len(units))]
+    capacity = local_capacity()
+    ready = [u for u in range(len(units)) if waiting_on[u] == 0]
+    running: typing.Dict[Future, int] = {}
+    errors: typing.List[BaseException] = []
+    scheduler = _Scheduler(nodes, executor, concurrency, any(_is_map_task(node) for node in nodes))
+    try:
+        while ready or running:
+            waiting_for_resources = []
+            if not (errors and fail_immediately):
+                # Nodes that were declared first get the free workers first
+                for u in sorted(ready, key=unit_position):
+                    if not capacity.try_acquire(resources[u]):
+                        # Waits until running nodes release enough resources
+                        waiting_for_resources.append(u)
+                        continue
+                    unit = units[u]
+                    if isinstance(unit, _Pipeline):
+                        # The linked inputs are fed from the previous stage, the others are available already
+                        entity_kwargs = [
+                            get_promise_map([b for b in node.bindings if b.var != link], intermediate_node_outputs)
+                            for node, link in zip(unit.nodes, [None, *unit.links])
+                        ]
+                        running[scheduler.submit_pipeline(unit, entity_kwargs)] = u
+                    elif _is_map_task(unit):
+                        entity_kwargs = get_promise_map(unit.bindings, intermediate_node_outputs)
+                        running[scheduler.submit_in_thread(index[unit], entity_kwargs)] = u
+                    else:
+                        entity_kwargs = get_promise_map(unit.bindings, intermediate_node_outputs)
+                        running[scheduler.submit(index[unit], entity_kwargs, resources[u].mem_limit)] = u
+            ready = waiting_for_resources
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for f in done:
+                u = running.pop(f)
+                capacity.release(resources[u])
+                if f.exception() is not None:
+                    # The nodes downstream of a failed node are never ready, and are skipped. Only the first error is
+                    # raised, the others are logged.
+                    if errors:
+                        logger.error(f"Node {unit_nodes(u)[0].id} failed as well: {f.exception()}")
+                    errors.append(typing.cast(BaseException, f.exception()))
+                    continue
+                unit = units[u]
+                if isinstance(unit, _Pipeline):
+                    intermediate_node_outputs.update(f.result())
+                else:
+                    intermediate_node_outputs[unit] = scheduler.result(f, in_thread=_is_map_task(unit))
+                for d in dependents[u]:
+                    waiting_on[d] -= 1
+                    if waiting_on[d] == 0:
+                        ready.append(d)
+    finally:
+        scheduler.shutdown()
+
+    if errors:
+        raise errors[0]
+    return intermediate_node_outputs
@@ -0,0 +1,295 @@
+"""
+Runs the instances of a map task in local executions. Instances run one after the other, unless
+``FLYTE_LOCAL_MAP_EXECUTOR`` is ``thread`` or ``process``. Then they run concurrently in a pool of threads or forked
+processes, bounded by the ``concurrency`` of the map task and by how many instances fit into the local capacity.
+"""
+import math
+import multiprocessing
+import os
+import typing
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from flytekit.configuration import LocalConfig
+from flytekit.core.context_manager import FlyteContextManager
+from flytekit.core.local_resources import (
+    LocalCapacity,
+    TaskResources,
+    local_capacity,
+    max_resources,
+    memory_limit,
+    task_resources,
+)
+from flytekit.exceptions import scopes as exception_scopes
+from flytekit.exceptions.scopes import FlyteScopedException
+from flytekit.interfaces import random as _flyte_random
+from flytekit.loggers import logger
+
+PROCESS = "process"
+THREAD = "thread"
+SERIAL = "serial"
+MAP_EXECUTORS = (PROCESS, THREAD, SERIAL)
+
+# Set in forked worker processes by _init_worker, the task and its inputs are inherited rather than pickled
+_worker_task: typing.Any = None
+_worker_inputs: typing.Optional[typing.Callable[[int], typing.Dict[str, typing.Any]]] = None
+_worker_mem_limit: typing.Optional[int] = None
+
+
+def min_successes_for(
+    count: int, min_successes: typing.Optional[int], min_success_ratio: typing.Optional[float]
+) -> int:
+    if min_successes:
+        return min_successes
+    if min_success_ratio:
+        return math.ceil(count * min_success_ratio)
+    return count
+
+
+class MapStage(object):
+    """
+    The instances of a map task in a local execution: ``task`` is run once for every element of the list inputs that
+    are not bound, with the bound inputs passed as they are.
+    """
+
+    def __init__(
+        self,
+        task,
+        inputs: typing.Dict[str, typing.Any],
+        bound_inputs: typing.Set[str],
+        min_successes: typing.Optional[int] = None,
+        min_success_ratio: typing.Optional[float] = None,
+        concurrency: typing.Optional[int] = None,
+        link: typing.Optional[str] = None,
+    ):
+        """
+        :param link: Name of a mapped input that is not in ``inputs``, because it is fed element by element from the
+            outputs of the previous stage of a pipeline, see :py:func:`execute_pipelined`.
+        """
+        self.task = task
+        self.inputs = inputs
+        self.mapped_inputs = [k for k, v in inputs.items() if isinstance(v, list) and k not in bound_inputs]
+        self.min_successes = min_successes
+        self.min_success_ratio = min_success_ratio
+        self.concurrency = concurrency
+        self.link = link
+
+    @property
+    def count(self) -> int:
+        if not self.mapped_inputs:
+            return 0
+        return len(self.inputs[self.mapped_inputs[0]])
+
+    def required_successes(self, count: int) -> int:
+        return min_successes_for(count, self.min_successes, self.min_success_ratio)
+
+    def instance_inputs(self, i: int) -> typing.Dict[str, typing.Any]:
+        return {k: v[i] if k in self.mapped_inputs else v for k, v in self.inputs.items()}
+
+
+def get_map_executor_kind() -> str:
+    kind = LocalConfig.auto().map_executor
+    if kind not in MAP_EXECUTORS:
+        raise ValueError(f"Unsupported local map executor {kind}, expected one of {list(MAP_EXECUTORS)}")
+    if kind == PROCESS and "fork" not in multiprocessing.get_all_start_methods():
+        # Tasks are usually not picklable, the worker processes have to inherit them
+        logger.info("Forking processes is not supported on this platform, running map task instances in threads")
+        return THREAD
+    return kind
+
+
+def _init_worker(
+    task, instance_inputs: typing.Callable[[int], typing.Dict[str, typing.Any]], mem_limit: typing.Optional[int]
+):
+    global _worker_task, _worker_inputs, _worker_mem_limit
+    # The flytekit random generator is not reseeded on fork, without this the workers would create the same "random"
+    # local paths
+    _flyte_random.random.seed()
+    _worker_task = task
+    _worker_inputs = instance_inputs
+    _worker_mem_limit = mem_limit
+
+
+def _execute_in_worker(i: int) -> typing.Any:
+    try:
+        with memory_limit(_worker_mem_limit):
+            return exception_scopes.user_entry_point(_worker_task.execute)(**_worker_inputs(i))  # type: ignore
+    except FlyteScopedException as e:
+        # The scoped exception holds on to a traceback, which cannot be sent back to the parent process
+        raise e.value from None
+
+
+def _execute_instance(task, instance_inputs: typing.Callable[[int], typing.Dict[str, typing.Any]], i: int):
+    return exception_scopes.user_entry_point(task.execute)(**instance_inputs(i))
+
+
+def _instance_resources(task) -> TaskResources:
+    # Pipelines run the tasks they wrap, one at a time
+    if isinstance(task, _Pipeline):
+        return max_resources(task_resources(s.task) for s in task.stages)
+    return task_resources(task)
+
+
+def _new_executor(
+    kind: str,
+    task,
+    instance_inputs: typing.Callable[[int], typing.Dict[str, typing.Any]],
+    max_workers: int,
+    mem_limit: typing.Optional[int] = None,
+) -> typing.Tuple[Executor, typing.Callable[[int], typing.Any]]:
+    if kind == PROCESS:
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(task, instance_inputs, mem_limit),
+        )
+        return executor, _execute_in_worker
+    return ThreadPoolExecutor(max_workers=max_workers), FlyteContextManager.propagate_context(
+        lambda i: _execute_instance(task, instance_inputs, i)
+    )
+
+
+def iter_mapped(
+    task,
+    count: int,
+    instance_inputs: typing.Callable[[int], typing.Dict[str, typing.Any]],
+    min_successes: int,
+    concurrency: typing.Optional[int] = None,
+    capacity: typing.Optional[LocalCapacity] = None,
+) -> typing.Generator[typing.Tuple[int, typing.Any, typing.Optional[BaseException]], None, None]:
+    """
+    Runs ``task`` once for every index in ``range(count)``, with the inputs returned by ``instance_inputs`` for that
+    index, and yields ``(index, output, exception)`` as the instances complete. Raises the exception of the failed
+    instance as soon as fewer than ``min_successes`` instances can still succeed.
+
+    :param concurrency: Maximum number of instances that run at the same time, the number of CPUs if not set. Fewer
+        instances run at the same time if their resource requests do not fit into the local capacity.
+    :param capacity: The capacity every instance acquires its resources from before it starts, the one shared by
+        the current local execution if not set.
+    """
+    kind = get_map_executor_kind() if count > 1 else SERIAL
+    capacity = capacity or local_capacity()
+    resources = _instance_resources(task)
+    failed_count = 0
+
+    def check(exc: BaseException):
+        nonlocal failed_count
+        failed_count += 1
+        if count - failed_count < min_successes:
+            logger.error("The number of successful tasks is lower than the minimum ratio")
+            raise exc
+
+    if kind == SERIAL:
+        for i in range(count):
+            capacity.acquire(resources)
+            try:
+                o = _execute_instance(task, instance_inputs, i)
+            except Exception as exc:
+                capacity.release(resources)
+                check(exc)
+                yield i, None, exc
+            else:
+                capacity.release(resources)
+                yield i, o, None
+        return
+
+    max_workers = min(concurrency or os.cpu_count() or 1, count)
+    max_workers = min(max_workers, capacity.max_concurrent(resources) or max_workers)
+    executor, fn = _new_executor(kind, task, instance_inputs, max_workers, resources.mem_limit)
+    running: typing.Dict[Future, int] = {}
+    try:
+        started = 0
+        while started < count or running:
+            while started < count and len(running) < max_workers:
+                # Only waits for the resources other tasks hold if none of the instances run, otherwise they are
+                # acquired again once an instance completed
+                if running and not capacity.try_acquire(resources):
+                    break
+                if not running:
+                    capacity.acquire(resources)
+                running[executor.submit(fn, started)] = started
+                started += 1
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for f in done:
+                i = running.pop(f)
+                capacity.release(resources)
+                exc = f.exception()
+                if exc is not None:
+                    check(exc)
+                    yield i, None, exc
+                else:
+                    logger.debug(f"Map task instance {i} of {task.name} completed")
+                    yield i, f.result(), None
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        for _ in running:
+            capacity.release(resources)
+
+
+def execute_mapped(
+    task,
+    count: int,
+    instance_inputs: typing.Callable[[int], typing.Dict[str, typing.Any]],
+    min_successes: int,
+    concurrency: typing.Optional[int] = None,
+) -> typing.List[typing.Any]:
+    """
+    Like :py:func:`iter_mapped`, but returns the outputs of all instances in the order of their indices, with
+    ``None`` for the instances that failed.
+    """
+    outputs: typing.List[typing.Any] = [None] * count
+    for i, o, _ in iter_mapped(task, count, instance_inputs, min_successes, concurrency):
+        outputs[i] = o
+    return outputs
+
+
+class _Pipeline(object):
+    """
+    Runs element ``i`` through all the stages of a pipeline, one after the other. Failures are returned rather than
+    raised, so that they are counted against the stage they happened in. The stages after a failure are skipped for
+    that element, and report the same failure.
+    """
+
+    def __init__(self, stages: typing.List[MapStage]):
+        self.stages = stages
+        self.name = " -> ".join(s.task.name for s in stages)
+
+    def execute(self, i: int) -> typing.List[typing.Tuple[typing.Any, typing.Optional[BaseException]]]:
+        results: typing.List[typing.Tuple[typing.Any, typing.Optional[BaseException]]] = []
+        prev = None
+        for s, stage in enumerate(self.stages):
+            inputs = stage.instance_inputs(i)
+            if stage.link:
+                inputs[stage.link] = prev
+            try:
+                prev = exception_scopes.user_entry_point(stage.task.execute)(**inputs)
+                results.append((prev, None))
+            except Exception as exc:
+                # The scoped exception holds on to a traceback, which cannot be sent back from a worker process
+                failure = exc.value if isinstance(exc, FlyteScopedException) else exc
+                results.extend([(None, failure)] * (len(self.stages) - s))
+                break
+        return results
+
+
+def execute_pipelined(stages: typing.List[MapStage]) -> typing.List[typing.List[typing.Any]]:
+    """
+    Runs map stages that each map over the outputs of the previous one, such that element ``i`` of a stage starts as
+    soon as element ``i`` of the previous stage completed, rather than after all of them did. Returns the outputs of
+    every stage, in the order of their indices. Every stage keeps its own ``min_successes``, and the pipeline runs
+    with the lowest ``concurrency`` of its stages.
+    """
+    count = stages[0].count
+    outputs: typing.List[typing.List[typing.Any]] = [[None] * count for _ in stages]
+    failed = [0] * len(stages)
+    required = [stage.required_successes(count) for stage in stages]
+    concurrency = min((stage.concurrency for stage in stages if stage.concurrency), default=None)
+    for i, results, _ in iter_mapped(_Pipeline(stages), count, lambda i: {"i": i}, 0, concurrency):
+        for s, (o, exc) in enumerate(results):
+            if exc is not None:
+                failed[s] += 1
+                if count - failed[s] < required[s]:
+                    logger.error("The number of successful tasks is lower than the minimum ratio")
+                    raise exc
+            outputs[s][i] = o
+    return outputs
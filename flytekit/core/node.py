@@ -60,6 +60,7 @@ class Node(object):
         self._metadata = metadata
         self._bindings = bindings
         self._upstream_nodes = upstream_nodes
+        self._upstream_node_set: typing.Optional[typing.Set[Node]] = None
         self._flyte_entity = flyte_entity
         self._aliases: _workflow_model.Alias = None
         self._outputs = None
@@ -75,8 +76,12 @@ class Node(object):
         other direction is not implemented to further avoid confusion. Right shift was picked rather than left shift
         because that's what most users are familiar with.
         """
-        if self not in other._upstream_nodes:
+        # Nodes that many nodes run before, like the last node of a workflow, would make this quadratic with a list
+        if other._upstream_node_set is None:
+            other._upstream_node_set = set(other._upstream_nodes)
+        if self not in other._upstream_node_set:
             other._upstream_nodes.append(self)
+            other._upstream_node_set.add(self)
 
     def __rshift__(self, other: Node):
         self.runs_before(other)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import collections
 import inspect
+import weakref
 from copy import deepcopy
 from enum import Enum
 from typing import Any, Coroutine, Dict, List, Optional, Set, Tuple, Union, cast
@@ -1013,6 +1014,25 @@ def create_and_link_node_from_remote(
     return create_task_output(node_outputs)
 
 
+# Typed interfaces of the python interfaces of the entities nodes were created for, see _typed_interface_for_binding
+_binding_typed_interfaces: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _typed_interface_for_binding(interface: Interface) -> _interface_models.TypedInterface:
+    """
+    Python interfaces are not modified once created, so the typed interface an entity binds its inputs against is
+    only computed the first time a node is created for it, rather than for every node. Workflows that call the same
+    few tasks thousands of times spend most of their compilation here otherwise.
+    """
+    typed_interface = _binding_typed_interfaces.get(interface)
+    if typed_interface is None:
+        typed_interface = flyte_interface.transform_interface_to_typed_interface(
+            interface, allow_partial_artifact_id_binding=True
+        )
+        _binding_typed_interfaces[interface] = typed_interface
+    return typed_interface
+
+
 def create_and_link_node(
     ctx: FlyteContext,
     entity: SupportsNodeCreation,
@@ -1035,13 +1055,13 @@ def create_and_link_node(
     nodes = []
 
     interface = entity.python_interface
-    typed_interface = flyte_interface.transform_interface_to_typed_interface(
-        interface, allow_partial_artifact_id_binding=True
-    )
+    typed_interface = _typed_interface_for_binding(interface)
     # Mypy needs some extra help to believe that `typed_interface` will not be `None`
     assert typed_interface is not None
+    # The inputs property builds a new dict on every access
+    inputs = interface.inputs
 
-    for k in sorted(interface.inputs):
+    for k in sorted(inputs):
         var = typed_interface.inputs[k]
         if k not in kwargs:
             is_optional = False
@@ -1057,7 +1077,7 @@ def create_and_link_node(
             if not is_optional:
                 from flytekit.core.base_task import Task
 
-                error_msg = f"Input {k} of type {interface.inputs[k]} was not specified for function {entity.name}"
+                error_msg = f"Input {k} of type {inputs[k]} was not specified for function {entity.name}"
 
                 _, _default = interface.inputs_with_defaults[k]
                 if isinstance(entity, Task) and _default is not None:
@@ -1084,7 +1104,7 @@ def create_and_link_node(
                 var_name=k,
                 expected_literal_type=var.type,
                 t_value=v,
-                t_value_type=interface.inputs[k],
+                t_value_type=inputs[k],
             )
             bindings.append(b)
             nodes.extend(n)
@@ -1100,7 +1120,7 @@ def create_and_link_node(
 
     # Detect upstream nodes
     # These will be our core Nodes until we can amend the Promise to use NodeOutputs that reference our Nodes
-    upstream_nodes = list(set([n for n in nodes if n.id != _common_constants.GLOBAL_INPUT_NODE_ID]))
+    upstream_nodes = list(dict.fromkeys(n for n in nodes if n.id != _common_constants.GLOBAL_INPUT_NODE_ID))
 
     flytekit_node = Node(
         # TODO: Better naming, probably a derivative of the function name.
@@ -1157,8 +1177,9 @@ def flyte_entity_call_handler(
             f"Aborting execution as detected {len(args)} positional args {args}"
         )
     # Make sure arguments are part of interface
+    inputs = cast(SupportsNodeCreation, entity).python_interface.inputs
     for k, v in kwargs.items():
-        if k not in cast(SupportsNodeCreation, entity).python_interface.inputs:
+        if k not in inputs:
             raise ValueError(
                 f"Received unexpected keyword argument '{k}' in function '{cast(SupportsNodeCreation, entity).name}'"
             )
@@ -1200,7 +1221,16 @@ def flyte_entity_call_handler(
             ctx.with_execution_state(ctx.new_execution_state().with_params(mode=mode)).with_output_metadata_tracker(omt)
         ) as child_ctx:
             cast(ExecutionParameters, child_ctx.user_space_params)._decks = []
-            result = cast(LocallyExecutable, entity).local_execute(child_ctx, **kwargs)
+            try:
+                result = cast(LocallyExecutable, entity).local_execute(child_ctx, **kwargs)
+            finally:
+                from flytekit.core.local_resources import clear_local_capacity
+                from flytekit.types.structured.arrow_ipc import clear_handoff
+
+                # Datasets are only handed off in memory between the nodes of one local execution, which also share
+                # one capacity
+                clear_handoff()
+                clear_local_capacity()
 
         expected_outputs = len(cast(SupportsNodeCreation, entity).python_interface.outputs)
         if expected_outputs == 0:
@@ -233,13 +233,16 @@ class PythonFunctionTask(PythonAutoContainerTask[T]):  # type: ignore
 
         with FlyteContextManager.with_context(updated_ctx):
             # TODO: Resolve circular import
-            from flytekit.tools.translator import get_serializable
+            from flytekit.tools.translator import dynamic_node_templates, get_serializable
 
             self._create_and_cache_dynamic_workflow()
             cast(PythonFunctionWorkflow, self._wf).compile(**kwargs)
 
             wf = self._wf
             model_entities: OrderedDict = OrderedDict()
+            # Generated nodes mostly call the same few tasks, serialize each kind of node only once. The workflow
+            # below then finds its nodes serialized already.
+            dynamic_node_templates.serialize_nodes(model_entities, ctx.serialization_settings, wf.nodes)
             # See comment on reference entity checking a bit down below in this function.
             # This is the only circular dependency between the translator.py module and the rest of the flytekit
             # authoring experience.
@@ -6,9 +6,12 @@ import dataclasses
 import datetime as _datetime
 import enum
 import inspect
+import io
 import json
 import json as _json
 import mimetypes
+import os
+import shutil
 import textwrap
 import typing
 from abc import ABC, abstractmethod
@@ -28,6 +31,13 @@ from mashumaro.mixins.json import DataClassJSONMixin
 from typing_extensions import Annotated, get_args, get_origin
 
 from flytekit.core.annotation import FlyteAnnotation
+from flytekit.core.compression import (
+    COMPRESSION_METADATA_KEY,
+    compress_for_upload,
+    get_codec,
+    get_decompressed,
+    get_literal_codec,
+)
 from flytekit.core.context_manager import FlyteContext
 from flytekit.core.hash import HashMethod
 from flytekit.core.type_helpers import load_type_from_tag
@@ -570,6 +580,12 @@ class DataclassTransformer(TypeTransformer[object]):
             or issubclass(python_type, StructuredDataset)
         ):
             lv = TypeEngine.to_literal(FlyteContext.current_context(), python_val, python_type, None)
+            if get_literal_codec(lv):
+                # Only the path is stored in the JSON, the consumer would read the compressed bytes
+                raise TypeTransformerFailedError(
+                    f"Compressed file {lv.scalar.blob.uri} cannot be stored in a dataclass, pass it as a separate"
+                    f" input or output instead"
+                )
             # dataclasses_json package will extract the "path" from FlyteFile, FlyteDirectory, and write it to a
             # JSON which will be stored in IDL. The path here should always be a remote path, but sometimes the
             # path in FlyteFile and FlyteDirectory could be a local path. Therefore, reset the python value here,
@@ -1713,6 +1729,44 @@ class DictTransformer(TypeTransformer[dict]):
         raise ValueError(f"Dictionary transformer cannot reverse {literal_type}")
 
 
+def _file_like_to_literal(
+    ctx: FlyteContext, python_val: typing.IO, python_type: Type, blob_type: _core_types.BlobType, write_mode: str
+) -> Literal:
+    """
+    Uploads the contents of a file handle, compressed if configured for ``python_type``, and returns the blob literal.
+    Handles to local files are uploaded from their path, anything else is first written to a local file.
+    """
+    name = getattr(python_val, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        if not python_val.closed and python_val.writable():
+            python_val.flush()
+        local_path = name
+    else:
+        local_path = ctx.file_access.get_random_local_path()
+        if python_val.seekable():
+            python_val.seek(0)
+        with open(local_path, write_mode) as f:
+            shutil.copyfileobj(python_val, f)
+
+    metadata = None
+    codec = get_codec(python_type)
+    if codec:
+        local_path = compress_for_upload(ctx, local_path, codec)
+        metadata = {COMPRESSION_METADATA_KEY: codec}
+    remote_path = ctx.file_access.put_raw_data(local_path)
+    return Literal(scalar=Scalar(blob=Blob(metadata=BlobMetadata(type=blob_type), uri=remote_path)), metadata=metadata)
+
+
+def _download_file_like(ctx: FlyteContext, lv: Literal) -> str:
+    """
+    Downloads the blob of the literal to a random local path, decompressing it if it was uploaded compressed.
+    """
+    # TODO rename to get_auto_local_path()
+    local_path = ctx.file_access.get_random_local_path()
+    get_decompressed(ctx, lv.scalar.blob.uri, local_path, get_literal_codec(lv))
+    return local_path
+
+
 class TextIOTransformer(TypeTransformer[typing.TextIO]):
     """
     Handler for TextIO
@@ -1730,17 +1784,19 @@ class TextIOTransformer(TypeTransformer[typing.TextIO]):
     def get_literal_type(self, t: typing.TextIO) -> LiteralType:  # type: ignore
         return _type_models.LiteralType(blob=self._blob_type())
 
+    def assert_type(self, t: Type[typing.TextIO], v: typing.TextIO):
+        if not isinstance(v, (io.TextIOBase, typing.TextIO)):
+            raise TypeTransformerFailedError(f"Expected a text file handle but got '{v}' of type {type(v)}")
+
     def to_literal(
         self, ctx: FlyteContext, python_val: typing.TextIO, python_type: Type[typing.TextIO], expected: LiteralType
     ) -> Literal:
-        raise NotImplementedError("Implement handle for TextIO")
+        return _file_like_to_literal(ctx, python_val, python_type, self._blob_type(), "w")
 
     def to_python_value(
         self, ctx: FlyteContext, lv: Literal, expected_python_type: Type[typing.TextIO]
     ) -> typing.TextIO:
-        # TODO rename to get_auto_local_path()
-        local_path = ctx.file_access.get_random_local_path()
-        ctx.file_access.get_data(lv.scalar.blob.uri, local_path, is_multipart=False)
+        local_path = _download_file_like(ctx, lv)
         # TODO it is probably the responsibility of the framework to close() this
         return open(local_path, "r")
 
@@ -1764,16 +1820,19 @@ class BinaryIOTransformer(TypeTransformer[typing.BinaryIO]):
             blob=self._blob_type(),
         )
 
+    def assert_type(self, t: Type[typing.BinaryIO], v: typing.BinaryIO):
+        if not isinstance(v, (io.BufferedIOBase, io.RawIOBase, typing.BinaryIO)):
+            raise TypeTransformerFailedError(f"Expected a binary file handle but got '{v}' of type {type(v)}")
+
     def to_literal(
         self, ctx: FlyteContext, python_val: typing.BinaryIO, python_type: Type[typing.BinaryIO], expected: LiteralType
     ) -> Literal:
-        raise NotImplementedError("Implement handle for TextIO")
+        return _file_like_to_literal(ctx, python_val, python_type, self._blob_type(), "wb")
 
     def to_python_value(
         self, ctx: FlyteContext, lv: Literal, expected_python_type: Type[typing.BinaryIO]
     ) -> typing.BinaryIO:
-        local_path = ctx.file_access.get_random_local_path()
-        ctx.file_access.get_data(lv.scalar.blob.uri, local_path, is_multipart=False)
+        local_path = _download_file_like(ctx, lv)
         # TODO it is probability the responsibility of the framework to close this
         return open(local_path, "rb")
 
@@ -1,5 +1,6 @@
 import datetime
 import os as _os
+import re
 import shutil as _shutil
 import tempfile as _tempfile
 import time as _time
@@ -18,6 +19,9 @@ from flytekit.loggers import logger
 if TYPE_CHECKING:
     from flytekit.models import task as task_models
 
+# Values _dnsify returns unchanged, like the generated ids of nodes
+_DNS_LABEL = re.compile(r"[a-z0-9]([-a-z0-9]{0,60}[a-z0-9])?")
+
 
 def _dnsify(value: str) -> str:
     """
@@ -28,6 +32,8 @@ def _dnsify(value: str) -> str:
     :param Text value:
     :rtype: Text
     """
+    if _DNS_LABEL.fullmatch(value):
+        return value
     res = ""
     MAX = 63
     HASH_LEN = 10
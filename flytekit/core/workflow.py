@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import inspect
 import typing
 from dataclasses import dataclass
@@ -26,6 +27,7 @@ from flytekit.core.interface import (
     transform_function_to_interface,
     transform_interface_to_typed_interface,
 )
+from flytekit.core.local_scheduler import execute_nodes, use_local_scheduler
 from flytekit.core.node import Node
 from flytekit.core.promise import (
     NodeOutput,
@@ -35,6 +37,7 @@ from flytekit.core.promise import (
     create_task_output,
     extract_obj_name,
     flyte_entity_call_handler,
+    resolve_attr_path_in_promise,
     translate_inputs_to_literals,
 )
 from flytekit.core.python_auto_container import PythonAutoContainerTask
@@ -134,7 +137,13 @@ def get_promise(binding_data: _literal_models.BindingData, outputs_cache: Dict[N
             )
         # b.var is the name of the input to the task
         # binding_data.promise.var is the name of the upstream node's output we want
-        return outputs_cache[binding_data.promise.node][binding_data.promise.var]
+        p = outputs_cache[binding_data.promise.node][binding_data.promise.var]
+        if binding_data.promise.attr_path:
+            # The input is an attribute of the output, e.g. t2(x=o["a"][0])
+            for key in binding_data.promise.attr_path:
+                p = p[key]
+            p = resolve_attr_path_in_promise(p)
+        return p
     elif binding_data.scalar is not None:
         return Promise(var="placeholder", val=_literal_models.Literal(scalar=binding_data.scalar))
     elif binding_data.collection is not None:
@@ -365,6 +374,28 @@ class WorkflowBase(object):
         """ """
         return ExecutionState.Mode.LOCAL_WORKFLOW_EXECUTION
 
+    def _outputs_from_nodes(self, intermediate_node_outputs: Dict[Node, Dict[str, Promise]]):
+        """
+        Fulfills the output bindings of the workflow from the outputs of its nodes, after they were run locally.
+        """
+        if len(self.python_interface.outputs) == 0:
+            return VoidPromise(self.name)
+
+        # The values that we return below from the output have to be pulled by fulfilling all of the
+        # workflow's output bindings.
+        # The return style here has to match what 1) what the workflow would've returned had it been declared
+        # functionally, and 2) what a user would return in mock function. That is, if it's a tuple, then it
+        # should be a tuple here, if it's a one element named tuple, then we do a one-element non-named tuple,
+        # if it's a single element then we return a single element
+        if len(self.output_bindings) == 1:
+            # Again use presence of output_tuple_name to understand that we're dealing with a one-element
+            # named tuple
+            if self.python_interface.output_tuple_name:
+                return (get_promise(self.output_bindings[0].binding, intermediate_node_outputs),)
+            # Just a normal single element
+            return get_promise(self.output_bindings[0].binding, intermediate_node_outputs)
+        return tuple([get_promise(b.binding, intermediate_node_outputs) for b in self.output_bindings])
+
 
 class ImperativeWorkflow(WorkflowBase):
     """
@@ -466,59 +497,13 @@ class ImperativeWorkflow(WorkflowBase):
         for k, v in kwargs.items():
             intermediate_node_outputs[GLOBAL_START_NODE][k] = v
 
-        # Next iterate through the nodes in order.
-        for node in self.compilation_state.nodes:
-            if node not in intermediate_node_outputs.keys():
-                intermediate_node_outputs[node] = {}
-
-            # Retrieve the entity from the node, and call it by looking up the promises the node's bindings require,
-            # and then fill them in using the node output tracker map we have.
-            entity = node.flyte_entity
-            entity_kwargs = get_promise_map(node.bindings, intermediate_node_outputs)
-
-            # Handle the calling and outputs of each node's entity
-            results = entity(**entity_kwargs)
-            expected_output_names = list(entity.python_interface.outputs.keys())
-
-            if isinstance(results, VoidPromise) or results is None:
-                continue  # pragma: no cover # Move along, nothing to assign
-
-            # Because we should've already returned in the above check, we just raise an Exception here.
-            if len(entity.python_interface.outputs) == 0:
-                raise FlyteValueException(results, "Interface output should've been VoidPromise or None.")
-
-            # if there's only one output,
-            if len(expected_output_names) == 1:
-                if entity.python_interface.output_tuple_name and isinstance(results, tuple):
-                    intermediate_node_outputs[node][expected_output_names[0]] = results[0]
-                else:
-                    intermediate_node_outputs[node][expected_output_names[0]] = results
-
-            else:
-                if len(results) != len(expected_output_names):
-                    raise FlyteValueException(results, f"Different lengths {results} {expected_output_names}")
-                for idx, r in enumerate(results):
-                    intermediate_node_outputs[node][expected_output_names[idx]] = r
-
-        # The rest of this function looks like the above but now we're doing it for the workflow as a whole rather
-        # than just one node at a time.
-        if len(self.python_interface.outputs) == 0:
-            return VoidPromise(self.name)
-
-        # The values that we return below from the output have to be pulled by fulfilling all of the
-        # workflow's output bindings.
-        # The return style here has to match what 1) what the workflow would've returned had it been declared
-        # functionally, and 2) what a user would return in mock function. That is, if it's a tuple, then it
-        # should be a tuple here, if it's a one element named tuple, then we do a one-element non-named tuple,
-        # if it's a single element then we return a single element
-        if len(self.output_bindings) == 1:
-            # Again use presence of output_tuple_name to understand that we're dealing with a one-element
-            # named tuple
-            if self.python_interface.output_tuple_name:
-                return (get_promise(self.output_bindings[0].binding, intermediate_node_outputs),)
-            # Just a normal single element
-            return get_promise(self.output_bindings[0].binding, intermediate_node_outputs)
-        return tuple([get_promise(b.binding, intermediate_node_outputs) for b in self.output_bindings])
+        # Next run the nodes, in order or concurrently as their inputs become available.
+        execute_nodes(
+            self.compilation_state.nodes,
+            intermediate_node_outputs,
+            fail_immediately=self.workflow_metadata.on_failure == WorkflowFailurePolicy.FAIL_IMMEDIATELY,
+        )
+        return self._outputs_from_nodes(intermediate_node_outputs)
 
     def create_conditional(self, name: str) -> ConditionalSection:
         ctx = FlyteContext.current_context()
@@ -792,7 +777,31 @@ class PythonFunctionWorkflow(WorkflowBase, ClassStorageTaskResolver):
         This function is here only to try to streamline the pattern between workflows and tasks. Since tasks
         call execute from dispatch_execute which is in local_execute, workflows should also call an execute inside
         local_execute. This makes mocking cleaner.
+
+        When more than one node may run at the same time locally, or map tasks are pipelined, the compiled nodes are
+        run directly as their inputs become available, as long as they are all tasks, workflows or launch plans.
+        Conditionals have to be evaluated by running the workflow function.
         """
+        if (
+            use_local_scheduler()
+            and len(self._nodes) > 1
+            and all(
+                isinstance(n.flyte_entity, (PythonTask, WorkflowBase, _annotated_launch_plan.LaunchPlan))
+                for n in self._nodes
+            )
+        ):
+
+            @functools.wraps(self._workflow_function)
+            def execute_compiled_nodes(**inputs):
+                intermediate_node_outputs: Dict[Node, Dict[str, Promise]] = {GLOBAL_START_NODE: inputs}
+                execute_nodes(
+                    self._nodes,
+                    intermediate_node_outputs,
+                    fail_immediately=self.workflow_metadata.on_failure == WorkflowFailurePolicy.FAIL_IMMEDIATELY,
+                )
+                return self._outputs_from_nodes(intermediate_node_outputs)
+
+            return exception_scopes.user_entry_point(execute_compiled_nodes)(**kwargs)
         return exception_scopes.user_entry_point(self._workflow_function)(**kwargs)
 
 
@@ -1,18 +1,24 @@
 import asyncio
 import inspect
+import multiprocessing
+import os
 import signal
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from functools import partial, wraps
 from typing import List, Optional
 
 from flytekit import Deck, Secret, current_context
-from flytekit.configuration import DataConfig, PlatformConfig, S3Config
+from flytekit.configuration import DataConfig, LocalConfig, PlatformConfig, S3Config
 from flytekit.core.base_task import PythonTask
 from flytekit.core.context_manager import ExecutionState, FlyteContext, FlyteContextManager
+from flytekit.core.map_executor import PROCESS, SERIAL, THREAD
 from flytekit.core.python_function_task import PythonFunctionTask
 from flytekit.core.task import task
 from flytekit.core.workflow import WorkflowBase
+from flytekit.exceptions.scopes import FlyteScopedException
+from flytekit.interfaces import random as _flyte_random
 from flytekit.loggers import logger
 from flytekit.models.core.execution import WorkflowExecutionPhase
 from flytekit.remote import FlyteRemote
@@ -88,6 +94,98 @@ class EagerException(Exception):
     """
 
 
+EAGER_EXECUTORS = (THREAD, PROCESS, SERIAL)
+
+
+def _execute_forked(entity, kwargs, conn):
+    # The flytekit random generator is not reseeded on fork, without this the tasks would create the same "random"
+    # local paths
+    _flyte_random.random.seed()
+    try:
+        conn.send((True, entity(**kwargs)))
+    except Exception as exc:
+        # The scoped exception holds on to a traceback, which cannot be sent back to the parent process
+        conn.send((False, exc.value if isinstance(exc, FlyteScopedException) else exc))
+    finally:
+        conn.close()
+
+
+def _execute_in_process(entity, kwargs):
+    """
+    Runs the task in a process forked for it, so that it inherits the task and the flyte context rather than having
+    to pickle them, and returns its outputs.
+    """
+    mp_context = multiprocessing.get_context("fork")
+    reader, writer = mp_context.Pipe(duplex=False)
+    process = mp_context.Process(target=_execute_forked, args=(entity, kwargs, writer))
+    process.start()
+    writer.close()
+    try:
+        ok, out = reader.recv()
+    except EOFError:
+        process.join()
+        raise EagerException(f"The process running {entity.name} exited with code {process.exitcode}")
+    finally:
+        reader.close()
+    process.join()
+    if not ok:
+        raise out
+    return out
+
+
+class LocalTaskRunner:
+    """
+    Runs the tasks called by an eager workflow executed locally off the event loop, in a pool of threads or in forked
+    processes as configured by ``FLYTE_LOCAL_EAGER_EXECUTOR``, so that tasks that are awaited together run
+    concurrently, up to ``FLYTE_LOCAL_EAGER_CONCURRENCY`` at the same time.
+    """
+
+    def __init__(self):
+        config = LocalConfig.auto()
+        self._kind = config.eager_executor
+        if self._kind not in EAGER_EXECUTORS:
+            raise ValueError(f"Unsupported local eager executor {self._kind}, expected one of {list(EAGER_EXECUTORS)}")
+        if self._kind == PROCESS and "fork" not in multiprocessing.get_all_start_methods():
+            logger.info("Forking processes is not supported on this platform, running eager tasks in threads")
+            self._kind = THREAD
+        self._concurrency = config.eager_concurrency or os.cpu_count() or 1
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def _run_in_thread(self, fn):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+            self._executor = ThreadPoolExecutor(max_workers=self._concurrency, thread_name_prefix="flyte-eager")
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, FlyteContextManager.propagate_context(fn)
+            )
+
+    async def run(self, entity: PythonTask, kwargs):
+        if self._kind == SERIAL:
+            return entity(**kwargs)
+        fn = partial(_execute_in_process, entity, kwargs) if self._kind == PROCESS else partial(entity, **kwargs)
+        return await self._run_in_thread(fn)
+
+    async def run_workflow(self, entity: WorkflowBase, kwargs):
+        """
+        Runs the function of a workflow, which calls its tasks synchronously, in a thread rather than on the event
+        loop, and awaits what it returns on the event loop if that is a coroutine.
+        """
+        if self._kind == SERIAL:
+            out = entity._workflow_function(**kwargs)
+        else:
+            out = await self._run_in_thread(partial(entity._workflow_function, **kwargs))
+        if inspect.iscoroutine(out):
+            # need to handle invocation of AsyncEntity tasks within the workflow
+            out = await out
+        return out
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
 class AsyncEntity:
     """A wrapper around a Flyte entity (task, workflow, launch plan) that allows it to be executed asynchronously."""
 
@@ -100,6 +198,7 @@ class AsyncEntity:
         timeout: Optional[timedelta] = None,
         poll_interval: Optional[timedelta] = None,
         local_entrypoint: bool = False,
+        local_runner: Optional[LocalTaskRunner] = None,
     ):
         self.entity = entity
         self.ctx = ctx
@@ -114,6 +213,7 @@ class AsyncEntity:
         self._timeout = timeout
         self._poll_interval = poll_interval
         self._execution = None
+        self._local_runner = local_runner or LocalTaskRunner()
 
     async def __call__(self, **kwargs):
         logger.debug(f"Calling {self.entity}: {self.entity.name}")
@@ -132,17 +232,16 @@ class AsyncEntity:
             # If running as a local workflow execution, just execute the python function
             try:
                 if isinstance(self.entity, WorkflowBase):
-                    out = self.entity._workflow_function(**kwargs)
-                    if inspect.iscoroutine(out):
-                        # need to handle invocation of AsyncEntity tasks within the workflow
-                        out = await out
-                    return out
-                elif isinstance(self.entity, PythonTask):
-                    # invoke the task-decorated entity
+                    return await self._local_runner.run_workflow(self.entity, kwargs)
+                elif getattr(self.entity, "execution_mode", None) == PythonFunctionTask.ExecutionBehavior.EAGER:
+                    # nested eager workflows run on this event loop
                     out = self.entity(**kwargs)
                     if inspect.iscoroutine(out):
                         out = await out
                     return out
+                elif isinstance(self.entity, PythonTask):
+                    # invoke the task-decorated entity off the event loop, so that other tasks can run meanwhile
+                    return await self._local_runner.run(self.entity, kwargs)
                 else:
                     raise ValueError(f"Entity type {type(self.entity)} not supported for local execution")
             except Exception as exc:
@@ -322,12 +421,15 @@ async def eager_context(
     """This context manager overrides all tasks in the global namespace with async versions."""
 
     _original_cache = {}
+    local_runner = LocalTaskRunner()
 
     # override tasks with async version
     for k, v in fn.__globals__.items():
         if isinstance(v, (PythonTask, WorkflowBase)):
             _original_cache[k] = v
-            fn.__globals__[k] = AsyncEntity(v, remote, ctx, async_stack, timeout, poll_interval, local_entrypoint)
+            fn.__globals__[k] = AsyncEntity(
+                v, remote, ctx, async_stack, timeout, poll_interval, local_entrypoint, local_runner
+            )
 
     try:
         yield
@@ -335,6 +437,7 @@ async def eager_context(
         # restore old tasks
         for k, v in _original_cache.items():
             fn.__globals__[k] = v
+        local_runner.shutdown()
 
 
 async def node_cleanup_async(sig, loop, async_stack: AsyncStack):
@@ -1,4 +1,5 @@
 import sys
+import threading
 import typing
 from collections import OrderedDict
 from dataclasses import dataclass
@@ -245,6 +246,8 @@ def get_serializable_workflow(
     entity: WorkflowBase,
     options: Optional[Options] = None,
 ) -> admin_workflow_models.WorkflowSpec:
+    from flytekit.remote import FlyteWorkflow
+
     # Serialize all nodes
     serialized_nodes = []
     sub_wfs = []
@@ -274,8 +277,6 @@ def get_serializable_workflow(
             sub_wfs.append(sub_wf_spec.template)
             sub_wfs.extend(sub_wf_spec.sub_workflows)
 
-        from flytekit.remote import FlyteWorkflow
-
         if isinstance(n.flyte_entity, FlyteWorkflow):
             for swf in n.flyte_entity.flyte_sub_workflows:
                 sub_wf = get_serializable(entity_mapping, settings, swf, options)
@@ -331,6 +332,9 @@ def get_serializable_workflow(
         failure_node=serialized_failure_node,
     )
 
+    # Subworkflows are added once for every node that runs them, and hashing one serializes it. Most are the same
+    # object, which is much cheaper to find out.
+    sub_wfs = list({id(s): s for s in sub_wfs}.values())
     return admin_workflow_models.WorkflowSpec(
         template=wf_t, sub_workflows=sorted(set(sub_wfs), key=lambda x: x.short_string()), docs=entity.docs
     )
@@ -793,6 +797,104 @@ def get_serializable(
     return cp_entity
 
 
+class NodeTemplateCache(object):
+    """
+    Remembers serialized task nodes by their structure: the task a node runs, its metadata and its overrides. Nodes
+    with the same structure only differ in their ids, upstream nodes and input bindings, so everything else is reused
+    rather than serialized again. Dynamic workflows use this so that the nodes they generate, often thousands of calls
+    to the same few tasks, are serialized once per structure rather than once per node, within a compilation and
+    across compilations in the same process. The templates of the tasks are serialized once per compilation, as a
+    task can change in between, e.g. ``with_overrides(task_config=...)`` replaces the config of the task itself.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self._max_size = max_size
+        self._settings: Optional[SerializationSettings] = None
+        self._templates: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(node: Node) -> Optional[tuple]:
+        entity = node.flyte_entity
+        # Array nodes embed the bindings of the node, and reference entities are not serialized from the entity
+        if not isinstance(entity, PythonTask) or isinstance(entity, (ReferenceEntity, ArrayNodeMapTask)):
+            return None
+        m = node.metadata
+        return (
+            entity,
+            m.name,
+            m.timeout,
+            m.retries.retries,
+            m.interruptible,
+            m.cacheable,
+            m.cache_version,
+            m.cache_serializable,
+            node._resources.to_flyte_idl().SerializeToString(deterministic=True) if node._resources else None,
+            node._extended_resources.SerializeToString(deterministic=True) if node._extended_resources else None,
+            node._container_image,
+            tuple((a.var, a.alias) for a in node._aliases) if node._aliases else None,
+        )
+
+    def serialize_nodes(
+        self,
+        entity_mapping: OrderedDict,
+        settings: SerializationSettings,
+        nodes: List[Node],
+        options: Optional[Options] = None,
+    ) -> List[workflow_model.Node]:
+        """
+        Serializes ``nodes`` like :py:func:`get_serializable` does, adding them and the tasks they run to
+        ``entity_mapping``. Nodes that are not plain task nodes are serialized as usual.
+        """
+        with self._lock:
+            if settings != self._settings:
+                # The templates depend on the project, domain, version and images of the settings
+                self._templates.clear()
+                self._settings = settings
+        return [self._serialize_node(entity_mapping, settings, n, options) for n in nodes]
+
+    def _serialize_node(
+        self, entity_mapping: OrderedDict, settings: SerializationSettings, node: Node, options: Optional[Options]
+    ) -> workflow_model.Node:
+        key = self._key(node)
+        if key is None or node in entity_mapping:
+            return get_serializable(entity_mapping, settings, node, options)
+        with self._lock:
+            cached = self._templates.get(key)
+            if cached is not None:
+                self._templates.move_to_end(key)
+        if cached is None:
+            node_model = get_serializable(entity_mapping, settings, node, options)
+            with self._lock:
+                self._templates[key] = node_model
+                if len(self._templates) > self._max_size:
+                    self._templates.popitem(last=False)
+            return node_model
+
+        template = cached
+        # Tasks have to come before the nodes that run them
+        get_serializable(entity_mapping, settings, node.flyte_entity, options)
+        upstream_node_ids = [
+            get_serializable(entity_mapping, settings, n, options).id
+            for n in node.upstream_nodes
+            if n.id != _common_constants.GLOBAL_INPUT_NODE_ID
+        ]
+        node_model = workflow_model.Node(
+            id=_dnsify(node.id),
+            metadata=template.metadata,
+            inputs=node.bindings,
+            upstream_node_ids=upstream_node_ids,
+            output_aliases=template.output_aliases,
+            task_node=template.task_node,
+        )
+        entity_mapping[node] = node_model
+        return node_model
+
+
+# Shared by the dynamic workflows compiled in this process
+dynamic_node_templates = NodeTemplateCache()
+
+
 def gather_dependent_entities(
     serialized: OrderedDict,
 ) -> Tuple[
@@ -10,13 +10,14 @@ Similar to :py:class:`flytekit.types.file.FlyteFile` there are some 'preformatte
    :template: file_types.rst
 
    FlyteDirectory
+   DirectoryManifest
    TensorboardLogs
    TFRecordsDirectory
 """
 
 import typing
 
-from .types import FlyteDirectory
+from .types import DirectoryManifest, FlyteDirectory
 
 # The following section provides some predefined aliases for commonly used FlyteDirectory formats.
 
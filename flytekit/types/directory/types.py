@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 import pathlib
 import random
 import typing
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Generator, Tuple
@@ -13,11 +16,20 @@ import fsspec
 from dataclasses_json import DataClassJsonMixin, config
 from fsspec.utils import get_protocol
 from marshmallow import fields
+from typing_extensions import get_args
 
 from flytekit import BlobType
 from flytekit.core.context_manager import FlyteContext, FlyteContextManager
-from flytekit.core.type_engine import TypeEngine, TypeTransformer, TypeTransformerFailedError, get_batch_size
+from flytekit.core.type_engine import (
+    TypeEngine,
+    TypeTransformer,
+    TypeTransformerFailedError,
+    get_batch_size,
+    is_annotated,
+)
+from flytekit.core.utils import timeit
 from flytekit.exceptions.user import FlyteAssertion
+from flytekit.loggers import logger
 from flytekit.models import types as _type_models
 from flytekit.models.core import types as _core_types
 from flytekit.models.literals import Blob, BlobMetadata, Literal, Scalar
@@ -27,11 +39,139 @@ from flytekit.types.file import FileExt, FlyteFile
 T = typing.TypeVar("T")
 PathType = typing.Union[str, os.PathLike]
 
+MANIFEST_FILE_NAME = ".flyte_manifest.json"
+MANIFEST_METADATA_KEY = "flyte.directory.manifest"
+_MANIFEST_VERSION = 1
+_CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
 
 def noop():
     ...
 
 
+class DirectoryManifest:
+    """
+    This is used to annotate a FlyteDirectory output when we want flytekit to write a manifest of the uploaded
+    directory. For example,
+
+    @task
+    def t1() -> Annotated[FlyteDirectory, DirectoryManifest()]:
+        ...
+        return FlyteDirectory(...)
+
+    The manifest is a json file (see ``MANIFEST_FILE_NAME``) stored in the uploaded directory that records the
+    relative path, size and md5 checksum of every file. Its location is recorded in the metadata of the output
+    literal, so downstream tasks can list (:py:meth:`FlyteDirectory.listdir`, :py:meth:`FlyteDirectory.crawl`) and
+    download the directory without listing the remote prefix, which is slow and paginated for large directories.
+    """
+
+    def __init__(self, checksum: bool = True):
+        """
+        :param checksum: Whether to compute the md5 checksum of every file. Disable this for very large directories
+            when only the listing is needed.
+        """
+        self._checksum = checksum
+
+    @property
+    def checksum(self) -> bool:
+        return self._checksum
+
+
+def get_directory_manifest(t: typing.Type) -> typing.Optional[DirectoryManifest]:
+    if is_annotated(t):
+        for annotation in get_args(t)[1:]:
+            if isinstance(annotation, DirectoryManifest):
+                return annotation
+    return None
+
+
+def _md5_checksum(path: str) -> str:
+    h = hashlib.md5()
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHECKSUM_CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _build_manifest(local_dir: str, checksum: bool = True) -> typing.List[typing.Dict[str, typing.Any]]:
+    """
+    Walks the given local directory and returns the manifest entries for all files in it. Paths are relative to
+    local_dir and always use ``/`` as the separator.
+    """
+    files = []
+    for root, _, names in os.walk(local_dir):
+        for name in names:
+            if name == MANIFEST_FILE_NAME and root == local_dir:
+                continue
+            full_path = os.path.join(root, name)
+            files.append((full_path, pathlib.Path(os.path.relpath(full_path, local_dir)).as_posix()))
+    files.sort(key=lambda f: f[1])
+
+    checksums: typing.List[typing.Optional[str]] = [None] * len(files)
+    if checksum and files:
+        with ThreadPoolExecutor() as executor:
+            checksums = list(executor.map(_md5_checksum, [f[0] for f in files]))
+
+    return [
+        {"path": rel_path, "size": os.path.getsize(full_path), "checksum": c, "etag": None}
+        for (full_path, rel_path), c in zip(files, checksums)
+    ]
+
+
+def _write_manifest(
+    ctx: FlyteContext, entries: typing.List[typing.Dict[str, typing.Any]], remote_directory: str
+) -> str:
+    local_manifest = ctx.file_access.get_random_local_path(MANIFEST_FILE_NAME)
+    os.makedirs(pathlib.Path(local_manifest).parent, exist_ok=True)
+    with open(local_manifest, "w") as f:
+        json.dump({"version": _MANIFEST_VERSION, "entries": entries}, f)
+    fs = ctx.file_access.get_filesystem_for_path(remote_directory)
+    manifest_uri = ctx.file_access.join(remote_directory, MANIFEST_FILE_NAME, fs=fs)
+    return ctx.file_access.put_data(local_manifest, manifest_uri)
+
+
+def _read_manifest(manifest_uri: str) -> typing.List[typing.Dict[str, typing.Any]]:
+    fs = FlyteContextManager.current_context().file_access.get_filesystem_for_path(manifest_uri)
+    with timeit(f"Read directory manifest {manifest_uri}"):
+        with fs.open(manifest_uri, "rb") as f:
+            manifest = json.load(f)
+    if manifest.get("version") != _MANIFEST_VERSION:
+        raise FlyteAssertion(f"Unsupported directory manifest version {manifest.get('version')} in {manifest_uri}")
+    entries = manifest["entries"]
+    for e in entries:
+        parts = e["path"].split("/")
+        if e["path"].startswith("/") or ".." in parts:
+            raise FlyteAssertion(f"Invalid path {e['path']} in directory manifest {manifest_uri}")
+    return entries
+
+
+def _download_from_manifest(
+    ctx: FlyteContext,
+    remote_directory: str,
+    local_folder: str,
+    entries: typing.List[typing.Dict[str, typing.Any]],
+    batch_size: typing.Optional[int] = None,
+):
+    """
+    Downloads the files listed in the manifest entries, without listing the remote directory.
+    """
+    rpaths = [os.path.join(remote_directory, e["path"]) for e in entries]
+    lpaths = [os.path.join(local_folder, *e["path"].split("/")) for e in entries]
+    for lp in lpaths:
+        os.makedirs(os.path.dirname(lp), exist_ok=True)
+    if not rpaths:
+        return
+    fs = ctx.file_access.get_filesystem_for_path(remote_directory)
+    try:
+        with timeit(f"Download {len(rpaths)} files listed in the manifest of {remote_directory}"):
+            fs.get(rpaths, lpaths, batch_size=batch_size)
+    except Exception as ex:
+        raise FlyteAssertion(
+            f"Failed to get data from {remote_directory} to {local_folder} using its manifest.\n\n"
+            f"Original exception: {str(ex)}"
+        )
+
+
 @dataclass
 class FlyteDirectory(DataClassJsonMixin, os.PathLike, typing.Generic[T]):
     path: PathType = field(default=None, metadata=config(mm_field=fields.String()))  # type: ignore
@@ -141,6 +281,8 @@ class FlyteDirectory(DataClassJsonMixin, os.PathLike, typing.Generic[T]):
         self._downloaded = False
         self._remote_directory = remote_directory
         self._remote_source: typing.Optional[str] = None
+        self._manifest_uri: typing.Optional[str] = None
+        self._manifest_entries: typing.Optional[typing.List[typing.Dict[str, typing.Any]]] = None
 
     def __fspath__(self):
         """
@@ -211,6 +353,21 @@ class FlyteDirectory(DataClassJsonMixin, os.PathLike, typing.Generic[T]):
         """
         return typing.cast(str, self._remote_source)
 
+    @property
+    def manifest_uri(self) -> typing.Optional[str]:
+        """
+        If the directory was uploaded with a :py:class:`DirectoryManifest`, this is the location of the manifest.
+        """
+        return self._manifest_uri
+
+    def _get_manifest(self) -> typing.Optional[typing.List[typing.Dict[str, typing.Any]]]:
+        """
+        Returns the manifest entries of this directory if it has a manifest, reading it at most once.
+        """
+        if self._manifest_entries is None and self._manifest_uri:
+            self._manifest_entries = _read_manifest(self._manifest_uri)
+        return self._manifest_entries
+
     def new_file(self, name: typing.Optional[str] = None) -> FlyteFile:
         """
         This will create a new file under the current folder.
@@ -265,7 +422,13 @@ class FlyteDirectory(DataClassJsonMixin, os.PathLike, typing.Generic[T]):
             final_path = typing.cast(os.PathLike, directory.remote_directory)
 
         paths: typing.List[typing.Union[FlyteDirectory, FlyteFile]] = []
-        file_access = FlyteContextManager.current_context().file_access
+        ctx = FlyteContextManager.current_context()
+        file_access = ctx.file_access
+
+        entries = directory._get_manifest()
+        if entries is not None:
+            return cls._listdir_from_manifest(ctx, str(final_path), entries)
+
         if not file_access.is_remote(final_path):
             for p in os.listdir(final_path):
                 if os.path.isfile(os.path.join(final_path, p)):
@@ -298,6 +461,47 @@ class FlyteDirectory(DataClassJsonMixin, os.PathLike, typing.Generic[T]):
 
         return paths
 
+    @staticmethod
+    def _listdir_from_manifest(
+        ctx: FlyteContext, final_path: str, entries: typing.List[typing.Dict[str, typing.Any]]
+    ) -> typing.List[typing.Union[FlyteDirectory, FlyteFile]]:
+        """
+        Lists the immediate children of a directory using its manifest. Sub-directories inherit the relevant part of
+        the manifest, so listing, crawling and downloading them doesn't hit the remote store either.
+        """
+        file_access = ctx.file_access
+        paths: typing.List[typing.Union[FlyteDirectory, FlyteFile]] = []
+        sub_dirs: typing.Dict[str, typing.List[typing.Dict[str, typing.Any]]] = {}
+        for e in entries:
+            head, _, tail = e["path"].partition("/")
+            if tail:
+                sub_dirs.setdefault(head, []).append({**e, "path": tail})
+                continue
+            remote_path = os.path.join(final_path, head)
+            local_path = file_access.get_random_local_path()
+            os.makedirs(pathlib.Path(local_path).parent, exist_ok=True)
+
+            def _file_downloader(_remote_path=remote_path, _local_path=local_path):
+                return file_access.get_data(_remote_path, _local_path, is_multipart=False)
+
+            flyte_file: FlyteFile = FlyteFile(local_path, downloader=_file_downloader)
+            flyte_file._remote_source = remote_path
+            paths.append(flyte_file)
+
+        for name, sub_entries in sub_dirs.items():
+            remote_path = os.path.join(final_path, name)
+            local_folder = file_access.get_random_local_directory()
+
+            def _dir_downloader(_remote_path=remote_path, _local_folder=local_folder, _entries=sub_entries):
+                return _download_from_manifest(ctx, _remote_path, _local_folder, _entries)
+
+            flyte_directory: FlyteDirectory = FlyteDirectory(path=local_folder, downloader=_dir_downloader)
+            flyte_directory._remote_source = remote_path
+            flyte_directory._manifest_entries = sub_entries
+            paths.append(flyte_directory)
+
+        return paths
+
     def crawl(
         self, maxdepth: typing.Optional[int] = None, topdown: bool = True, **kwargs
     ) -> Generator[Tuple[typing.Union[str, os.PathLike[Any]], typing.Dict[Any, Any]], None, None]:
@@ -314,12 +518,21 @@ class FlyteDirectory(DataClassJsonMixin, os.PathLike, typing.Generic[T]):
             [('/tmp/test', {'my-dir/ab.py': {'name': '/tmp/test/my-dir/ab.py', 'size': 0, 'type': 'file',
              'created': 1677720780.2318847, 'islink': False, 'mode': 33188, 'uid': 501, 'gid': 0,
               'mtime': 1677720780.2317934, 'ino': 1694329, 'nlink': 1}})]
+
+        If the directory has a manifest, the files are read from it and the remote directory is not listed. In that
+        case the details only contain the name, size, type and the checksum/etag recorded in the manifest.
         """
         final_path = self.path
         if self.remote_source:
             final_path = self.remote_source
         elif self.remote_directory:
             final_path = typing.cast(os.PathLike, self.remote_directory)
+
+        entries = self._get_manifest()
+        if entries is not None:
+            yield from self._crawl_manifest(str(final_path), entries, maxdepth, kwargs.get("detail", False))
+            return
+
         ctx = FlyteContextManager.current_context()
         fs = ctx.file_access.get_filesystem_for_path(final_path)
         base_path_len = len(fsspec.core.strip_protocol(final_path)) + 1  # Add additional `/` at the end
@@ -332,6 +545,34 @@ class FlyteDirectory(DataClassJsonMixin, os.PathLike, typing.Generic[T]):
                 for f in files:
                     yield final_path, os.path.join(current_base, f)
 
+    @staticmethod
+    def _crawl_manifest(
+        final_path: str,
+        entries: typing.List[typing.Dict[str, typing.Any]],
+        maxdepth: typing.Optional[int],
+        detail: bool,
+    ) -> Generator[Tuple[typing.Union[str, os.PathLike[Any]], typing.Any], None, None]:
+        base_path = fsspec.core.strip_protocol(final_path)
+        for e in entries:
+            rel_path = e["path"]
+            if maxdepth is not None and rel_path.count("/") >= maxdepth:
+                continue
+            if detail:
+                yield (
+                    final_path,
+                    {
+                        rel_path: {
+                            "name": os.path.join(base_path, rel_path),
+                            "size": e["size"],
+                            "type": "file",
+                            "checksum": e.get("checksum"),
+                            "etag": e.get("etag"),
+                        }
+                    },
+                )
+            else:
+                yield final_path, rel_path
+
     def __repr__(self):
         return str(self.path)
 
@@ -386,15 +627,19 @@ class FlyteDirToMultipartBlobTransformer(TypeTransformer[FlyteDirectory]):
         remote_directory = None
         should_upload = True
         batch_size = get_batch_size(python_type)
+        manifest = get_directory_manifest(python_type)
 
         meta = BlobMetadata(type=self._blob_type(format=self.get_format(python_type)))
 
         # There are two kinds of literals we handle, either an actual FlyteDirectory, or a string path to a directory.
         # Handle the FlyteDirectory case
         if isinstance(python_val, FlyteDirectory):
-            # If the object has a remote source, then we just convert it back.
+            # If the object has a remote source, then we just convert it back, keeping the manifest if there is one.
             if python_val._remote_source is not None:
-                return Literal(scalar=Scalar(blob=Blob(metadata=meta, uri=python_val._remote_source)))
+                return Literal(
+                    scalar=Scalar(blob=Blob(metadata=meta, uri=python_val._remote_source)),
+                    metadata={MANIFEST_METADATA_KEY: python_val._manifest_uri} if python_val._manifest_uri else None,
+                )
 
             source_path = str(python_val.path)
             # If the user supplied a pathlike value, then the directory does need to be uploaded. However, don't upload
@@ -431,8 +676,16 @@ class FlyteDirToMultipartBlobTransformer(TypeTransformer[FlyteDirectory]):
                 remote_directory = ctx.file_access.get_random_remote_directory()
             if not pathlib.Path(source_path).is_dir():
                 raise FlyteAssertion("Expected a directory. {} is not a directory".format(source_path))
+            entries = _build_manifest(source_path, checksum=manifest.checksum) if manifest else None
             ctx.file_access.put_data(source_path, remote_directory, is_multipart=True, batch_size=batch_size)
-            return Literal(scalar=Scalar(blob=Blob(metadata=meta, uri=remote_directory)))
+            if entries is None:
+                return Literal(scalar=Scalar(blob=Blob(metadata=meta, uri=remote_directory)))
+            manifest_uri = _write_manifest(ctx, entries, remote_directory)
+            logger.debug(f"Wrote manifest with {len(entries)} entries for {remote_directory} to {manifest_uri}")
+            return Literal(
+                scalar=Scalar(blob=Blob(metadata=meta, uri=remote_directory)),
+                metadata={MANIFEST_METADATA_KEY: manifest_uri},
+            )
 
         # If not uploading, then we can only take the original source path as the uri.
         else:
@@ -458,14 +711,20 @@ class FlyteDirToMultipartBlobTransformer(TypeTransformer[FlyteDirectory]):
         local_folder = ctx.file_access.get_random_local_directory()
 
         batch_size = get_batch_size(expected_python_type)
+        manifest_uri = lv.metadata.get(MANIFEST_METADATA_KEY) if lv.metadata else None
 
         def _downloader():
+            # Prefetched data is picked up by get_data, so there's no need to read the manifest in that case.
+            entries = None if ctx.file_access.is_prefetching(uri) else fd._get_manifest()
+            if entries is not None:
+                return _download_from_manifest(ctx, uri, local_folder, entries, batch_size=batch_size)
             return ctx.file_access.get_data(uri, local_folder, is_multipart=True, batch_size=batch_size)
 
         expected_format = self.get_format(expected_python_type)
 
         fd = FlyteDirectory.__class_getitem__(expected_format)(local_folder, _downloader)
         fd._remote_source = uri
+        fd._manifest_uri = manifest_uri
         return fd
 
     def guess_python_type(self, literal_type: LiteralType) -> typing.Type[FlyteDirectory[typing.Any]]:
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import io
 import mimetypes
 import os
 import pathlib
@@ -10,9 +12,25 @@ from dataclasses import dataclass, field
 from dataclasses_json import config
 from marshmallow import fields
 from mashumaro.mixins.json import DataClassJSONMixin
-
+from typing_extensions import get_args
+
+from flytekit.core.compression import (
+    CODEC_EXTENSIONS,
+    COMPRESSION_METADATA_KEY,
+    compress_for_upload,
+    get_codec,
+    get_decompressed,
+    get_literal_codec,
+    wrap_reader,
+)
 from flytekit.core.context_manager import FlyteContext, FlyteContextManager
-from flytekit.core.type_engine import TypeEngine, TypeTransformer, TypeTransformerFailedError, get_underlying_type
+from flytekit.core.type_engine import (
+    TypeEngine,
+    TypeTransformer,
+    TypeTransformerFailedError,
+    get_underlying_type,
+    is_annotated,
+)
 from flytekit.exceptions.user import FlyteAssertion
 from flytekit.loggers import logger
 from flytekit.models.core.types import BlobType
@@ -28,6 +46,102 @@ def noop():
 T = typing.TypeVar("T")
 
 
+class ContentAddressed:
+    """
+    This is used to annotate a FlyteFile output when we want flytekit to store it under a key derived from the
+    digest of its contents, instead of a fresh random path. For example,
+
+    @task
+    def t1() -> Annotated[FlyteFile, ContentAddressed(store="s3://my-bucket/artifacts")]:
+        ...
+        return FlyteFile(...)
+
+    If a file with the same contents (and name) was already uploaded to the store, the upload is skipped. The
+    digest is recorded as the hash of the output literal, so downstream cached tasks consuming the file get cache
+    hits whenever the contents are the same. Files given an explicit ``remote_path`` are uploaded there as usual.
+    """
+
+    def __init__(self, store: typing.Optional[str] = None, algorithm: str = "sha256"):
+        """
+        :param store: Remote prefix to store the files under. If not given, the raw output prefix is used, which
+            only deduplicates uploads within the same execution.
+        :param algorithm: Any hash algorithm supported by hashlib.
+        """
+        if algorithm not in hashlib.algorithms_available:
+            raise ValueError(f"Unsupported hash algorithm {algorithm}")
+        self._store = store
+        self._algorithm = algorithm
+
+    @property
+    def store(self) -> typing.Optional[str]:
+        return self._store
+
+    @property
+    def algorithm(self) -> str:
+        return self._algorithm
+
+
+def get_content_addressed(t: typing.Type) -> typing.Optional[ContentAddressed]:
+    if is_annotated(t):
+        for annotation in get_args(t)[1:]:
+            if isinstance(annotation, ContentAddressed):
+                return annotation
+    return None
+
+
+class StreamingRead:
+    """
+    This is used to annotate a FlyteFile input that should be read as a stream instead of being downloaded. For
+    example,
+
+    @task
+    def t1(f: Annotated[FlyteFile, StreamingRead(cache_type="blockcache", block_size=4 * 2**20)]):
+        with f.open("rb") as fh:
+            fh.seek(-8, 2)
+            footer = fh.read()
+
+    The settings are used by :py:meth:`FlyteFile.open` whenever no cache_type is passed explicitly, so seeks and
+    reads only fetch the blocks they touch. The cache types are the ones supported by fsspec
+    https://filesystem-spec.readthedocs.io/en/latest/api.html#readbuffering, e.g. ``readahead`` for sequential
+    reads and ``blockcache`` for random access.
+    """
+
+    def __init__(
+        self,
+        cache_type: str = "readahead",
+        block_size: typing.Optional[int] = None,
+        cache_options: typing.Optional[typing.Dict[str, typing.Any]] = None,
+    ):
+        """
+        :param cache_type: fsspec read buffering strategy.
+        :param block_size: Size in bytes of every remote read, i.e. the read-ahead size or the cached block size.
+        :param cache_options: Additional options for the fsspec cache, e.g. ``{"maxblocks": 64}`` for blockcache.
+        """
+        self._cache_type = cache_type
+        self._block_size = block_size
+        self._cache_options = cache_options
+
+    @property
+    def cache_type(self) -> str:
+        return self._cache_type
+
+    @property
+    def block_size(self) -> typing.Optional[int]:
+        return self._block_size
+
+    @property
+    def cache_options(self) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        return self._cache_options
+
+
+def get_streaming_read(t: typing.Type) -> typing.Optional[StreamingRead]:
+    if is_annotated(t):
+        for annotation in get_args(t)[1:]:
+            if isinstance(annotation, StreamingRead):
+                return annotation
+    return None
+
+
 @dataclass
 class FlyteFile(os.PathLike, typing.Generic[T], DataClassJSONMixin):
     path: typing.Union[str, os.PathLike] = field(default=None, metadata=config(mm_field=fields.String()))  # type: ignore
@@ -202,6 +316,8 @@ class FlyteFile(os.PathLike, typing.Generic[T], DataClassJSONMixin):
         self._downloaded = False
         self._remote_path = remote_path
         self._remote_source: typing.Optional[str] = None
+        self._streaming_read: typing.Optional[StreamingRead] = None
+        self._compression: typing.Optional[str] = None
 
     def __fspath__(self):
         # This is where a delayed downloading of the file will happen
@@ -240,6 +356,41 @@ class FlyteFile(os.PathLike, typing.Generic[T], DataClassJSONMixin):
     def download(self) -> str:
         return self.__fspath__()
 
+    def _get_final_path(self) -> typing.Union[str, os.PathLike]:
+        if self.remote_source:
+            return self.remote_source
+        elif self.remote_path:
+            return self.remote_path
+        return self.path
+
+    def read_range(self, start: int, end: typing.Optional[int]) -> bytes:
+        """
+        Reads only the bytes in ``[start, end)`` of the file, without downloading the rest of it. Negative offsets
+        count from the end of the file, e.g. ``read_range(-8, None)`` returns the last 8 bytes.
+        """
+        if self._compression:
+            raise ValueError(f"Cannot read a byte range of {self.remote_source}, it is {self._compression} compressed")
+        ctx = FlyteContextManager.current_context()
+        final_path = self._get_final_path()
+        fs = ctx.file_access.get_filesystem_for_path(final_path)
+        return fs.cat_file(final_path, start=start, end=end)
+
+    def download_range(self, start: int, end: typing.Optional[int], local_path: typing.Optional[str] = None) -> str:
+        """
+        Materializes only the bytes in ``[start, end)`` of the file to a local file and returns its path. This
+        doesn't change what the FlyteFile itself points to.
+
+        :param start: Offset of the first byte to download
+        :param end: Offset one past the last byte to download
+        :param local_path: Where to write the bytes to. A random local path is used if not given.
+        """
+        ctx = FlyteContextManager.current_context()
+        local_path = local_path or ctx.file_access.get_random_local_path(str(self._get_final_path()))
+        pathlib.Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(local_path, "wb") as f:
+            f.write(self.read_range(start, end))
+        return local_path
+
     @contextmanager
     def open(
         self,
@@ -279,15 +430,27 @@ class FlyteFile(os.PathLike, typing.Generic[T], DataClassJSONMixin):
             especially useful for large file reads
         :param cache_options: optional Dict[str, Any] Refer to fsspec caching options. This is strongly coupled to the
             cache_protocol
+
+        If the FlyteFile was annotated with :py:class:`StreamingRead` and no cache_type is given, the cache type,
+        block size and cache options of the annotation are used. Files that were uploaded compressed are
+        decompressed transparently when read.
         """
         ctx = FlyteContextManager.current_context()
-        final_path = self.path
-        if self.remote_source:
-            final_path = self.remote_source
-        elif self.remote_path:
-            final_path = self.remote_path
+        final_path = self._get_final_path()
         fs = ctx.file_access.get_filesystem_for_path(final_path)
-        f = fs.open(final_path, mode, cache_type=cache_type, cache_options=cache_options)
+        kwargs: typing.Dict[str, typing.Any] = {}
+        if cache_type is None and self._streaming_read is not None and "r" in mode:
+            cache_type = self._streaming_read.cache_type
+            cache_options = cache_options or self._streaming_read.cache_options
+            if self._streaming_read.block_size is not None:
+                kwargs["block_size"] = self._streaming_read.block_size
+        if self._compression and "r" in mode:
+            raw = fs.open(final_path, "rb", cache_type=cache_type, cache_options=cache_options, **kwargs)
+            f = wrap_reader(raw, self._compression)
+            if "b" not in mode:
+                f = io.TextIOWrapper(f)
+        else:
+            f = fs.open(final_path, mode, cache_type=cache_type, cache_options=cache_options, **kwargs)
         yield f
         f.close()
 
@@ -388,6 +551,9 @@ class FlyteFilePathTransformer(TypeTransformer[FlyteFile]):
         if python_val is None:
             raise TypeTransformerFailedError("None value cannot be converted to a file.")
 
+        content_addressed = get_content_addressed(python_type)
+        codec = get_codec(python_type)
+
         # Correctly handle `Annotated[FlyteFile, ...]` by extracting the origin type
         python_type = get_underlying_type(python_type)
 
@@ -404,7 +570,10 @@ class FlyteFilePathTransformer(TypeTransformer[FlyteFile]):
             # If the object has a remote source, then we just convert it back. This means that if someone is just
             # going back and forth between a FlyteFile Python value and a Blob Flyte IDL value, we don't do anything.
             if python_val._remote_source is not None:
-                return Literal(scalar=Scalar(blob=Blob(metadata=meta, uri=python_val._remote_source)))
+                metadata = {COMPRESSION_METADATA_KEY: python_val._compression} if python_val._compression else None
+                return Literal(
+                    scalar=Scalar(blob=Blob(metadata=meta, uri=python_val._remote_source)), metadata=metadata
+                )
 
             # If the user specified the remote_path to be False, that means no matter what, do not upload. Also if the
             # path given is already a remote path, say https://www.google.com, the concept of uploading to the Flyte
@@ -446,11 +615,25 @@ class FlyteFilePathTransformer(TypeTransformer[FlyteFile]):
 
         # If we're uploading something, that means that the uri should always point to the upload destination.
         if should_upload:
+            metadata = None
+            # Files the user uploads to a location of their choice are left as they are
+            if codec and remote_path is None:
+                source_path = compress_for_upload(ctx, source_path, codec)
+                metadata = {COMPRESSION_METADATA_KEY: codec}
             if remote_path is not None:
                 remote_path = ctx.file_access.put_data(source_path, remote_path, is_multipart=False)
+            elif content_addressed is not None:
+                remote_path, digest = ctx.file_access.put_content_addressed(
+                    source_path, store=content_addressed.store, algorithm=content_addressed.algorithm
+                )
+                return Literal(
+                    scalar=Scalar(blob=Blob(metadata=meta, uri=remote_path)),
+                    hash=f"{content_addressed.algorithm}:{digest}",
+                    metadata=metadata,
+                )
             else:
                 remote_path = ctx.file_access.put_raw_data(source_path)
-            return Literal(scalar=Scalar(blob=Blob(metadata=meta, uri=remote_path)))
+            return Literal(scalar=Scalar(blob=Blob(metadata=meta, uri=remote_path)), metadata=metadata)
         # If not uploading, then we can only take the original source path as the uri.
         else:
             return Literal(scalar=Scalar(blob=Blob(metadata=meta, uri=source_path)))
@@ -476,6 +659,8 @@ class FlyteFilePathTransformer(TypeTransformer[FlyteFile]):
         if expected_python_type is os.PathLike:
             return FlyteFile(uri)
 
+        streaming_read = get_streaming_read(expected_python_type)
+
         # Correctly handle `Annotated[FlyteFile, ...]` by extracting the origin type
         expected_python_type = get_underlying_type(expected_python_type)
 
@@ -483,20 +668,28 @@ class FlyteFilePathTransformer(TypeTransformer[FlyteFile]):
         if not issubclass(expected_python_type, FlyteFile):  # type: ignore
             raise TypeError(f"Neither os.PathLike nor FlyteFile specified {expected_python_type}")
 
+        codec = get_literal_codec(lv)
+
         # This is a local file path, like /usr/local/my_file, don't mess with it. Certainly, downloading it doesn't
-        # make any sense.
-        if not ctx.file_access.is_remote(uri):
-            return expected_python_type(uri)  # type: ignore
+        # make any sense. Unless it was compressed, in which case it's decompressed like a remote file.
+        if not ctx.file_access.is_remote(uri) and not codec:
+            local_ff = expected_python_type(uri)  # type: ignore
+            local_ff._streaming_read = streaming_read
+            return local_ff
 
         # For the remote case, return an FlyteFile object that can download
         local_path = ctx.file_access.get_random_local_path(uri)
+        if codec and local_path.endswith(CODEC_EXTENSIONS[codec]):
+            local_path = local_path[: -len(CODEC_EXTENSIONS[codec])]
 
         def _downloader():
-            return ctx.file_access.get_data(uri, local_path, is_multipart=False)
+            return get_decompressed(ctx, uri, local_path, codec)
 
         expected_format = FlyteFilePathTransformer.get_format(expected_python_type)
         ff = FlyteFile.__class_getitem__(expected_format)(local_path, _downloader)
         ff._remote_source = uri
+        ff._streaming_read = streaming_read
+        ff._compression = codec
 
         return ff
 
@@ -7,5 +7,6 @@ from .types import (
     SchemaHandler,
     SchemaOpenMode,
     SchemaReader,
+    SchemaWriteOptions,
     SchemaWriter,
 )
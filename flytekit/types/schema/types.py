@@ -4,6 +4,7 @@ import datetime as _datetime
 import os
 import typing
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -13,6 +14,7 @@ import numpy as _np
 from dataclasses_json import config
 from marshmallow import fields
 from mashumaro.mixins.json import DataClassJSONMixin
+from typing_extensions import Annotated, get_args, get_origin
 
 from flytekit.core.context_manager import FlyteContext, FlyteContextManager
 from flytekit.core.type_engine import TypeEngine, TypeTransformer, TypeTransformerFailedError
@@ -41,6 +43,48 @@ class SchemaOpenMode(Enum):
     WRITE = "w"
 
 
+class SchemaWriteOptions(object):
+    """
+    This is used to annotate a FlyteSchema output to control how dataframes returned for it are written, e.g.
+
+    @task
+    def t1() -> Annotated[FlyteSchema[kwtypes(a=int)], SchemaWriteOptions(rows_per_chunk=1_000_000)]:
+        ...
+
+    A dataframe is split into files of ``rows_per_chunk`` rows, which are written concurrently and can then be read
+    back concurrently. ``row_group_size`` and ``use_dictionary`` are passed on to the parquet writer, see
+    :py:func:`pyarrow.parquet.write_table`. Splitting into chunks is supported by the pandas schema writer.
+    """
+
+    def __init__(
+        self,
+        rows_per_chunk: typing.Optional[int] = None,
+        row_group_size: typing.Optional[int] = None,
+        use_dictionary: typing.Optional[typing.Union[bool, typing.List[str]]] = None,
+    ):
+        if rows_per_chunk is not None and rows_per_chunk <= 0:
+            raise ValueError(f"rows_per_chunk should be positive, received {rows_per_chunk}")
+        self._rows_per_chunk = rows_per_chunk
+        self._row_group_size = row_group_size
+        self._use_dictionary = use_dictionary
+
+    def writer_kwargs(self) -> typing.Dict[str, typing.Any]:
+        kwargs = {
+            "rows_per_chunk": self._rows_per_chunk,
+            "row_group_size": self._row_group_size,
+            "use_dictionary": self._use_dictionary,
+        }
+        return {k: v for k, v in kwargs.items() if v is not None}
+
+
+def get_schema_write_options(t: typing.Any) -> typing.Optional[SchemaWriteOptions]:
+    if get_origin(t) is Annotated:
+        for annotation in get_args(t)[1:]:
+            if isinstance(annotation, SchemaWriteOptions):
+                return annotation
+    return None
+
+
 def generate_ordered_files(directory: os.PathLike, n: int) -> typing.Generator[str, None, None]:
     for i in range(n):
         yield os.path.join(directory, f"{i:05}")
@@ -107,16 +151,7 @@ class LocalIOSchemaReader(SchemaReader[T]):
     def _read(self, *path: os.PathLike, **kwargs) -> T:
         pass
 
-    def iter(self, **kwargs) -> typing.Generator[T, None, None]:
-        with os.scandir(self._from_path) as it:  # type: ignore
-            for entry in it:
-                if (
-                    not typing.cast(os.DirEntry, entry).name.startswith(".")
-                    and typing.cast(os.DirEntry, entry).is_file()
-                ):
-                    yield self._read(Path(typing.cast(os.DirEntry, entry).path), **kwargs)
-
-    def all(self, **kwargs) -> T:
+    def _files(self) -> typing.List[os.PathLike]:
         files: typing.List[os.PathLike] = []
         with os.scandir(self._from_path) as it:  # type: ignore
             for entry in it:
@@ -125,8 +160,15 @@ class LocalIOSchemaReader(SchemaReader[T]):
                     and typing.cast(os.DirEntry, entry).is_file()
                 ):
                     files.append(Path(typing.cast(os.DirEntry, entry).path))
+        # scandir order is arbitrary, the chunks are numbered in the order they were written
+        return sorted(files)
+
+    def iter(self, **kwargs) -> typing.Generator[T, None, None]:
+        for f in self._files():
+            yield self._read(f, **kwargs)
 
-        return self._read(*files, **kwargs)
+    def all(self, **kwargs) -> T:
+        return self._read(*self._files(), **kwargs)
 
 
 class LocalIOSchemaWriter(SchemaWriter[T]):
@@ -138,8 +180,15 @@ class LocalIOSchemaWriter(SchemaWriter[T]):
         pass
 
     def write(self, *dfs, **kwargs):
-        for df in dfs:
-            self._write(df, next(self._file_name_gen), **kwargs)
+        # Names are assigned up front, so that the chunks keep their order when they are written concurrently
+        paths = [next(self._file_name_gen) for _ in dfs]
+        if len(dfs) <= 1:
+            for df, path in zip(dfs, paths):
+                self._write(df, path, **kwargs)
+            return
+        with ThreadPoolExecutor() as executor:
+            for f in [executor.submit(self._write, df, path, **kwargs) for df, path in zip(dfs, paths)]:
+                f.result()
 
 
 @dataclass
@@ -355,6 +404,8 @@ class FlyteSchemaTransformer(TypeTransformer[FlyteSchema]):
         return SchemaType(columns=converted_cols)
 
     def assert_type(self, t: Type[FlyteSchema], v: typing.Any):
+        if get_origin(t) is Annotated:
+            t = get_args(t)[0]
         if issubclass(t, FlyteSchema) or isinstance(v, FlyteSchema):
             return
         try:
@@ -368,6 +419,9 @@ class FlyteSchemaTransformer(TypeTransformer[FlyteSchema]):
     def to_literal(
         self, ctx: FlyteContext, python_val: FlyteSchema, python_type: Type[FlyteSchema], expected: LiteralType
     ) -> Literal:
+        options = get_schema_write_options(python_type)
+        if get_origin(python_type) is Annotated:
+            python_type = get_args(python_type)[0]
         if isinstance(python_val, FlyteSchema):
             remote_path = python_val.remote_path
             if remote_path is None or remote_path == "":
@@ -395,7 +449,7 @@ class FlyteSchemaTransformer(TypeTransformer[FlyteSchema]):
                 f"DataFrames of type {type(python_val)} are not supported currently"
             ) from e
         writer = schema.open(type(python_val))
-        writer.write(python_val)
+        writer.write(python_val, **(options.writer_kwargs() if options else {}))
         if not h.handles_remote_io:
             schema.remote_path = ctx.file_access.put_data(schema.local_path, schema.remote_path, is_multipart=True)
         return Literal(scalar=Scalar(schema=Schema(schema.remote_path, self._get_schema_type(python_type))))
@@ -1,5 +1,6 @@
 import os
 import typing
+from concurrent.futures import ThreadPoolExecutor
 from typing import Type
 
 import pandas
@@ -20,7 +21,12 @@ class ParquetIO(object):
     def read(
         self, *files: os.PathLike, columns: typing.Optional[typing.List[str]] = None, **kwargs
     ) -> pandas.DataFrame:
-        frames = [self._read(chunk=f, columns=columns, **kwargs) for f in files if os.path.getsize(f) > 0]
+        files = [f for f in files if os.path.getsize(f) > 0]
+        if len(files) > 1:
+            with ThreadPoolExecutor() as executor:
+                frames = list(executor.map(lambda f: self._read(chunk=f, columns=columns, **kwargs), files))
+        else:
+            frames = [self._read(chunk=f, columns=columns, **kwargs) for f in files]
         if len(frames) == 1:
             return frames[0]
         elif len(frames) > 1:
@@ -71,6 +77,17 @@ class PandasSchemaWriter(LocalIOSchemaWriter[pandas.DataFrame]):
         super().__init__(local_dir, cols, fmt)
         self._parquet_engine = ParquetIO()
 
+    def write(self, *dfs, rows_per_chunk: typing.Optional[int] = None, **kwargs):
+        """
+        Writes each dataframe as a chunk, or as several chunks of ``rows_per_chunk`` rows if given. Multiple chunks
+        are written concurrently.
+        """
+        if rows_per_chunk:
+            dfs = tuple(
+                df.iloc[i : i + rows_per_chunk] for df in dfs for i in range(0, max(len(df), 1), rows_per_chunk)
+            )
+        super().write(*dfs, **kwargs)
+
     def _write(self, df: T, path: os.PathLike, **kwargs):
         return self._parquet_engine.write(df, to_file=path, **kwargs)
 
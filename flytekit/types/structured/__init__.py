@@ -8,6 +8,10 @@ Flytekit StructuredDataset
    :toctree: generated/
 
    StructuredDataset
+   ParquetPartitioning
+   RowFilter
+   CollectStats
+   StructuredDatasetStats
    StructuredDatasetEncoder
    StructuredDatasetDecoder
 """
@@ -17,9 +21,14 @@ from flytekit.deck.renderer import ArrowRenderer, TopFrameRenderer
 from flytekit.loggers import logger
 
 from .structured_dataset import (
+    CollectStats,
+    ColumnStats,
+    ParquetPartitioning,
+    RowFilter,
     StructuredDataset,
     StructuredDatasetDecoder,
     StructuredDatasetEncoder,
+    StructuredDatasetStats,
     StructuredDatasetTransformerEngine,
 )
 
@@ -34,20 +43,33 @@ def register_csv_handlers():
 def register_pandas_handlers():
     import pandas as pd
 
+    from .arrow_ipc import ArrowIPCToPandasDecodingHandler, PandasToArrowIPCEncodingHandler
     from .basic_dfs import PandasToParquetEncodingHandler, ParquetToPandasDecodingHandler
 
     StructuredDatasetTransformerEngine.register(PandasToParquetEncodingHandler(), default_format_for_type=True)
     StructuredDatasetTransformerEngine.register(ParquetToPandasDecodingHandler(), default_format_for_type=True)
+    StructuredDatasetTransformerEngine.register(PandasToArrowIPCEncodingHandler())
+    StructuredDatasetTransformerEngine.register(ArrowIPCToPandasDecodingHandler())
     StructuredDatasetTransformerEngine.register_renderer(pd.DataFrame, TopFrameRenderer())
 
 
 def register_arrow_handlers():
     import pyarrow as pa
 
-    from .basic_dfs import ArrowToParquetEncodingHandler, ParquetToArrowDecodingHandler
+    from .arrow_ipc import ArrowIPCToArrowDecodingHandler, ArrowToArrowIPCEncodingHandler
+    from .basic_dfs import (
+        ArrowToParquetEncodingHandler,
+        GeneratorToParquetEncodingHandler,
+        ParquetToArrowDatasetDecodingHandler,
+        ParquetToArrowDecodingHandler,
+    )
 
     StructuredDatasetTransformerEngine.register(ArrowToParquetEncodingHandler(), default_format_for_type=True)
     StructuredDatasetTransformerEngine.register(ParquetToArrowDecodingHandler(), default_format_for_type=True)
+    StructuredDatasetTransformerEngine.register(GeneratorToParquetEncodingHandler(), default_format_for_type=True)
+    StructuredDatasetTransformerEngine.register(ParquetToArrowDatasetDecodingHandler(), default_format_for_type=True)
+    StructuredDatasetTransformerEngine.register(ArrowToArrowIPCEncodingHandler())
+    StructuredDatasetTransformerEngine.register(ArrowIPCToArrowDecodingHandler())
     StructuredDatasetTransformerEngine.register_renderer(pa.Table, ArrowRenderer())
 
 
@@ -0,0 +1,227 @@
+"""
+Handlers for the Arrow IPC file format (Feather V2). Unlike parquet, it is the in-memory Arrow layout written to disk,
+so encoding and decoding is little more than a copy and local files are memory-mapped instead of read.
+
+On top of that, datasets written during a local execution are handed off in memory: the Arrow table written by an
+encoder is kept in this process until the local execution ends, and decoders of any dataframe library that can be
+built from an Arrow table use it instead of reading the file back.
+"""
+import collections
+import os
+import threading
+import typing
+from pathlib import Path
+
+from fsspec.core import strip_protocol
+
+from flytekit import FlyteContext, lazy_module
+from flytekit.models import literals
+from flytekit.models.literals import StructuredDatasetMetadata
+from flytekit.models.types import StructuredDatasetType
+from flytekit.types.structured.structured_dataset import (
+    ARROW_IPC,
+    ColumnStats,
+    RowFilter,
+    StructuredDataset,
+    StructuredDatasetDecoder,
+    StructuredDatasetEncoder,
+    StructuredDatasetStats,
+)
+
+if typing.TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+else:
+    pd = lazy_module("pandas")
+    pa = lazy_module("pyarrow")
+
+# Upper bound of the total size of the tables kept for in-process handoff, the least recently written are dropped first
+HANDOFF_MAX_BYTES = 256 * 1024**2
+
+_handoff_lock = threading.Lock()
+_handoff_tables: typing.Dict[str, "pa.Table"] = collections.OrderedDict()
+
+
+def _handoff_put(uri: str, table: "pa.Table"):
+    with _handoff_lock:
+        _handoff_tables.pop(uri, None)
+        if table.nbytes > HANDOFF_MAX_BYTES:
+            return
+        _handoff_tables[uri] = table
+        total = sum(t.nbytes for t in _handoff_tables.values())
+        while total > HANDOFF_MAX_BYTES:
+            _, evicted = _handoff_tables.popitem(last=False)  # type: ignore
+            total -= evicted.nbytes
+
+
+def _handoff_get(uri: str) -> typing.Optional["pa.Table"]:
+    with _handoff_lock:
+        return _handoff_tables.get(uri)
+
+
+def clear_handoff():
+    """
+    Drops all the tables kept for in-process handoff. This is done when a local execution ends.
+    """
+    with _handoff_lock:
+        _handoff_tables.clear()
+
+
+def write_arrow_ipc(ctx: FlyteContext, table: "pa.Table", uri: typing.Optional[str]) -> str:
+    """
+    Writes the table as an Arrow IPC file under ``uri``, or under a new random path if not given, and returns the uri.
+    During local executions the table is also kept in memory for consumers in this process.
+    """
+    from pyarrow import ipc
+
+    uri = uri or ctx.file_access.join(ctx.file_access.raw_output_prefix, ctx.file_access.get_random_string())
+    if not ctx.file_access.is_remote(uri):
+        Path(uri).mkdir(parents=True, exist_ok=True)
+    path = os.path.join(uri, f"{0:05}")
+    fs = ctx.file_access.get_filesystem_for_path(path)
+    with fs.open(path, "wb") as f:
+        with ipc.new_file(f, table.schema) as writer:
+            writer.write_table(table)
+    if ctx.execution_state and ctx.execution_state.is_local_execution():
+        _handoff_put(uri, table)
+    return uri
+
+
+def read_arrow_ipc(
+    ctx: FlyteContext,
+    uri: str,
+    current_task_metadata: StructuredDatasetMetadata,
+    filters: typing.Optional[RowFilter] = None,
+) -> "pa.Table":
+    """
+    Reads the Arrow IPC file under ``uri``, from memory if it was written in this process, else memory-mapping it
+    if it is local, and applies the column subset of the task and the filters.
+    """
+    from pyarrow import ipc
+
+    table = _handoff_get(uri)
+    if table is None:
+        path = os.path.join(uri, f"{0:05}")
+        if not ctx.file_access.is_remote(path):
+            table = ipc.open_file(pa.memory_map(strip_protocol(path))).read_all()
+        else:
+            fs = ctx.file_access.get_filesystem_for_path(path)
+            with fs.open(path, "rb") as f:
+                table = ipc.open_file(f).read_all()
+    if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
+        table = table.select([c.name for c in current_task_metadata.structured_dataset_type.columns])
+    if filters is not None:
+        table = table.filter(filters.to_expression())
+    return table
+
+
+def iter_arrow_table(table: "pa.Table", batch_size: typing.Optional[int]) -> typing.Generator["pa.Table", None, None]:
+    """
+    Yields zero-copy slices of the table, one per record batch or of ``batch_size`` rows.
+    """
+    if batch_size is None:
+        for batch in table.to_batches():
+            yield pa.Table.from_batches([batch])
+        return
+    for offset in range(0, table.num_rows, batch_size):
+        yield table.slice(offset, batch_size)
+
+
+def arrow_table_stats(table: "pa.Table") -> StructuredDatasetStats:
+    """
+    Returns the row count, size and null counts of the table, which Arrow keeps track of so that no data needs to be
+    scanned. Min/max values would need a scan and are not gathered.
+    """
+    columns = {
+        name: ColumnStats(null_count=column.null_count) for name, column in zip(table.column_names, table.columns)
+    }
+    return StructuredDatasetStats(num_rows=table.num_rows, num_bytes=table.nbytes, columns=columns)
+
+
+class ArrowToArrowIPCEncodingHandler(StructuredDatasetEncoder):
+    def __init__(self):
+        super().__init__(pa.Table, None, ARROW_IPC)
+
+    def encode(
+        self,
+        ctx: FlyteContext,
+        structured_dataset: StructuredDataset,
+        structured_dataset_type: StructuredDatasetType,
+    ) -> literals.StructuredDataset:
+        uri = write_arrow_ipc(ctx, structured_dataset.dataframe, structured_dataset.uri)
+        if structured_dataset._collect_stats:
+            structured_dataset._stats = arrow_table_stats(structured_dataset.dataframe)
+        structured_dataset_type.format = ARROW_IPC
+        return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
+
+
+class ArrowIPCToArrowDecodingHandler(StructuredDatasetDecoder):
+    supports_filters = True
+
+    def __init__(self):
+        super().__init__(pa.Table, None, ARROW_IPC)
+
+    def decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+        filters: typing.Optional[RowFilter] = None,
+    ) -> "pa.Table":
+        return read_arrow_ipc(ctx, flyte_value.uri, current_task_metadata, filters)
+
+    def iter_decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+        batch_size: typing.Optional[int] = None,
+        filters: typing.Optional[RowFilter] = None,
+    ) -> typing.Generator["pa.Table", None, None]:
+        yield from iter_arrow_table(read_arrow_ipc(ctx, flyte_value.uri, current_task_metadata, filters), batch_size)
+
+
+class PandasToArrowIPCEncodingHandler(StructuredDatasetEncoder):
+    def __init__(self):
+        super().__init__(pd.DataFrame, None, ARROW_IPC)
+
+    def encode(
+        self,
+        ctx: FlyteContext,
+        structured_dataset: StructuredDataset,
+        structured_dataset_type: StructuredDatasetType,
+    ) -> literals.StructuredDataset:
+        table = pa.Table.from_pandas(structured_dataset.dataframe)
+        uri = write_arrow_ipc(ctx, table, structured_dataset.uri)
+        if structured_dataset._collect_stats:
+            structured_dataset._stats = arrow_table_stats(table)
+        structured_dataset_type.format = ARROW_IPC
+        return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
+
+
+class ArrowIPCToPandasDecodingHandler(StructuredDatasetDecoder):
+    supports_filters = True
+
+    def __init__(self):
+        super().__init__(pd.DataFrame, None, ARROW_IPC)
+
+    def decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+        filters: typing.Optional[RowFilter] = None,
+    ) -> "pd.DataFrame":
+        return read_arrow_ipc(ctx, flyte_value.uri, current_task_metadata, filters).to_pandas()
+
+    def iter_decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+        batch_size: typing.Optional[int] = None,
+        filters: typing.Optional[RowFilter] = None,
+    ) -> typing.Generator["pd.DataFrame", None, None]:
+        table = read_arrow_ipc(ctx, flyte_value.uri, current_task_metadata, filters)
+        for chunk in iter_arrow_table(table, batch_size):
+            yield chunk.to_pandas()
@@ -1,10 +1,13 @@
 import os
+import threading
+import types
 import typing
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TypeVar
 
 from botocore.exceptions import NoCredentialsError
-from fsspec.core import split_protocol, strip_protocol
+from fsspec.core import strip_protocol
 from fsspec.utils import get_protocol
 
 from flytekit import FlyteContext, lazy_module, logger
@@ -16,14 +19,19 @@ from flytekit.models.types import StructuredDatasetType
 from flytekit.types.structured.structured_dataset import (
     CSV,
     PARQUET,
+    ColumnStats,
+    ParquetPartitioning,
+    RowFilter,
     StructuredDataset,
     StructuredDatasetDecoder,
     StructuredDatasetEncoder,
+    StructuredDatasetStats,
 )
 
 if typing.TYPE_CHECKING:
     import pandas as pd
     import pyarrow as pa
+    import pyarrow.dataset
 else:
     pd = lazy_module("pandas")
     pa = lazy_module("pyarrow")
@@ -43,6 +51,259 @@ def get_pandas_storage_options(
     return None
 
 
+def write_partitioned_parquet(
+    ctx: FlyteContext, table: "pa.Table", uri: str, partitioning: ParquetPartitioning, **write_options
+):
+    """
+    Writes an arrow table to multiple parquet files under ``uri`` in parallel, split as described by
+    ``partitioning``. Without partition columns the files are consecutive slices of the table named ``00000``,
+    ``00001``, ..., so reading the directory back preserves the row order.
+
+    :param write_options: Passed to the parquet writer of each file, e.g. ``coerce_timestamps``.
+    """
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    filesystem = ctx.file_access.get_filesystem_for_path(uri)
+    rows_per_file = partitioning.rows_per_file(table.num_rows, table.nbytes)
+
+    if partitioning.partition_cols:
+        kwargs = {}
+        if rows_per_file is not None:
+            kwargs["max_rows_per_file"] = rows_per_file
+            kwargs["max_rows_per_group"] = min(rows_per_file, 1024 * 1024)
+        file_format = ds.ParquetFileFormat()
+        ds.write_dataset(
+            table,
+            strip_protocol(uri),
+            format=file_format,
+            file_options=file_format.make_write_options(**write_options),
+            partitioning=partitioning.partition_cols,
+            partitioning_flavor="hive",
+            basename_template="part-{i}.parquet",
+            filesystem=filesystem,
+            existing_data_behavior="overwrite_or_ignore",
+            use_threads=True,
+            **kwargs,
+        )
+        return
+
+    rows_per_file = rows_per_file or max(table.num_rows, 1)
+
+    def _write_slice(i: int):
+        path = os.path.join(uri, f"{i:05}")
+        pq.write_table(
+            table.slice(i * rows_per_file, rows_per_file), strip_protocol(path), filesystem=filesystem, **write_options
+        )
+
+    num_files = max(1, -(-table.num_rows // rows_per_file))
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(_write_slice, range(num_files)))
+
+
+def _with_index_columns(
+    schema: "pa.Schema", columns: typing.Optional[typing.List[str]]
+) -> typing.Optional[typing.List[str]]:
+    """
+    Adds the columns a pandas index was stored in to ``columns``, so that to_pandas() restores the index of a column
+    subset like pd.read_parquet does.
+    """
+    if columns is None or not schema.pandas_metadata:
+        return columns
+    index_columns = schema.pandas_metadata.get("index_columns", [])
+    # A RangeIndex is only described in the metadata and has no column
+    return columns + [c for c in index_columns if isinstance(c, str) and c not in columns]
+
+
+def iter_parquet_tables(
+    ctx: FlyteContext,
+    uri: str,
+    columns: typing.Optional[typing.List[str]],
+    batch_size: typing.Optional[int],
+    filters: typing.Optional[RowFilter] = None,
+    use_pandas_metadata: bool = False,
+) -> typing.Generator["pa.Table", None, None]:
+    """
+    Yields the parquet file or directory at ``uri`` in chunks, so that only one chunk at a time is held in memory.
+    Without a batch size every chunk is a row group, otherwise all chunks but the last have ``batch_size`` rows.
+    Files and row groups that cannot match ``filters`` according to their partition values or column statistics
+    are skipped without being read. With ``use_pandas_metadata`` the columns of a stored pandas index are read too.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(
+        strip_protocol(uri),
+        format="parquet",
+        filesystem=ctx.file_access.get_filesystem_for_path(uri),
+        partitioning="hive",
+    )
+    if use_pandas_metadata:
+        columns = _with_index_columns(dataset.schema, columns)
+    expression = filters.to_expression() if filters is not None else None
+    if batch_size is None:
+        for fragment in dataset.get_fragments(filter=expression):
+            for row_group in fragment.split_by_row_group(filter=expression, schema=dataset.schema):
+                table = row_group.to_table(schema=dataset.schema, columns=columns, filter=expression)
+                if table.num_rows:
+                    yield table
+        return
+
+    # Arrow doesn't combine batches across row groups, so regroup them to get evenly sized chunks
+    pending: typing.List["pa.RecordBatch"] = []
+    pending_rows = 0
+    for batch in dataset.to_batches(columns=columns, filter=expression, batch_size=batch_size):
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        while pending_rows >= batch_size:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, batch_size)
+            rest = table.slice(batch_size)
+            pending, pending_rows = rest.to_batches(), rest.num_rows
+    if pending_rows:
+        yield pa.Table.from_batches(pending)
+
+
+def open_parquet_dataset(
+    ctx: FlyteContext,
+    uri: str,
+    columns: typing.Optional[typing.List[str]] = None,
+    filters: typing.Optional[RowFilter] = None,
+    anonymous: bool = False,
+) -> "pyarrow.dataset.Dataset":
+    """
+    Returns the parquet file or directory at ``uri`` as an Arrow dataset, which only lists the files. Nothing is read
+    until it is scanned, and scans only read the selected ``columns`` and the files and row groups that can match
+    ``filters``. Lazy dataframe libraries, e.g. polars and DuckDB, can scan it with their own pushdowns on top.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(
+        strip_protocol(uri),
+        format="parquet",
+        filesystem=ctx.file_access.get_filesystem_for_path(uri, anonymous=anonymous),
+        partitioning="hive",
+    )
+    if columns:
+        dataset = dataset.replace_schema(pa.schema([dataset.schema.field(c) for c in columns]))
+    if filters is not None:
+        dataset = dataset.filter(filters.to_expression())
+    return dataset
+
+
+# Upper bound of the total size of the parquet files read concurrently by read_parquet_table
+PARALLEL_READ_MAX_BYTES = 1024**3
+
+
+def read_parquet_table(
+    ctx: FlyteContext,
+    uri: str,
+    columns: typing.Optional[typing.List[str]] = None,
+    filters: typing.Optional[RowFilter] = None,
+    anonymous: bool = False,
+    max_bytes_in_flight: int = PARALLEL_READ_MAX_BYTES,
+    use_pandas_metadata: bool = False,
+) -> "pa.Table":
+    """
+    Reads the parquet file or directory at ``uri`` into a single table. The files of a directory, e.g. the part files
+    of a Spark output, are read concurrently by up to ``max_concurrency`` threads of the data config, as long as the
+    files being read add up to at most ``max_bytes_in_flight`` bytes. A larger file is read on its own. The tables are
+    concatenated in the order of the files. With ``use_pandas_metadata`` the columns of a stored pandas index are read
+    too.
+    """
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    fs = ctx.file_access.get_filesystem_for_path(uri, anonymous=anonymous)
+    path = strip_protocol(uri)
+    expression = filters.to_expression() if filters is not None else None
+    if not fs.isdir(path):
+        return pq.read_table(
+            path, filesystem=fs, columns=columns, filters=expression, use_pandas_metadata=use_pandas_metadata
+        )
+
+    dataset = ds.dataset(path, format="parquet", filesystem=fs, partitioning="hive")
+    if use_pandas_metadata:
+        columns = _with_index_columns(dataset.schema, columns)
+    fragments = list(dataset.get_fragments(filter=expression))
+    if len(fragments) <= 1:
+        return dataset.to_table(columns=columns, filter=expression)
+
+    sizes = {info["name"]: info["size"] for info in fs.find(path, detail=True).values()}
+    budget = threading.Condition()
+    in_flight = 0
+
+    def read(fragment) -> "pa.Table":
+        nonlocal in_flight
+        size = sizes.get(fragment.path, 0)
+        with budget:
+            budget.wait_for(lambda: in_flight == 0 or in_flight + size <= max_bytes_in_flight)
+            in_flight += size
+        try:
+            return fragment.to_table(schema=dataset.schema, columns=columns, filter=expression)
+        finally:
+            with budget:
+                in_flight -= size
+                budget.notify_all()
+
+    with ThreadPoolExecutor(max_workers=ctx.file_access.data_config.max_concurrency) as executor:
+        return pa.concat_tables(executor.map(read, fragments))
+
+
+def parquet_stats(ctx: FlyteContext, uri: str) -> StructuredDatasetStats:
+    """
+    Gathers the statistics of the parquet file or directory at ``uri`` from the footers of its files, which are read
+    in parallel, so none of the data is read. The min/max of a column are left unset if a row group lacks them.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(
+        strip_protocol(uri),
+        format="parquet",
+        filesystem=ctx.file_access.get_filesystem_for_path(uri),
+        partitioning="hive",
+    )
+    fragments = list(dataset.get_fragments())
+    with ThreadPoolExecutor() as executor:
+        footers = list(executor.map(lambda fragment: fragment.metadata, fragments))
+
+    num_rows = 0
+    num_bytes = 0
+    columns: typing.Dict[str, ColumnStats] = {}
+    without_min_max = set()
+    for footer in footers:
+        for i in range(footer.num_row_groups):
+            row_group = footer.row_group(i)
+            num_rows += row_group.num_rows
+            num_bytes += row_group.total_byte_size
+            for j in range(row_group.num_columns):
+                chunk = row_group.column(j)
+                name = chunk.path_in_schema
+                column = columns.setdefault(name, ColumnStats(null_count=0))
+                chunk_stats = chunk.statistics
+                if chunk_stats is None or not chunk_stats.has_null_count:
+                    column.null_count = None
+                elif column.null_count is not None:
+                    column.null_count += chunk_stats.null_count
+                if chunk_stats is not None and chunk_stats.has_min_max:
+                    column.min = chunk_stats.min if column.min is None else min(column.min, chunk_stats.min)
+                    column.max = chunk_stats.max if column.max is None else max(column.max, chunk_stats.max)
+                elif chunk_stats is None or chunk_stats.null_count != row_group.num_rows:
+                    without_min_max.add(name)
+
+    for name, column in columns.items():
+        if name in without_min_max:
+            column.min = column.max = None
+        else:
+            column.min, column.max = _json_value(column.min), _json_value(column.max)
+    return StructuredDatasetStats(num_rows=num_rows, num_bytes=num_bytes, num_files=len(fragments), columns=columns)
+
+
+def _json_value(v: typing.Any) -> typing.Any:
+    if v is None or isinstance(v, (bool, int, float, str)):
+        return v
+    return str(v)
+
+
 class PandasToCSVEncodingHandler(StructuredDatasetEncoder):
     def __init__(self):
         super().__init__(pd.DataFrame, None, CSV)
@@ -58,11 +319,8 @@ class PandasToCSVEncodingHandler(StructuredDatasetEncoder):
             Path(uri).mkdir(parents=True, exist_ok=True)
         path = os.path.join(uri, ".csv")
         df = typing.cast(pd.DataFrame, structured_dataset.dataframe)
-        df.to_csv(
-            path,
-            index=False,
-            storage_options=get_pandas_storage_options(uri=path, data_config=ctx.file_access.data_config),
-        )
+        with ctx.file_access.open(path, "wb") as f:
+            df.to_csv(f, index=False)
         structured_dataset_type.format = CSV
         return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
 
@@ -79,16 +337,21 @@ class CSVToPandasDecodingHandler(StructuredDatasetDecoder):
     ) -> "pd.DataFrame":
         uri = flyte_value.uri
         columns = None
-        kwargs = get_pandas_storage_options(uri=uri, data_config=ctx.file_access.data_config)
         path = os.path.join(uri, ".csv")
         if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
             columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
         try:
-            return pd.read_csv(path, usecols=columns, storage_options=kwargs)
+            return _read_csv(ctx, path, columns)
         except NoCredentialsError:
             logger.debug("S3 source detected, attempting anonymous S3 access")
-            kwargs = get_pandas_storage_options(uri=uri, data_config=ctx.file_access.data_config, anonymous=True)
-            return pd.read_csv(path, usecols=columns, storage_options=kwargs)
+            return _read_csv(ctx, path, columns, anonymous=True)
+
+
+def _read_csv(
+    ctx: FlyteContext, path: str, columns: typing.Optional[typing.List[str]], anonymous: bool = False
+) -> "pd.DataFrame":
+    with ctx.file_access.open(path, "rb", anonymous=anonymous) as f:
+        return pd.read_csv(f, usecols=columns)
 
 
 class PandasToParquetEncodingHandler(StructuredDatasetEncoder):
@@ -106,19 +369,33 @@ class PandasToParquetEncodingHandler(StructuredDatasetEncoder):
         )
         if not ctx.file_access.is_remote(uri):
             Path(uri).mkdir(parents=True, exist_ok=True)
-        path = os.path.join(uri, f"{0:05}")
         df = typing.cast(pd.DataFrame, structured_dataset.dataframe)
-        df.to_parquet(
-            path,
-            coerce_timestamps="us",
-            allow_truncated_timestamps=False,
-            storage_options=get_pandas_storage_options(uri=path, data_config=ctx.file_access.data_config),
-        )
+        if structured_dataset.partitioning is not None:
+            write_partitioned_parquet(
+                ctx,
+                pa.Table.from_pandas(df),
+                uri,
+                structured_dataset.partitioning,
+                coerce_timestamps="us",
+                allow_truncated_timestamps=False,
+            )
+            structured_dataset_type.format = PARQUET
+            return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
+        path = os.path.join(uri, f"{0:05}")
+        with ctx.file_access.open(path, "wb") as f:
+            df.to_parquet(f, coerce_timestamps="us", allow_truncated_timestamps=False)
         structured_dataset_type.format = PARQUET
         return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
 
+    def collect_stats(
+        self, ctx: FlyteContext, flyte_value: literals.StructuredDataset
+    ) -> typing.Optional[StructuredDatasetStats]:
+        return parquet_stats(ctx, flyte_value.uri)
+
 
 class ParquetToPandasDecodingHandler(StructuredDatasetDecoder):
+    supports_filters = True
+
     def __init__(self):
         super().__init__(pd.DataFrame, None, PARQUET)
 
@@ -127,18 +404,31 @@ class ParquetToPandasDecodingHandler(StructuredDatasetDecoder):
         ctx: FlyteContext,
         flyte_value: literals.StructuredDataset,
         current_task_metadata: StructuredDatasetMetadata,
+        filters: typing.Optional[RowFilter] = None,
     ) -> "pd.DataFrame":
         uri = flyte_value.uri
         columns = None
-        kwargs = get_pandas_storage_options(uri=uri, data_config=ctx.file_access.data_config)
         if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
             columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
         try:
-            return pd.read_parquet(uri, columns=columns, storage_options=kwargs)
+            return read_parquet_table(ctx, uri, columns, filters, use_pandas_metadata=True).to_pandas()
         except NoCredentialsError:
             logger.debug("S3 source detected, attempting anonymous S3 access")
-            kwargs = get_pandas_storage_options(uri=uri, data_config=ctx.file_access.data_config, anonymous=True)
-            return pd.read_parquet(uri, columns=columns, storage_options=kwargs)
+            return read_parquet_table(ctx, uri, columns, filters, anonymous=True, use_pandas_metadata=True).to_pandas()
+
+    def iter_decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+        batch_size: typing.Optional[int] = None,
+        filters: typing.Optional[RowFilter] = None,
+    ) -> typing.Generator["pd.DataFrame", None, None]:
+        columns = None
+        if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
+            columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
+        for table in iter_parquet_tables(ctx, flyte_value.uri, columns, batch_size, filters, use_pandas_metadata=True):
+            yield table.to_pandas()
 
 
 class ArrowToParquetEncodingHandler(StructuredDatasetEncoder):
@@ -158,13 +448,23 @@ class ArrowToParquetEncodingHandler(StructuredDatasetEncoder):
         )
         if not ctx.file_access.is_remote(uri):
             Path(uri).mkdir(parents=True, exist_ok=True)
+        if structured_dataset.partitioning is not None:
+            write_partitioned_parquet(ctx, structured_dataset.dataframe, uri, structured_dataset.partitioning)
+            return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
         path = os.path.join(uri, f"{0:05}")
         filesystem = ctx.file_access.get_filesystem_for_path(path)
         pq.write_table(structured_dataset.dataframe, strip_protocol(path), filesystem=filesystem)
         return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
 
+    def collect_stats(
+        self, ctx: FlyteContext, flyte_value: literals.StructuredDataset
+    ) -> typing.Optional[StructuredDatasetStats]:
+        return parquet_stats(ctx, flyte_value.uri)
+
 
 class ParquetToArrowDecodingHandler(StructuredDatasetDecoder):
+    supports_filters = True
+
     def __init__(self):
         super().__init__(pa.Table, None, PARQUET)
 
@@ -173,22 +473,106 @@ class ParquetToArrowDecodingHandler(StructuredDatasetDecoder):
         ctx: FlyteContext,
         flyte_value: literals.StructuredDataset,
         current_task_metadata: StructuredDatasetMetadata,
+        filters: typing.Optional[RowFilter] = None,
     ) -> "pa.Table":
-        import pyarrow.parquet as pq
-
         uri = flyte_value.uri
         if not ctx.file_access.is_remote(uri):
             Path(uri).parent.mkdir(parents=True, exist_ok=True)
-        _, path = split_protocol(uri)
 
         columns = None
         if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
             columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
         try:
-            return pq.read_table(path, columns=columns)
-        except NoCredentialsError as e:
+            return read_parquet_table(ctx, uri, columns, filters)
+        except NoCredentialsError:
             logger.debug("S3 source detected, attempting anonymous S3 access")
-            fs = ctx.file_access.get_filesystem_for_path(uri, anonymous=True)
-            if fs is not None:
-                return pq.read_table(path, filesystem=fs, columns=columns)
-            raise e
+            return read_parquet_table(ctx, uri, columns, filters, anonymous=True)
+
+    def iter_decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+        batch_size: typing.Optional[int] = None,
+        filters: typing.Optional[RowFilter] = None,
+    ) -> typing.Generator["pa.Table", None, None]:
+        columns = None
+        if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
+            columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
+        yield from iter_parquet_tables(ctx, flyte_value.uri, columns, batch_size, filters)
+
+
+class ParquetToArrowDatasetDecodingHandler(StructuredDatasetDecoder):
+    """
+    Opens parquet as a lazy ``pyarrow.dataset.Dataset`` instead of reading it, so that the consumer decides what to
+    scan, e.g. with ``dataset.to_batches(filter=...)``.
+    """
+
+    supports_filters = True
+
+    def __init__(self):
+        import pyarrow.dataset as ds
+
+        super().__init__(ds.Dataset, None, PARQUET)
+
+    def decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+        filters: typing.Optional[RowFilter] = None,
+    ) -> "pyarrow.dataset.Dataset":
+        columns = None
+        if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
+            columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
+        return open_parquet_dataset(ctx, flyte_value.uri, columns, filters)
+
+
+class GeneratorToParquetEncodingHandler(StructuredDatasetEncoder):
+    """
+    Writes a generator of pandas dataframes, arrow tables or record batches incrementally, one row group per frame,
+    so that the whole dataset never has to fit in memory. All frames must have the same schema.
+    """
+
+    def __init__(self):
+        super().__init__(types.GeneratorType, None, PARQUET)
+
+    def encode(
+        self,
+        ctx: FlyteContext,
+        structured_dataset: StructuredDataset,
+        structured_dataset_type: StructuredDatasetType,
+    ) -> literals.StructuredDataset:
+        import pyarrow.parquet as pq
+
+        uri = typing.cast(str, structured_dataset.uri) or ctx.file_access.join(
+            ctx.file_access.raw_output_prefix, ctx.file_access.get_random_string()
+        )
+        if not ctx.file_access.is_remote(uri):
+            Path(uri).mkdir(parents=True, exist_ok=True)
+        path = os.path.join(uri, f"{0:05}")
+        filesystem = ctx.file_access.get_filesystem_for_path(path)
+        writer = None
+        try:
+            for frame in structured_dataset.dataframe:
+                if isinstance(frame, pa.RecordBatch):
+                    table = pa.Table.from_batches([frame])
+                elif isinstance(frame, pa.Table):
+                    table = frame
+                else:
+                    table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(strip_protocol(path), table.schema, filesystem=filesystem)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            raise ValueError(f"Cannot write {structured_dataset} to parquet, the generator didn't yield any frames")
+        structured_dataset_type.format = PARQUET
+        return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
+
+    def collect_stats(
+        self, ctx: FlyteContext, flyte_value: literals.StructuredDataset
+    ) -> typing.Optional[StructuredDatasetStats]:
+        return parquet_stats(ctx, flyte_value.uri)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import collections
+import functools
+import threading
 import types
 import typing
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Dict, Generator, Optional, Type, Union
+from typing import Dict, Generator, Optional, Tuple, Type, Union
 
 import _datetime
 from dataclasses_json import config
@@ -16,7 +18,7 @@ from typing_extensions import Annotated, TypeAlias, get_args, get_origin
 
 from flytekit import lazy_module
 from flytekit.core.context_manager import FlyteContext, FlyteContextManager
-from flytekit.core.type_engine import TypeEngine, TypeTransformer
+from flytekit.core.type_engine import TypeEngine, TypeTransformer, get_batch_size
 from flytekit.deck.renderer import Renderable
 from flytekit.loggers import logger
 from flytekit.models import literals
@@ -40,10 +42,169 @@ StructuredDatasetFormat: TypeAlias = str
 # Storage formats
 PARQUET: StructuredDatasetFormat = "parquet"
 CSV: StructuredDatasetFormat = "csv"
+
+STATS_METADATA_KEY = "flyte.sd.stats"
+"""
+Key in the metadata of a StructuredDataset literal that holds its statistics as JSON.
+"""
+# Arrow IPC file format, also known as Feather V2
+ARROW_IPC: StructuredDatasetFormat = "arrow"
 GENERIC_FORMAT: StructuredDatasetFormat = ""
 GENERIC_PROTOCOL: str = "generic protocol"
 
 
+class ParquetPartitioning(object):
+    """
+    This is used to have parquet encoders split a dataframe into multiple files instead of writing a single one, e.g.
+
+    @task
+    def t1() -> Annotated[StructuredDataset, ParquetPartitioning(max_rows_per_file=10_000_000)]:
+        ...
+
+    The files are written in parallel and all land under the uri of the dataset, in hive style ``col=value``
+    subdirectories when partition columns are given, so decoders read them back as one dataset. It can also be passed
+    to a single StructuredDataset with ``StructuredDataset(dataframe=df, partitioning=ParquetPartitioning(...))``.
+    """
+
+    def __init__(
+        self,
+        max_rows_per_file: typing.Optional[int] = None,
+        max_bytes_per_file: typing.Optional[int] = None,
+        partition_cols: typing.Optional[typing.List[str]] = None,
+    ):
+        """
+        :param max_rows_per_file: Maximum number of rows written to each file.
+        :param max_bytes_per_file: Approximate maximum in-memory size of the rows written to each file, it is
+            converted to a row count using the average row size of the dataframe.
+        :param partition_cols: Columns to partition the files by.
+        """
+        if max_rows_per_file is not None and max_rows_per_file <= 0:
+            raise ValueError(f"max_rows_per_file should be positive, got {max_rows_per_file}")
+        if max_bytes_per_file is not None and max_bytes_per_file <= 0:
+            raise ValueError(f"max_bytes_per_file should be positive, got {max_bytes_per_file}")
+        self._max_rows_per_file = max_rows_per_file
+        self._max_bytes_per_file = max_bytes_per_file
+        self._partition_cols = partition_cols
+
+    @property
+    def max_rows_per_file(self) -> typing.Optional[int]:
+        return self._max_rows_per_file
+
+    @property
+    def max_bytes_per_file(self) -> typing.Optional[int]:
+        return self._max_bytes_per_file
+
+    @property
+    def partition_cols(self) -> typing.Optional[typing.List[str]]:
+        return self._partition_cols
+
+    def rows_per_file(self, num_rows: int, nbytes: int) -> typing.Optional[int]:
+        """
+        Returns the maximum number of rows per file for a dataframe of the given size, or None if unbounded.
+        """
+        limits = []
+        if self._max_rows_per_file is not None:
+            limits.append(self._max_rows_per_file)
+        if self._max_bytes_per_file is not None and num_rows > 0 and nbytes > 0:
+            limits.append(max(1, self._max_bytes_per_file * num_rows // nbytes))
+        return min(limits) if limits else None
+
+
+def get_parquet_partitioning(t: typing.Any) -> Optional[ParquetPartitioning]:
+    if get_origin(t) is Annotated:
+        for annotation in get_args(t)[1:]:
+            if isinstance(annotation, ParquetPartitioning):
+                return annotation
+    return None
+
+
+class RowFilter(object):
+    """
+    This is used to annotate a StructuredDataset or dataframe input so that only the matching rows are read, e.g.
+
+    @task
+    def t1(sd: Annotated[StructuredDataset, RowFilter([("country", "=", "NL"), ("year", ">=", 2023)])]):
+        ...
+
+    The filter is pushed down into the reads of decoders that support it. The built-in parquet decoders skip the
+    files of partitioned directories and the row groups whose statistics rule out any match. Filters are given in the
+    disjunctive normal form of :py:func:`pyarrow.parquet.read_table`, i.e. a list of ``(column, op, value)`` tuples
+    that are and-ed, or a list of such lists that are or-ed, or as a ``pyarrow.compute.Expression``.
+    """
+
+    def __init__(self, filters: typing.Any):
+        self._filters = filters
+
+    @property
+    def filters(self) -> typing.Any:
+        return self._filters
+
+    def to_expression(self) -> "pa.compute.Expression":
+        import pyarrow.parquet as pq
+
+        return pq.filters_to_expression(self._filters)
+
+
+def get_row_filter(t: typing.Any) -> Optional[RowFilter]:
+    if get_origin(t) is Annotated:
+        for annotation in get_args(t)[1:]:
+            if isinstance(annotation, RowFilter):
+                return annotation
+    return None
+
+
+class CollectStats(object):
+    """
+    This is used to annotate a StructuredDataset or dataframe output whose row count, size and per-column statistics
+    should be recorded in the output literal, e.g.
+
+    @task
+    def t1() -> Annotated[pd.DataFrame, CollectStats()]:
+        ...
+
+    Encoders that support it gather the statistics cheaply, e.g. the built-in parquet encoders read them from the
+    footers of the files they wrote. Downstream, :py:attr:`StructuredDataset.stats` returns them without reading
+    the data, which is useful to size map tasks for instance.
+    """
+
+
+def get_collect_stats(t: typing.Any) -> bool:
+    if get_origin(t) is Annotated:
+        for annotation in get_args(t)[1:]:
+            if isinstance(annotation, CollectStats):
+                return True
+    return False
+
+
+@dataclass
+class ColumnStats(DataClassJSONMixin):
+    null_count: Optional[int] = None
+    min: typing.Any = None
+    max: typing.Any = None
+
+
+@dataclass
+class StructuredDatasetStats(DataClassJSONMixin):
+    """
+    Statistics of a written StructuredDataset. ``num_bytes`` is the uncompressed size of the data, and the min/max
+    values of columns whose types have no JSON representation are stored as strings.
+    """
+
+    num_rows: int
+    num_bytes: int
+    num_files: int = 1
+    columns: Dict[str, ColumnStats] = field(default_factory=dict)
+
+
+def get_literal_stats(lv: Literal) -> Optional[StructuredDatasetStats]:
+    """
+    Returns the statistics recorded in the metadata of a StructuredDataset literal, if any.
+    """
+    if lv.metadata and STATS_METADATA_KEY in lv.metadata:
+        return StructuredDatasetStats.from_json(lv.metadata[STATS_METADATA_KEY])
+    return None
+
+
 @dataclass
 class StructuredDataset(DataClassJSONMixin):
     """
@@ -67,6 +228,8 @@ class StructuredDataset(DataClassJSONMixin):
         dataframe: typing.Optional[typing.Any] = None,
         uri: typing.Optional[str] = None,
         metadata: typing.Optional[literals.StructuredDatasetMetadata] = None,
+        partitioning: typing.Optional[ParquetPartitioning] = None,
+        collect_stats: bool = False,
         **kwargs,
     ):
         self._dataframe = dataframe
@@ -79,9 +242,18 @@ class StructuredDataset(DataClassJSONMixin):
         self._metadata = metadata
         # This is not for users to set, the transformer will set this.
         self._literal_sd: Optional[literals.StructuredDataset] = None
+        # Default chunk size for iter(), set by the transformer from a BatchSize annotation
+        self._batch_size: Optional[int] = None
+        # Rows to read, set by filter() or by the transformer from a RowFilter annotation
+        self._filters: Optional[RowFilter] = None
         # Not meant for users to set, will be set by an open() call
         self._dataframe_type: Optional[DF] = None  # type: ignore
         self._already_uploaded = False
+        # How parquet encoders should split the dataframe into files, if at all
+        self._partitioning = partitioning
+        # Whether the encoder should record statistics, and the ones recorded by it or found in the input literal
+        self._collect_stats = collect_stats
+        self._stats: Optional[StructuredDatasetStats] = None
 
     @property
     def dataframe(self) -> Optional[DF]:
@@ -95,22 +267,54 @@ class StructuredDataset(DataClassJSONMixin):
     def literal(self) -> Optional[literals.StructuredDataset]:
         return self._literal_sd
 
+    @property
+    def partitioning(self) -> Optional[ParquetPartitioning]:
+        return self._partitioning
+
+    @property
+    def stats(self) -> Optional[StructuredDatasetStats]:
+        """
+        The statistics the dataset was written with, if they were collected. See :py:class:`CollectStats`.
+        """
+        return self._stats
+
     def open(self, dataframe_type: Type[DF]):
         self._dataframe_type = dataframe_type
         return self
 
+    def filter(self, filters: typing.Any):
+        """
+        Only read the rows matching ``filters`` in subsequent all() and iter() calls, e.g.
+        ``sd.open(pd.DataFrame).filter([("year", ">=", 2023)]).all()``. See :py:class:`RowFilter` for the syntax.
+        """
+        self._filters = filters if isinstance(filters, RowFilter) else RowFilter(filters)
+        return self
+
     def all(self) -> DF:  # type: ignore
         if self._dataframe_type is None:
             raise ValueError("No dataframe type set. Use open() to set the local dataframe type you want to use.")
         ctx = FlyteContextManager.current_context()
-        return flyte_dataset_transformer.open_as(ctx, self.literal, self._dataframe_type, self.metadata)
+        return flyte_dataset_transformer.open_as(
+            ctx, self.literal, self._dataframe_type, self.metadata, filters=self._filters
+        )
+
+    def iter(self, batch_size: Optional[int] = None) -> Generator[DF, None, None]:
+        """
+        Iterates over the dataset in chunks, without loading all of it in memory if the decoder supports streaming.
 
-    def iter(self) -> Generator[DF, None, None]:
+        :param batch_size: The maximum number of rows of each chunk. Defaults to the ``BatchSize`` annotation of the
+          input, if any, else the decoder picks the chunks, e.g. one per parquet row group.
+        """
         if self._dataframe_type is None:
             raise ValueError("No dataframe type set. Use open() to set the local dataframe type you want to use.")
         ctx = FlyteContextManager.current_context()
         return flyte_dataset_transformer.iter_as(
-            ctx, self.literal, self._dataframe_type, updated_metadata=self.metadata
+            ctx,
+            self.literal,
+            self._dataframe_type,
+            updated_metadata=self.metadata,
+            batch_size=batch_size or self._batch_size,
+            filters=self._filters,
         )
 
 
@@ -222,8 +426,22 @@ class StructuredDatasetEncoder(ABC):
         """
         raise NotImplementedError
 
+    def collect_stats(
+        self, ctx: FlyteContext, flyte_value: literals.StructuredDataset
+    ) -> Optional[StructuredDatasetStats]:
+        """
+        Override this to return the statistics of a dataset this encoder just wrote. It is only called for outputs
+        that ask for statistics, see :py:class:`CollectStats`, and that :py:meth:`encode` did not already set the
+        statistics of, which encoders can do from the data they hold rather than read it back.
+        """
+        return None
+
 
 class StructuredDatasetDecoder(ABC):
+    # Set this if decode() and iter_decode() accept a ``filters: Optional[RowFilter]`` keyword argument and only
+    # return the matching rows.
+    supports_filters: bool = False
+
     def __init__(self, python_type: Type[DF], protocol: Optional[str] = None, supported_format: Optional[str] = None):
         """
         Extend this abstract class, implement the decode function, and register your concrete class with the
@@ -277,6 +495,26 @@ class StructuredDatasetDecoder(ABC):
         """
         raise NotImplementedError
 
+    def iter_decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+        batch_size: Optional[int] = None,
+    ) -> typing.Iterator[DF]:
+        """
+        This is called instead of :py:meth:`decode` when the user iterates over a dataset. By default it expects
+        ``decode`` to return a generator. Decoders that can stream the dataset in chunks should override it, so that
+        the same decoder serves both whole and chunked reads.
+
+        :param batch_size: The maximum number of rows of each chunk. If not given, the decoder picks a natural chunk
+          size for its storage format, e.g. a parquet row group.
+        """
+        result = self.decode(ctx, flyte_value, current_task_metadata)
+        if not isinstance(result, types.GeneratorType):
+            raise ValueError(f"Decoder {self} didn't return iterator {result} but should have from {flyte_value}")
+        return result
+
 
 def convert_schema_type_to_structured_dataset_type(
     column_type: int,
@@ -327,6 +565,15 @@ class DuplicateHandlerError(ValueError):
     ...
 
 
+def _stats_metadata(stats: Optional[StructuredDatasetStats]) -> Optional[Dict[str, str]]:
+    return {STATS_METADATA_KEY: stats.to_json()} if stats is not None else None
+
+
+@functools.lru_cache(maxsize=128)
+def _prefix_protocol(prefix: str) -> str:
+    return get_protocol(prefix)
+
+
 class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
     """
     Think of this transformer as a higher-level meta transformer that is used for all the dataframe types.
@@ -342,8 +589,24 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
     Handlers = Union[StructuredDatasetEncoder, StructuredDatasetDecoder]
     Renderers: Dict[Type, Renderable] = {}
 
+    # Resolved handlers keyed by (handler map, dataframe type, protocol, format), cleared whenever a handler is
+    # registered. The lock guards the handler maps and the cache so that conversions can run from several threads.
+    _HANDLER_CACHE: Dict[Tuple[int, Type, str, str], Handlers] = {}
+    _REGISTRY_LOCK = threading.RLock()
+
     @classmethod
     def _finder(cls, handler_map, df_type: Type, protocol: str, format: str):
+        key = (id(handler_map), df_type, protocol, format)
+        handler = cls._HANDLER_CACHE.get(key)
+        if handler is not None:
+            return handler
+        with cls._REGISTRY_LOCK:
+            handler = cls._find_handler(handler_map, df_type, protocol, format)
+            cls._HANDLER_CACHE[key] = handler
+        return handler
+
+    @classmethod
+    def _find_handler(cls, handler_map, df_type: Type, protocol: str, format: str):
         # If there's an exact match, then we should use it.
         try:
             return handler_map[df_type][protocol][format]
@@ -485,34 +748,42 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
         """
         if protocol == "/":
             protocol = "file"
-        lowest_level = cls._handler_finder(h, protocol)
-        if h.supported_format in lowest_level and override is False:
-            raise DuplicateHandlerError(
-                f"Already registered a handler for {(h.python_type, protocol, h.supported_format)}"
-            )
-        lowest_level[h.supported_format] = h
-        logger.debug(f"Registered {h} as handler for {h.python_type}, protocol {protocol}, fmt {h.supported_format}")
-
-        if (default_format_for_type or default_for_type) and h.supported_format != GENERIC_FORMAT:
-            if h.python_type in cls.DEFAULT_FORMATS and not override:
-                if cls.DEFAULT_FORMATS[h.python_type] != h.supported_format:
-                    logger.info(
-                        f"Not using handler {h} with format {h.supported_format} as default for {h.python_type}, {cls.DEFAULT_FORMATS[h.python_type]} already specified."
-                    )
-            else:
-                logger.debug(
-                    f"Setting format {h.supported_format} for dataframes of type {h.python_type} from handler {h}"
+        with cls._REGISTRY_LOCK:
+            lowest_level = cls._handler_finder(h, protocol)
+            if h.supported_format in lowest_level and override is False:
+                raise DuplicateHandlerError(
+                    f"Already registered a handler for {(h.python_type, protocol, h.supported_format)}"
                 )
-                cls.DEFAULT_FORMATS[h.python_type] = h.supported_format
-        if default_storage_for_type or default_for_type:
-            if h.protocol in cls.DEFAULT_PROTOCOLS and not override:
-                logger.debug(
-                    f"Not using handler {h} with storage protocol {h.protocol} as default for {h.python_type}, {cls.DEFAULT_PROTOCOLS[h.python_type]} already specified."
-                )
-            else:
-                logger.debug(f"Using storage {protocol} for dataframes of type {h.python_type} from handler {h}")
-                cls.DEFAULT_PROTOCOLS[h.python_type] = protocol
+            lowest_level[h.supported_format] = h
+            logger.debug(
+                f"Registered {h} as handler for {h.python_type}, protocol {protocol}, fmt {h.supported_format}"
+            )
 
+            if (default_format_for_type or default_for_type) and h.supported_format != GENERIC_FORMAT:
+                if h.python_type in cls.DEFAULT_FORMATS and not override:
+                    if cls.DEFAULT_FORMATS[h.python_type] != h.supported_format:
+                        logger.info(
+                            f"Not using handler {h} with format {h.supported_format} as default for {h.python_type}, {cls.DEFAULT_FORMATS[h.python_type]} already specified."
+                        )
+                else:
+                    logger.debug(
+                        f"Setting format {h.supported_format} for dataframes of type {h.python_type} from handler {h}"
+                    )
+                    cls.DEFAULT_FORMATS[h.python_type] = h.supported_format
+            if default_storage_for_type or default_for_type:
+                if h.protocol in cls.DEFAULT_PROTOCOLS and not override:
+                    logger.debug(
+                        f"Not using handler {h} with storage protocol {h.protocol} as default for {h.python_type}, {cls.DEFAULT_PROTOCOLS[h.python_type]} already specified."
+                    )
+                else:
+                    logger.debug(f"Using storage {protocol} for dataframes of type {h.python_type} from handler {h}")
+                    cls.DEFAULT_PROTOCOLS[h.python_type] = protocol
+            cls._HANDLER_CACHE.clear()
+
+        # Generators are only encoded as the dataframe of a StructuredDataset, other generators in task signatures
+        # must not be taken for dataframes
+        if h.python_type is types.GeneratorType:
+            return
         # Register with the type engine as well
         # The semantics as of now are such that it doesn't matter which order these transformers are loaded in, as
         # long as the older Pandas/FlyteSchema transformer do not also specify the override
@@ -531,6 +802,8 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
     ) -> Literal:
         # Make a copy in case we need to hand off to encoders, since we can't be sure of mutations.
         # Check first to see if it's even an SD type. For backwards compatibility, we may be getting a FlyteSchema
+        partitioning = get_parquet_partitioning(python_type)
+        collect_stats = get_collect_stats(python_type)
         python_type, *attrs = extract_cols_and_format(python_type)
         # In case it's a FlyteSchema
         sdt = StructuredDatasetType(format=self.DEFAULT_FORMATS.get(python_type, GENERIC_FORMAT))
@@ -556,12 +829,18 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
             #       return dataset
             if python_val._literal_sd is not None:
                 if python_val._already_uploaded:
-                    return Literal(scalar=Scalar(structured_dataset=python_val._literal_sd))
+                    return Literal(
+                        scalar=Scalar(structured_dataset=python_val._literal_sd),
+                        metadata=_stats_metadata(python_val._stats),
+                    )
                 if python_val.dataframe is not None:
                     raise ValueError(
                         f"Shouldn't have specified both literal {python_val._literal_sd} and dataframe {python_val.dataframe}"
                     )
-                return Literal(scalar=Scalar(structured_dataset=python_val._literal_sd))
+                return Literal(
+                    scalar=Scalar(structured_dataset=python_val._literal_sd),
+                    metadata=_stats_metadata(python_val._stats),
+                )
 
             # 2. A task returns a python StructuredDataset with an uri.
             # Note: this case is also what happens we start a local execution of a task with a python StructuredDataset.
@@ -586,6 +865,9 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
             # that we will need to invoke an encoder for. Figure out which encoder to call and invoke it.
             df_type = type(python_val.dataframe)
             protocol = self._protocol_from_type_or_prefix(ctx, df_type, python_val.uri)
+            if python_val._partitioning is None:
+                python_val._partitioning = partitioning
+            python_val._collect_stats = python_val._collect_stats or collect_stats
             return self.encode(
                 ctx,
                 python_val,
@@ -600,7 +882,9 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
         protocol = self._protocol_from_type_or_prefix(ctx, python_type)
         meta = StructuredDatasetMetadata(structured_dataset_type=expected.structured_dataset_type if expected else None)
 
-        sd = StructuredDataset(dataframe=python_val, metadata=meta)
+        sd = StructuredDataset(
+            dataframe=python_val, metadata=meta, partitioning=partitioning, collect_stats=collect_stats
+        )
         return self.encode(ctx, sd, python_type, protocol, fmt, sdt)
 
     def _protocol_from_type_or_prefix(self, ctx: FlyteContext, df_type: Type, uri: Optional[str] = None) -> str:
@@ -611,7 +895,8 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
         if df_type in self.DEFAULT_PROTOCOLS:
             return self.DEFAULT_PROTOCOLS[df_type]
         else:
-            protocol = get_protocol(uri or ctx.file_access.raw_output_prefix)
+            # The raw output prefix is the same for most calls, so its protocol is only parsed once
+            protocol = get_protocol(uri) if uri else _prefix_protocol(ctx.file_access.raw_output_prefix)
             logger.debug(
                 f"No default protocol for type {df_type} found, using {protocol} from output prefix {ctx.file_access.raw_output_prefix}"
             )
@@ -628,6 +913,7 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
     ) -> Literal:
         handler: StructuredDatasetEncoder
         handler = self.get_encoder(df_type, protocol, format)
+        sd._stats = None
         sd_model = handler.encode(ctx, sd, structured_literal_type)
         # This block is here in case the encoder did not set the type information in the metadata. Since this literal
         # is special in that it carries around the type itself, we want to make sure the type info therein is at
@@ -640,7 +926,11 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
         # Note that this will always be the same as the incoming format except for when the fallback handler
         # with a format of "" is used.
         sd_model.metadata._structured_dataset_type.format = handler.supported_format
-        lit = Literal(scalar=Scalar(structured_dataset=sd_model))
+        if sd._collect_stats and sd._stats is None:
+            sd._stats = handler.collect_stats(ctx, sd_model)
+            if sd._stats is None:
+                logger.warning(f"Encoder {handler} does not collect statistics, none are recorded for {sd_model.uri}")
+        lit = Literal(scalar=Scalar(structured_dataset=sd_model), metadata=_stats_metadata(sd._stats))
         sd._literal_sd = sd_model
         sd._already_uploaded = True
         return lit
@@ -679,6 +969,8 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
         +-----------------------------+-----------------------------------------+--------------------------------------+
         """
         # Detect annotations and extract out all the relevant information that the user might supply
+        batch_size = get_batch_size(expected_python_type)
+        row_filter = get_row_filter(expected_python_type)
         expected_python_type, column_dict, storage_fmt, pa_schema = extract_cols_and_format(expected_python_type)
 
         # The literal that we get in might be an old FlyteSchema.
@@ -716,9 +1008,11 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
             if issubclass(expected_python_type, StructuredDataset):
                 sd = StructuredDataset(dataframe=None, metadata=metad)
                 sd._literal_sd = sd_literal
+                sd._batch_size = batch_size
+                sd._filters = row_filter
                 return sd
             else:
-                return self.open_as(ctx, sd_literal, expected_python_type, metad)
+                return self.open_as(ctx, sd_literal, expected_python_type, metad, filters=row_filter)
 
         # Start handling for StructuredDataset scalars, first look at the columns
         incoming_columns = lv.scalar.structured_dataset.metadata.structured_dataset_type.columns
@@ -753,11 +1047,16 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
             )
             sd._literal_sd = lv.scalar.structured_dataset
             sd.file_format = metad.structured_dataset_type.format
+            sd._batch_size = batch_size
+            sd._filters = row_filter
+            sd._stats = get_literal_stats(lv)
             return sd
 
         # If the requested type was not a StructuredDataset, then it means it was a plain dataframe type, which means
         # we should do the opening/downloading and whatever else it might entail right now. No iteration option here.
-        return self.open_as(ctx, lv.scalar.structured_dataset, df_type=expected_python_type, updated_metadata=metad)
+        return self.open_as(
+            ctx, lv.scalar.structured_dataset, df_type=expected_python_type, updated_metadata=metad, filters=row_filter
+        )
 
     def to_html(self, ctx: FlyteContext, python_val: typing.Any, expected_python_type: Type[T]) -> str:
         if isinstance(python_val, StructuredDataset):
@@ -782,17 +1081,23 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
         sd: literals.StructuredDataset,
         df_type: Type[DF],
         updated_metadata: StructuredDatasetMetadata,
+        filters: Optional[RowFilter] = None,
     ) -> DF:
         """
         :param ctx: A FlyteContext, useful in accessing the filesystem and other attributes
         :param sd:
         :param df_type:
         :param updated_metadata: New metadata type, since it might be different from the metadata in the literal.
+        :param filters: Only read the rows matching these filters.
         :return: dataframe. It could be pandas dataframe or arrow table, etc.
         """
         protocol = get_protocol(sd.uri)
         decoder = self.get_decoder(df_type, protocol, sd.metadata.structured_dataset_type.format)
-        result = decoder.decode(ctx, sd, updated_metadata)
+        if filters is not None:
+            self._check_supports_filters(decoder)
+            result = decoder.decode(ctx, sd, updated_metadata, filters=filters)  # type: ignore
+        else:
+            result = decoder.decode(ctx, sd, updated_metadata)
         if isinstance(result, types.GeneratorType):
             raise ValueError(f"Decoder {decoder} returned iterator {result} but whole value requested from {sd}")
         return result
@@ -803,13 +1108,20 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
         sd: literals.StructuredDataset,
         df_type: Type[DF],
         updated_metadata: StructuredDatasetMetadata,
+        batch_size: Optional[int] = None,
+        filters: Optional[RowFilter] = None,
     ) -> typing.Iterator[DF]:
         protocol = get_protocol(sd.uri)
-        decoder = self.DECODERS[df_type][protocol][sd.metadata.structured_dataset_type.format]
-        result: Union[DF, typing.Iterator[DF]] = decoder.decode(ctx, sd, updated_metadata)
-        if not isinstance(result, types.GeneratorType):
-            raise ValueError(f"Decoder {decoder} didn't return iterator {result} but should have from {sd}")
-        return result
+        decoder = self.get_decoder(df_type, protocol, sd.metadata.structured_dataset_type.format)
+        if filters is not None:
+            self._check_supports_filters(decoder)
+            return decoder.iter_decode(ctx, sd, updated_metadata, batch_size, filters=filters)  # type: ignore
+        return decoder.iter_decode(ctx, sd, updated_metadata, batch_size)
+
+    @staticmethod
+    def _check_supports_filters(decoder: StructuredDatasetDecoder):
+        if not decoder.supports_filters:
+            raise ValueError(f"Decoder {decoder} does not support row filters")
 
     def _get_dataset_column_literal_type(self, t: Type) -> type_models.LiteralType:
         if t in get_supported_types():
@@ -6,6 +6,14 @@
    :toctree: generated/
 
    DuckDBQuery
+   ParquetToDuckDBRelationDecodingHandler
 """
 
+from flytekit.loggers import logger
+
+try:
+    from .sd_transformers import ParquetToDuckDBRelationDecodingHandler
+except ImportError:
+    # The relation handler needs the lazy parquet reader of flytekit>=1.12.0, an older flytekit must still import
+    logger.warning("flytekit is too old for the DuckDB relation handler, upgrade flytekit to decode DuckDB relations")
 from .task import DuckDBQuery
@@ -0,0 +1,41 @@
+import typing
+
+from flytekit import FlyteContext, lazy_module
+from flytekit.models import literals
+from flytekit.models.literals import StructuredDatasetMetadata
+from flytekit.types.structured.basic_dfs import open_parquet_dataset
+from flytekit.types.structured.structured_dataset import (
+    PARQUET,
+    RowFilter,
+    StructuredDatasetDecoder,
+    StructuredDatasetTransformerEngine,
+)
+
+duckdb = lazy_module("duckdb")
+
+
+class ParquetToDuckDBRelationDecodingHandler(StructuredDatasetDecoder):
+    """
+    Returns a DuckDB relation on the default connection that scans the parquet data lazily, DuckDB pushes the
+    projections and filters of the query down into the scan.
+    """
+
+    supports_filters = True
+
+    def __init__(self):
+        super().__init__(duckdb.DuckDBPyRelation, None, PARQUET)
+
+    def decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+        filters: typing.Optional[RowFilter] = None,
+    ) -> duckdb.DuckDBPyRelation:
+        columns = None
+        if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
+            columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
+        return duckdb.from_arrow(open_parquet_dataset(ctx, flyte_value.uri, columns, filters))
+
+
+StructuredDatasetTransformerEngine.register(ParquetToDuckDBRelationDecodingHandler())
@@ -1,6 +1,7 @@
 import json
 from typing import List
 
+import duckdb
 import pandas as pd
 import pyarrow as pa
 from flytekitplugins.duckdb import DuckDBQuery
@@ -146,3 +147,19 @@ def test_insert_query_with_single_params():
         return duckdb_params_query(params=params)
 
     assert isinstance(params_wf(params=json.dumps([[[500], [300], [2]]])), pa.Table)
+
+
+def test_lazy_relation():
+    @task
+    def produce() -> pd.DataFrame:
+        return pd.DataFrame({"a": [1, 2, 3], "b": list("xyz")})
+
+    @task
+    def consume(rel: duckdb.DuckDBPyRelation) -> int:
+        return rel.filter("a > 1").aggregate("sum(a)").fetchone()[0]
+
+    @workflow
+    def wf() -> int:
+        return consume(rel=produce())
+
+    assert wf() == 5
@@ -5,7 +5,9 @@ from flytekit import FlyteContext, lazy_module
 from flytekit.models import literals
 from flytekit.models.literals import StructuredDatasetMetadata
 from flytekit.models.types import StructuredDatasetType
+from flytekit.types.structured.arrow_ipc import read_arrow_ipc, write_arrow_ipc
 from flytekit.types.structured.structured_dataset import (
+    ARROW_IPC,
     PARQUET,
     StructuredDataset,
     StructuredDatasetDecoder,
@@ -76,6 +78,38 @@ class ParquetToHuggingFaceDatasetDecodingHandler(StructuredDatasetDecoder):
         return datasets.Dataset.from_parquet(files)
 
 
+class HuggingFaceDatasetToArrowIPCEncodingHandler(StructuredDatasetEncoder):
+    def __init__(self):
+        super().__init__(datasets.Dataset, None, ARROW_IPC)
+
+    def encode(
+        self,
+        ctx: FlyteContext,
+        structured_dataset: StructuredDataset,
+        structured_dataset_type: StructuredDatasetType,
+    ) -> literals.StructuredDataset:
+        df = typing.cast(datasets.Dataset, structured_dataset.dataframe)
+        # A dataset is backed by an Arrow table already, flatten_indices materializes pending selects and shuffles
+        uri = write_arrow_ipc(ctx, df.flatten_indices().data.table, structured_dataset.uri)
+        structured_dataset_type.format = ARROW_IPC
+        return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
+
+
+class ArrowIPCToHuggingFaceDatasetDecodingHandler(StructuredDatasetDecoder):
+    def __init__(self):
+        super().__init__(datasets.Dataset, None, ARROW_IPC)
+
+    def decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+    ) -> datasets.Dataset:
+        return datasets.Dataset(read_arrow_ipc(ctx, flyte_value.uri, current_task_metadata))
+
+
 StructuredDatasetTransformerEngine.register(HuggingFaceDatasetToParquetEncodingHandler())
 StructuredDatasetTransformerEngine.register(ParquetToHuggingFaceDatasetDecodingHandler())
+StructuredDatasetTransformerEngine.register(HuggingFaceDatasetToArrowIPCEncodingHandler())
+StructuredDatasetTransformerEngine.register(ArrowIPCToHuggingFaceDatasetDecodingHandler())
 StructuredDatasetTransformerEngine.register_renderer(datasets.Dataset, HuggingFaceDatasetRenderer())
@@ -9,6 +9,19 @@ This package contains things that are useful when extending Flytekit.
 
    PolarsDataFrameToParquetEncodingHandler
    ParquetToPolarsDataFrameDecodingHandler
+   PolarsLazyFrameToParquetEncodingHandler
+   ParquetToPolarsLazyFrameDecodingHandler
 """
 
-from .sd_transformers import ParquetToPolarsDataFrameDecodingHandler, PolarsDataFrameToParquetEncodingHandler
+from flytekit.loggers import logger
+
+try:
+    from .sd_transformers import (
+        ParquetToPolarsDataFrameDecodingHandler,
+        ParquetToPolarsLazyFrameDecodingHandler,
+        PolarsDataFrameToParquetEncodingHandler,
+        PolarsLazyFrameToParquetEncodingHandler,
+    )
+except ImportError:
+    # The handlers need the lazy parquet reader of flytekit>=1.12.0, an older flytekit must still import
+    logger.warning("flytekit is too old for the Polars structured dataset handlers, upgrade flytekit to use them")
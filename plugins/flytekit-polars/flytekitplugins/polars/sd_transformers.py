@@ -6,8 +6,12 @@ from flytekit.core.data_persistence import get_fsspec_storage_options
 from flytekit.models import literals
 from flytekit.models.literals import StructuredDatasetMetadata
 from flytekit.models.types import StructuredDatasetType
+from flytekit.types.structured.arrow_ipc import read_arrow_ipc, write_arrow_ipc
+from flytekit.types.structured.basic_dfs import open_parquet_dataset
 from flytekit.types.structured.structured_dataset import (
+    ARROW_IPC,
     PARQUET,
+    RowFilter,
     StructuredDataset,
     StructuredDatasetDecoder,
     StructuredDatasetEncoder,
@@ -82,6 +86,85 @@ class ParquetToPolarsDataFrameDecodingHandler(StructuredDatasetDecoder):
         return pl.read_parquet(uri, use_pyarrow=True, storage_options=kwargs)
 
 
-StructuredDatasetTransformerEngine.register(PolarsDataFrameToParquetEncodingHandler())
-StructuredDatasetTransformerEngine.register(ParquetToPolarsDataFrameDecodingHandler())
+class PolarsLazyFrameToParquetEncodingHandler(StructuredDatasetEncoder):
+    def __init__(self):
+        super().__init__(pl.LazyFrame, None, PARQUET)
+
+    def encode(
+        self,
+        ctx: FlyteContext,
+        structured_dataset: StructuredDataset,
+        structured_dataset_type: StructuredDatasetType,
+    ) -> literals.StructuredDataset:
+        lf = typing.cast(pl.LazyFrame, structured_dataset.dataframe)
+        uri = structured_dataset.uri or ctx.file_access.get_random_remote_directory()
+        # The query is streamed into a local file so that its result never has to fit in memory
+        local_path = ctx.file_access.get_random_local_path()
+        lf.sink_parquet(local_path)
+        ctx.file_access.put_data(local_path, ctx.file_access.join(uri, "00000"))
+        structured_dataset_type.format = PARQUET
+        return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
+
+
+class ParquetToPolarsLazyFrameDecodingHandler(StructuredDatasetDecoder):
+    """
+    Returns a LazyFrame that scans the parquet data when it is collected, with the projections and predicates of the
+    query pushed down into the scan.
+    """
+
+    supports_filters = True
+
+    def __init__(self):
+        super().__init__(pl.LazyFrame, None, PARQUET)
+
+    def decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+        filters: typing.Optional[RowFilter] = None,
+    ) -> pl.LazyFrame:
+        columns = None
+        if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
+            columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
+        # Scanning an Arrow dataset rather than using scan_parquet keeps reads on the filesystem flytekit is
+        # configured with, polars still pushes its projections and predicates down to the dataset
+        return pl.scan_pyarrow_dataset(open_parquet_dataset(ctx, flyte_value.uri, columns, filters))
+
+
+class PolarsDataFrameToArrowIPCEncodingHandler(StructuredDatasetEncoder):
+    def __init__(self):
+        super().__init__(pl.DataFrame, None, ARROW_IPC)
+
+    def encode(
+        self,
+        ctx: FlyteContext,
+        structured_dataset: StructuredDataset,
+        structured_dataset_type: StructuredDatasetType,
+    ) -> literals.StructuredDataset:
+        df = typing.cast(pl.DataFrame, structured_dataset.dataframe)
+        uri = write_arrow_ipc(ctx, df.to_arrow(), structured_dataset.uri)
+        structured_dataset_type.format = ARROW_IPC
+        return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
+
+
+class ArrowIPCToPolarsDataFrameDecodingHandler(StructuredDatasetDecoder):
+    def __init__(self):
+        super().__init__(pl.DataFrame, None, ARROW_IPC)
+
+    def decode(
+        self,
+        ctx: FlyteContext,
+        flyte_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+    ) -> pl.DataFrame:
+        return pl.from_arrow(read_arrow_ipc(ctx, flyte_value.uri, current_task_metadata))
+
+
+StructuredDatasetTransformerEngine.register(PolarsDataFrameToParquetEncodingHandler(), default_format_for_type=True)
+StructuredDatasetTransformerEngine.register(ParquetToPolarsDataFrameDecodingHandler(), default_format_for_type=True)
+StructuredDatasetTransformerEngine.register(PolarsLazyFrameToParquetEncodingHandler())
+StructuredDatasetTransformerEngine.register(ParquetToPolarsLazyFrameDecodingHandler())
+StructuredDatasetTransformerEngine.register(PolarsDataFrameToArrowIPCEncodingHandler())
+StructuredDatasetTransformerEngine.register(ArrowIPCToPolarsDataFrameDecodingHandler())
 StructuredDatasetTransformerEngine.register_renderer(pl.DataFrame, PolarsDataFrameRenderer())
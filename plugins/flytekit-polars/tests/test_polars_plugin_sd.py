@@ -6,7 +6,7 @@ from flytekitplugins.polars.sd_transformers import PolarsDataFrameRenderer
 from typing_extensions import Annotated
 
 from flytekit import kwtypes, task, workflow
-from flytekit.types.structured.structured_dataset import PARQUET, StructuredDataset
+from flytekit.types.structured.structured_dataset import ARROW_IPC, PARQUET, StructuredDataset
 
 subset_schema = Annotated[StructuredDataset, kwtypes(col2=str), PARQUET]
 full_schema = Annotated[StructuredDataset, PARQUET]
@@ -63,6 +63,41 @@ def test_polars_workflow_full():
     assert result is not None
 
 
+def test_polars_arrow_ipc_to_pandas():
+    @task
+    def generate() -> Annotated[StructuredDataset, ARROW_IPC]:
+        df = pl.DataFrame({"col1": [1, 3, 2], "col2": list("abc")})
+        return StructuredDataset(dataframe=df)
+
+    @task
+    def consume(df: Annotated[StructuredDataset, ARROW_IPC]) -> int:
+        df = df.open(pd.DataFrame).all()
+        assert list(df["col2"]) == list("abc")
+        return int(df["col1"].sum())
+
+    @workflow
+    def wf() -> int:
+        return consume(df=generate())
+
+    assert wf() == 6
+
+
+def test_polars_lazy_frame():
+    @task
+    def generate() -> pl.LazyFrame:
+        return pl.LazyFrame({"col1": [1, 3, 2], "col2": list("abc")}).filter(pl.col("col1") > 1)
+
+    @task
+    def consume(lf: pl.LazyFrame) -> int:
+        return lf.select(pl.col("col1").sum()).collect().item()
+
+    @workflow
+    def wf() -> int:
+        return consume(lf=generate())
+
+    assert wf() == 5
+
+
 def test_polars_renderer():
     df = pl.DataFrame({"col1": [1, 3, 2], "col2": list("abc")})
     assert PolarsDataFrameRenderer().to_html(df) == pd.DataFrame(
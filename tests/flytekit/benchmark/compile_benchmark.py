@@ -0,0 +1,119 @@
+"""
+Measures how long it takes to compile and serialize workflows as the number of their nodes grows, for a few shapes
+of workflows that are commonly generated. Run with ``make compile_benchmark`` or
+
+.. code-block::
+
+    python tests/flytekit/benchmark/compile_benchmark.py --nodes 1000 5000 10000 20000
+
+The time per node should stay roughly the same as the number of nodes grows.
+"""
+import argparse
+import gc
+import time
+import typing
+from collections import OrderedDict
+
+import flytekit.configuration
+from flytekit import task, workflow
+from flytekit.configuration import Image, ImageConfig
+from flytekit.tools.translator import get_serializable
+
+settings = flytekit.configuration.SerializationSettings(
+    project="project",
+    domain="domain",
+    version="version",
+    image_config=ImageConfig(default_image=Image(name="default", fqn="image", tag="tag")),
+    env={},
+)
+
+
+@task
+def t1(a: int) -> int:
+    return a + 1
+
+
+@task
+def t2(a: typing.List[int]) -> int:
+    return sum(a)
+
+
+@task
+def t3():
+    ...
+
+
+@workflow
+def sub_wf(a: int) -> int:
+    return t1(a=a)
+
+
+def chain(n: int) -> typing.Callable:
+    def wf(a: int) -> int:
+        x = a
+        for _ in range(n):
+            x = t1(a=x)
+        return x
+
+    return wf
+
+
+def fan_in(n: int) -> typing.Callable:
+    def wf(a: int) -> int:
+        return t2(a=[t1(a=i) for i in range(n)])
+
+    return wf
+
+
+def run_before(n: int) -> typing.Callable:
+    def wf():
+        last = t3()
+        for _ in range(n):
+            t3() >> last
+
+    return wf
+
+
+def subworkflows(n: int) -> typing.Callable:
+    def wf(a: int) -> typing.List[int]:
+        return [sub_wf(a=i) for i in range(n)]
+
+    return wf
+
+
+SHAPES = {"chain": chain, "fan_in": fan_in, "run_before": run_before, "subworkflows": subworkflows}
+
+
+def measure(shape: str, n: int) -> typing.Tuple[int, float, float]:
+    """
+    Returns the number of nodes of the workflow of ``shape`` with ``n`` calls, and the seconds it took to compile and
+    to serialize it.
+    """
+    fn = SHAPES[shape](n)
+    fn.__name__ = f"{shape}_{n}"
+    wf = workflow(fn)
+    gc.collect()
+    start = time.perf_counter()
+    wf.compile()
+    compiled = time.perf_counter()
+    get_serializable(OrderedDict(), settings, wf)
+    serialized = time.perf_counter()
+    return len(wf.nodes), compiled - start, serialized - compiled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 5000, 10000, 20000])
+    parser.add_argument("--shapes", nargs="+", choices=list(SHAPES), default=list(SHAPES))
+    args = parser.parse_args()
+
+    print(f"{'shape':<14}{'nodes':>8}{'compile (s)':>14}{'serialize (s)':>16}{'per node (us)':>16}")
+    for shape in args.shapes:
+        for n in args.nodes:
+            nodes, compile_time, serialize_time = measure(shape, n)
+            per_node = (compile_time + serialize_time) / nodes * 1e6
+            print(f"{shape:<14}{nodes:>8}{compile_time:>14.3f}{serialize_time:>16.3f}{per_node:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
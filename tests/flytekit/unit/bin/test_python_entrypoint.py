@@ -7,7 +7,7 @@ import mock
 import pytest
 from flyteidl.core.errors_pb2 import ErrorDocument
 
-from flytekit.bin.entrypoint import _dispatch_execute, normalize_inputs, setup_execution
+from flytekit.bin.entrypoint import _dispatch_execute, _prefetch_inputs, normalize_inputs, setup_execution
 from flytekit.configuration import Image, ImageConfig, SerializationSettings
 from flytekit.core import context_manager
 from flytekit.core.base_task import IgnoreOutputs
@@ -20,6 +20,8 @@ from flytekit.exceptions.scopes import system_entry_point
 from flytekit.models import literals as _literal_models
 from flytekit.models.core import errors as error_models
 from flytekit.models.core import execution as execution_models
+from flytekit.types.directory import FlyteDirectory
+from flytekit.types.file import FlyteFile
 
 
 @mock.patch("flytekit.core.utils.load_proto_from_file")
@@ -371,3 +373,39 @@ def test_env_reading(mock_os):
         assert ctx.execution_state.user_space_params.task_id.name == "task_name"
         assert ctx.execution_state.user_space_params.task_id.version == "task_ver"
         assert ctx.execution_state.user_space_params.execution_id.name == "exec_name"
+
+
+def test_prefetch_inputs():
+    with setup_execution("memory://flyte-entrypoint-prefetch/raw") as ctx:
+        mem = fsspec.filesystem("memory")
+        mem.pipe("memory://flyte-entrypoint-prefetch/in/a.txt", b"hello")
+        mem.pipe("memory://flyte-entrypoint-prefetch/in/dir/b.txt", b"world")
+        lm = TypeEngine.dict_to_literal_map(
+            ctx,
+            {
+                "f": FlyteFile("memory://flyte-entrypoint-prefetch/in/a.txt"),
+                "d": [FlyteDirectory("memory://flyte-entrypoint-prefetch/in/dir")],
+                "x": 3,
+            },
+            {"f": FlyteFile, "d": typing.List[FlyteDirectory], "x": int},
+        )
+        mem.pipe("memory://flyte-entrypoint-prefetch/inputs.pb", lm.to_flyte_idl().SerializeToString())
+
+        _prefetch_inputs(ctx, "memory://flyte-entrypoint-prefetch/inputs.pb")
+        assert ctx.file_access.is_prefetching("memory://flyte-entrypoint-prefetch/inputs.pb")
+        assert ctx.file_access.is_prefetching("memory://flyte-entrypoint-prefetch/in/a.txt")
+        assert ctx.file_access.is_prefetching("memory://flyte-entrypoint-prefetch/in/dir")
+
+        ff = TypeEngine.to_python_value(ctx, lm.literals["f"], FlyteFile)
+        with open(ff, "r") as fh:
+            assert fh.read() == "hello"
+        assert not ctx.file_access.is_prefetching("memory://flyte-entrypoint-prefetch/in/a.txt")
+
+        ctx.file_access.cancel_prefetches()
+        assert not ctx.file_access.is_prefetching("memory://flyte-entrypoint-prefetch/in/dir")
+
+
+def test_prefetch_inputs_missing():
+    with setup_execution("memory://flyte-entrypoint-prefetch/raw") as ctx:
+        # Errors are only logged, they are raised when the inputs are actually read
+        _prefetch_inputs(ctx, "memory://flyte-entrypoint-prefetch/missing.pb")
@@ -1,15 +1,21 @@
 import functools
+import os
 import typing
 from collections import OrderedDict
 from typing import List
 
+import mock
 import pytest
 
 from flytekit import map_task, task, workflow
 from flytekit.configuration import FastSerializationSettings, Image, ImageConfig, SerializationSettings
+from flytekit.core import utils
 from flytekit.core.array_node_map_task import ArrayNodeMapTask, ArrayNodeMapTaskResolver
+from flytekit.core.context_manager import ExecutionState, FlyteContextManager
 from flytekit.core.task import TaskMetadata
+from flytekit.core.type_engine import TypeEngine
 from flytekit.tools.translator import get_serializable
+from flytekit.types.file import FlyteFile
 
 
 @pytest.fixture
@@ -293,6 +299,159 @@ def test_raw_execute_with_min_success_ratio(min_success_ratio, should_raise_erro
         assert my_wf1() == [1, None, 3, 4]
 
 
+def test_local_map_executor_default_keeps_side_effects():
+    calls = []
+
+    @task
+    def record(a: int) -> int:
+        calls.append(a)
+        return a
+
+    assert map_task(record)(a=[1, 2, 3]) == [1, 2, 3]
+    # Instances run in the current process unless another executor is configured
+    assert calls == [1, 2, 3]
+
+
+@pytest.mark.parametrize("executor", ["process", "thread", "serial"])
+def test_local_map_executor(executor, monkeypatch):
+    monkeypatch.setenv("FLYTE_LOCAL_MAP_EXECUTOR", executor)
+
+    @task
+    def pid_task(a: int, delay: float) -> str:
+        import os
+        import time
+
+        # Later instances finish first, the outputs still have to come back in order
+        time.sleep(delay * (4 - a))
+        return f"{a}-{os.getpid()}"
+
+    @task
+    def failing_task(a: int) -> int:
+        if a == 2:
+            raise ValueError("Unexpected input: 2")
+        return a
+
+    outputs = map_task(functools.partial(pid_task, delay=0.05), concurrency=4)(a=[0, 1, 2, 3])
+    assert [o.split("-")[0] for o in outputs] == ["0", "1", "2", "3"]
+    pids = {int(o.split("-")[1]) for o in outputs}
+    if executor == "process":
+        assert os.getpid() not in pids
+    else:
+        assert pids == {os.getpid()}
+
+    assert map_task(failing_task, min_success_ratio=0.5)(a=[1, 2, 3, 4]) == [1, None, 3, 4]
+    with pytest.raises(ValueError):
+        map_task(failing_task)(a=[1, 2, 3, 4])
+
+
+def test_local_map_executor_unknown(monkeypatch):
+    monkeypatch.setenv("FLYTE_LOCAL_MAP_EXECUTOR", "gpu")
+
+    @task
+    def my_task(a: int) -> int:
+        return a
+
+    with pytest.raises(ValueError, match="Unsupported local map executor"):
+        map_task(my_task)(a=[1, 2])
+
+
+@pytest.mark.parametrize("read_inputs", [False, True])
+def test_dispatch_execute_sliced_inputs(read_inputs, monkeypatch):
+    @task
+    def t(a: int, f: FlyteFile) -> int:
+        return a + 1
+
+    mt = map_task(functools.partial(t, f=FlyteFile("s3://bucket/model.bin")))
+    ctx = FlyteContextManager.current_context()
+    literal_map = TypeEngine.dict_to_literal_map(
+        ctx, {"a": [0, 1, 2, 3, 4], "f": FlyteFile("s3://bucket/model.bin")}, mt.python_interface.inputs
+    )
+
+    monkeypatch.setenv("BATCH_JOB_ARRAY_INDEX_VAR_NAME", "ARRAY_INDEX")
+    monkeypatch.setenv("ARRAY_INDEX", "2")
+    es = ctx.execution_state.with_params(mode=ExecutionState.Mode.TASK_EXECUTION)
+    with FlyteContextManager.with_context(ctx.with_execution_state(es)) as exec_ctx:
+        if read_inputs:
+            # The inputs file is read the way the entrypoint of an array job reads it
+            inputs_file = os.path.join(exec_ctx.file_access.get_random_local_directory(), "inputs.pb")
+            utils.write_proto_to_file(literal_map.to_flyte_idl(), inputs_file)
+            literal_map = mt.read_inputs(inputs_file)
+            assert len(literal_map.literals["a"].collection.literals) == 1
+        with mock.patch.object(exec_ctx.file_access, "share_data") as share_data:
+            with mock.patch.object(TypeEngine, "to_python_value", wraps=TypeEngine.to_python_value) as to_python:
+                outputs = mt.dispatch_execute(exec_ctx, literal_map)
+    share_data.assert_called_once_with("s3://bucket/model.bin")
+    # Only the elements of this job are converted
+    converted = [call.args[1] for call in to_python.call_args_list if call.args[1].collection]
+    assert [len(lv.collection.literals) for lv in converted] == [1]
+    assert outputs.literals["o0"].scalar.primitive.integer == 3
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_pipelined_map_tasks(executor, monkeypatch):
+    monkeypatch.setenv("FLYTE_LOCAL_PIPELINE_MAP_TASKS", "true")
+    monkeypatch.setenv("FLYTE_LOCAL_MAP_EXECUTOR", executor)
+
+    @task
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    @task
+    def to_str(a: int, prefix: str) -> str:
+        if a == 3:
+            raise ValueError("Unexpected input: 3")
+        return f"{prefix}{a}"
+
+    @task
+    def length(s: typing.Optional[str]) -> int:
+        return len(s or "")
+
+    @workflow
+    def wf(
+        x: typing.List[int],
+    ) -> typing.Tuple[typing.List[int], typing.List[typing.Optional[str]], typing.List[typing.Optional[int]]]:
+        y = map_task(functools.partial(add, b=1))(a=x)
+        z = map_task(functools.partial(to_str, prefix="n"), min_success_ratio=0.5)(a=y)
+        return y, z, map_task(length, min_success_ratio=0.5)(s=z)
+
+    # The element that failed in the second stage is not run through the third one
+    assert wf(x=[0, 1, 2, 3]) == ([1, 2, 3, 4], ["n1", "n2", None, "n4"], [2, 2, None, 2])
+
+    @workflow
+    def failing_wf(x: typing.List[int]) -> typing.List[str]:
+        return map_task(functools.partial(to_str, prefix="n"))(a=map_task(functools.partial(add, b=1))(a=x))
+
+    with pytest.raises(ValueError, match="Unexpected input: 3"):
+        failing_wf(x=[0, 1, 2, 3])
+
+
+def test_pipelined_map_tasks_overlap(monkeypatch):
+    monkeypatch.setenv("FLYTE_LOCAL_PIPELINE_MAP_TASKS", "true")
+    monkeypatch.setenv("FLYTE_LOCAL_MAP_EXECUTOR", "thread")
+    import threading
+
+    first_done = threading.Event()
+
+    @task
+    def slow(a: int) -> int:
+        # The last element of the first stage waits for the first element of the second stage
+        if a == 1:
+            assert first_done.wait(10)
+        return a
+
+    @task
+    def fast(a: int) -> int:
+        if a == 0:
+            first_done.set()
+        return a * 10
+
+    @workflow
+    def wf(x: typing.List[int]) -> typing.List[int]:
+        return map_task(fast, concurrency=2)(a=map_task(slow, concurrency=2)(a=x))
+
+    assert wf(x=[0, 1]) == [0, 10]
+
+
 def test_map_task_override(serialization_settings):
     @task
     def my_mappable_task(a: int) -> typing.Optional[str]:
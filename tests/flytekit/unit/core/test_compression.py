@@ -0,0 +1,77 @@
+import io
+import os
+import tempfile
+import typing
+from importlib.util import find_spec
+
+import pytest
+from typing_extensions import Annotated
+
+from flytekit.core.compression import (
+    COMPRESSION_METADATA_KEY,
+    Compression,
+    compress_file,
+    decompress_file,
+    get_codec,
+    get_compression,
+)
+from flytekit.core.context_manager import FlyteContextManager
+from flytekit.core.type_engine import TypeEngine
+
+codecs = [
+    "gzip",
+    pytest.param("zstd", marks=pytest.mark.skipif(find_spec("zstandard") is None, reason="zstandard not installed")),
+]
+
+
+def test_compression_annotation():
+    assert get_compression(Annotated[typing.TextIO, Compression("gzip")]).codec == "gzip"
+    assert get_compression(typing.TextIO) is None
+    with pytest.raises(ValueError):
+        Compression("lz4")
+
+
+def test_get_codec():
+    assert get_codec(typing.TextIO) is None
+    assert get_codec(Annotated[typing.TextIO, Compression("gzip")]) == "gzip"
+
+
+@pytest.mark.parametrize("codec", codecs)
+def test_compress_file(codec):
+    with tempfile.TemporaryDirectory() as d:
+        src = os.path.join(d, "src")
+        with open(src, "w") as f:
+            f.write("hello world\n" * 1000)
+        compress_file(src, os.path.join(d, "c1"), codec)
+        compress_file(src, os.path.join(d, "c2"), codec)
+        assert os.path.getsize(os.path.join(d, "c1")) < os.path.getsize(src)
+        # The same contents always compress to the same bytes
+        with open(os.path.join(d, "c1"), "rb") as f1, open(os.path.join(d, "c2"), "rb") as f2:
+            assert f1.read() == f2.read()
+        decompress_file(os.path.join(d, "c1"), os.path.join(d, "out"), codec)
+        with open(os.path.join(d, "out")) as f:
+            assert f.read() == "hello world\n" * 1000
+
+
+@pytest.mark.parametrize("codec", codecs)
+def test_file_like_compression(codec):
+    ctx = FlyteContextManager.current_context()
+
+    text_type = Annotated[typing.TextIO, Compression(codec)]
+    lt = TypeEngine.to_literal_type(text_type)
+    lv = TypeEngine.to_literal(ctx, io.StringIO("hello world\n" * 100), text_type, lt)
+    assert lv.metadata[COMPRESSION_METADATA_KEY] == codec
+    with TypeEngine.to_python_value(ctx, lv, typing.TextIO) as fh:
+        assert fh.read() == "hello world\n" * 100
+
+    binary_type = Annotated[typing.BinaryIO, Compression(codec)]
+    lt = TypeEngine.to_literal_type(binary_type)
+    lv = TypeEngine.to_literal(ctx, io.BytesIO(b"\x00\x01" * 100), binary_type, lt)
+    assert lv.metadata[COMPRESSION_METADATA_KEY] == codec
+    with TypeEngine.to_python_value(ctx, lv, typing.BinaryIO) as fh:
+        assert fh.read() == b"\x00\x01" * 100
+
+    lv = TypeEngine.to_literal(ctx, io.BytesIO(b"raw"), typing.BinaryIO, lt)
+    assert not lv.metadata
+    with TypeEngine.to_python_value(ctx, lv, typing.BinaryIO) as fh:
+        assert fh.read() == b"raw"
@@ -1,3 +1,4 @@
+import hashlib
 import io
 import os
 import pathlib
@@ -5,12 +6,14 @@ import random
 import string
 import sys
 import tempfile
+import threading
 
 import mock
 import pytest
 from azure.identity import ClientSecretCredential, DefaultAzureCredential
 
 from flytekit.core.data_persistence import FileAccessProvider
+from flytekit.exceptions.user import FlyteAssertion
 
 
 def test_get_manual_random_remote_path():
@@ -170,3 +173,146 @@ def test_initialise_azure_file_provider_with_default_credential():
         fp = FileAccessProvider("/tmp", "abfs://container/path/within/container")
         assert fp.get_filesystem().account_name == "accountname"
         assert isinstance(fp.get_filesystem().sync_credential, DefaultAzureCredential)
+
+
+def test_prefetch_data():
+    random_dir = tempfile.mkdtemp()
+    fs = FileAccessProvider(local_sandbox_dir=random_dir, raw_output_prefix="memory://flyte-prefetch-test/raw")
+    mem = fs.get_filesystem("memory")
+    mem.pipe("memory://flyte-prefetch-test/a.txt", b"hello")
+    mem.pipe("memory://flyte-prefetch-test/dir/b.txt", b"world")
+
+    fs.prefetch_data("memory://flyte-prefetch-test/a.txt").result()
+    fs.prefetch_data("memory://flyte-prefetch-test/dir", is_multipart=True).result()
+    assert fs.is_prefetching("memory://flyte-prefetch-test/a.txt")
+
+    with mock.patch.object(FileAccessProvider, "get") as mock_get:
+        local_file = os.path.join(random_dir, "out", "a.txt")
+        fs.get_data("memory://flyte-prefetch-test/a.txt", local_file)
+        local_dir = fs.get_random_local_directory()
+        # The prefetched data is merged into a directory that is not empty
+        with open(os.path.join(local_dir, "c.txt"), "w") as f:
+            f.write("existing")
+        fs.get_data("memory://flyte-prefetch-test/dir", local_dir, is_multipart=True)
+        mock_get.assert_not_called()
+
+    with open(local_file) as f:
+        assert f.read() == "hello"
+    assert sorted(os.listdir(local_dir)) == ["b.txt", "c.txt"]
+    with open(os.path.join(local_dir, "b.txt")) as f:
+        assert f.read() == "world"
+
+    # A prefetch is only used once, later calls download again
+    assert not fs.is_prefetching("memory://flyte-prefetch-test/a.txt")
+    other_file = os.path.join(random_dir, "other", "a.txt")
+    fs.get_data("memory://flyte-prefetch-test/a.txt", other_file)
+    with open(other_file) as f:
+        assert f.read() == "hello"
+
+
+def test_prefetch_does_not_block_exit():
+    random_dir = tempfile.mkdtemp()
+    fs = FileAccessProvider(local_sandbox_dir=random_dir, raw_output_prefix="memory://flyte-prefetch-test/raw")
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_get(*args, **kwargs):
+        started.set()
+        release.wait()
+
+    with mock.patch.object(FileAccessProvider, "get", side_effect=slow_get):
+        running = fs.prefetch_data("memory://flyte-prefetch-test/large")
+        started.wait()
+        fs.cancel_prefetches()
+        # Running downloads are not waited for at interpreter exit
+        assert all(t.daemon for t in threading.enumerate() if t.name.startswith("flyte-prefetch"))
+        assert not running.done()
+        release.set()
+        running.result()
+
+
+def test_prefetch_data_failure():
+    random_dir = tempfile.mkdtemp()
+    fs = FileAccessProvider(local_sandbox_dir=random_dir, raw_output_prefix="memory://flyte-prefetch-test/raw")
+    fs.prefetch_data("memory://flyte-prefetch-test/does-not-exist").exception()
+    with pytest.raises(FlyteAssertion):
+        fs.get_data("memory://flyte-prefetch-test/does-not-exist", os.path.join(random_dir, "x"))
+
+
+def test_pooled_filesystems_and_streams():
+    from flytekit.configuration import DataConfig
+
+    fp = FileAccessProvider(
+        tempfile.mkdtemp(), "s3://my-bucket", data_config=DataConfig(block_size=8 * 1024 * 1024, max_concurrency=4)
+    )
+    s3 = fp.get_filesystem("s3")
+    assert fp.get_filesystem_for_path("s3://my-bucket/a") is s3
+    assert fp.get_filesystem("s3", anonymous=True) is not s3
+    assert s3.default_block_size == 8 * 1024 * 1024
+    assert s3.max_concurrency == 4
+
+    path = os.path.join(fp.get_random_local_directory(), "a", "b.txt")
+    with fp.open(path, "wb") as f:
+        f.write(b"hello")
+    with fp.open(path, "rb") as f:
+        assert f.read() == b"hello"
+
+
+def test_shared_data():
+    from flytekit.configuration import DataConfig
+
+    shared_dir = tempfile.mkdtemp()
+    mem_prefix = "memory://flyte-shared-test"
+    providers = [
+        FileAccessProvider(tempfile.mkdtemp(), f"{mem_prefix}/raw", data_config=DataConfig(shared_cache_dir=shared_dir))
+        for _ in range(2)
+    ]
+    mem = providers[0].get_filesystem("memory")
+    mem.pipe(f"{mem_prefix}/model.bin", b"weights")
+    mem.pipe(f"{mem_prefix}/dir/b.txt", b"world")
+    for fp in providers:
+        fp.share_data(f"{mem_prefix}/model.bin")
+        fp.share_data(f"{mem_prefix}/dir")
+
+    local_file = os.path.join(providers[0].get_random_local_directory(), "model.bin")
+    providers[0].get_data(f"{mem_prefix}/model.bin", local_file)
+    local_dir = providers[0].get_random_local_directory()
+    providers[0].get_data(f"{mem_prefix}/dir", local_dir, is_multipart=True)
+
+    # Another task on the same node does not download the data again
+    with mock.patch.object(FileAccessProvider, "get") as mock_get:
+        other_file = os.path.join(providers[1].get_random_local_directory(), "model.bin")
+        providers[1].get_data(f"{mem_prefix}/model.bin", other_file)
+        mock_get.assert_not_called()
+
+    for path in (local_file, other_file):
+        with open(path) as f:
+            assert f.read() == "weights"
+    with open(os.path.join(local_dir, "b.txt")) as f:
+        assert f.read() == "world"
+
+    # A task modifying its inputs does not affect the other tasks
+    with open(other_file, "w") as f:
+        f.write("modified")
+    with open(os.path.join(local_dir, "b.txt"), "w") as f:
+        f.write("modified")
+    with open(local_file) as f:
+        assert f.read() == "weights"
+    other_dir = providers[1].get_random_local_directory()
+    providers[1].get_data(f"{mem_prefix}/dir", other_dir, is_multipart=True)
+    with open(os.path.join(other_dir, "b.txt")) as f:
+        assert f.read() == "world"
+
+    # Replaced data is downloaded again, and its old copy removed
+    mem.pipe(f"{mem_prefix}/model.bin", b"new weights")
+    new_file = os.path.join(providers[1].get_random_local_directory(), "model.bin")
+    providers[1].get_data(f"{mem_prefix}/model.bin", new_file)
+    with open(new_file) as f:
+        assert f.read() == "new weights"
+    model_dir = os.path.join(shared_dir, hashlib.sha256(f"{mem_prefix}/model.bin".encode("utf-8")).hexdigest())
+    assert len(os.listdir(model_dir)) == 2
+
+    # Data that is not shared is downloaded as usual
+    unshared = os.path.join(providers[0].get_random_local_directory(), "b.txt")
+    providers[0].get_data(f"{mem_prefix}/dir/b.txt", unshared)
+    assert not os.path.islink(unshared)
@@ -1,5 +1,6 @@
 import typing
 from collections import OrderedDict
+from dataclasses import dataclass
 
 import pytest
 
@@ -9,6 +10,7 @@ from flytekit.configuration import FastSerializationSettings, Image, ImageConfig
 from flytekit.core import context_manager
 from flytekit.core.context_manager import ExecutionState
 from flytekit.core.node_creation import create_node
+from flytekit.core.python_function_task import PythonFunctionTask
 from flytekit.core.resources import Resources
 from flytekit.core.task import task
 from flytekit.core.type_engine import TypeEngine
@@ -290,3 +292,82 @@ def test_node_dependency_hints_are_serialized():
     serialised_entities_iterator = iter(entity_mapping.values())
     assert "t1" in next(serialised_entities_iterator).template.id.name
     assert "t2" in next(serialised_entities_iterator).template.id.name
+
+
+def test_dynamic_node_templates_are_reused():
+    @task
+    def t1(a: int) -> int:
+        return a + 2
+
+    @dynamic
+    def dt(a: int) -> typing.List[int]:
+        s = [t1(a=i) for i in range(a)]
+        s.append(t1(a=a).with_overrides(requests=Resources(cpu="2")))
+        return s
+
+    @dynamic
+    def dt2(a: int) -> typing.List[int]:
+        return [t1(a=t1(a=a))]
+
+    with context_manager.FlyteContextManager.with_context(
+        context_manager.FlyteContextManager.current_context().with_serialization_settings(settings)
+    ) as ctx:
+        with context_manager.FlyteContextManager.with_context(
+            ctx.with_execution_state(ctx.execution_state.with_params(mode=ExecutionState.Mode.TASK_EXECUTION))
+        ) as ctx:
+            input_literal_map = TypeEngine.dict_to_literal_map(ctx, {"a": 3})
+            spec = dt.dispatch_execute(ctx, input_literal_map)
+            spec2 = dt2.dispatch_execute(ctx, input_literal_map)
+
+    nodes = spec.nodes
+    assert [n.id for n in nodes] == ["dn0", "dn1", "dn2", "dn3"]
+    assert [n.inputs[0].binding.scalar.primitive.integer for n in nodes] == [0, 1, 2, 3]
+    # Nodes of the same structure share everything but their ids, upstream nodes and inputs
+    assert nodes[0].task_node is nodes[1].task_node is nodes[2].task_node
+    assert nodes[3].task_node is not nodes[0].task_node
+    assert nodes[3].task_node.overrides.resources.requests[0].value == "2"
+    assert len(spec.tasks) == 1
+
+    # Also across dynamic workflows
+    assert spec2.nodes[0].task_node is nodes[0].task_node
+    assert spec2.nodes[1].upstream_node_ids == ["dn0"]
+    assert spec2.nodes[1].inputs[0].binding.promise.node_id == "dn0"
+    assert spec2.tasks[0] == spec.tasks[0]
+
+
+def test_dynamic_node_templates_task_config_override():
+    @dataclass
+    class Config(object):
+        n: int
+
+    class ConfigTask(PythonFunctionTask[Config]):
+        def get_custom(self, settings: flytekit.configuration.SerializationSettings) -> typing.Dict[str, typing.Any]:
+            return {"n": self.task_config.n}
+
+    def f(a: int) -> int:
+        return a
+
+    t1 = ConfigTask(task_config=Config(n=1), task_function=f)
+
+    @dynamic
+    def dt(a: int) -> int:
+        return t1(a=a)
+
+    @dynamic
+    def dt2(a: int) -> int:
+        return t1(a=a).with_overrides(task_config=Config(n=2))
+
+    with context_manager.FlyteContextManager.with_context(
+        context_manager.FlyteContextManager.current_context().with_serialization_settings(settings)
+    ) as ctx:
+        with context_manager.FlyteContextManager.with_context(
+            ctx.with_execution_state(ctx.execution_state.with_params(mode=ExecutionState.Mode.TASK_EXECUTION))
+        ) as ctx:
+            input_literal_map = TypeEngine.dict_to_literal_map(ctx, {"a": 3})
+            spec = dt.dispatch_execute(ctx, input_literal_map)
+            spec2 = dt2.dispatch_execute(ctx, input_literal_map)
+
+    # The node is reused, but the task is serialized with the config it was overridden with
+    assert spec2.nodes[0].task_node is spec.nodes[0].task_node
+    assert spec.tasks[0].custom == {"n": 1}
+    assert spec2.tasks[0].custom == {"n": 2}
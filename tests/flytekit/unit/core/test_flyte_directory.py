@@ -7,6 +7,7 @@ from unittest.mock import MagicMock
 
 import mock
 import pytest
+import typing_extensions
 
 import flytekit.configuration
 from flytekit.configuration import Image, ImageConfig
@@ -20,7 +21,13 @@ from flytekit.core.workflow import workflow
 from flytekit.exceptions.user import FlyteAssertion
 from flytekit.models.core.types import BlobType
 from flytekit.models.literals import LiteralMap
-from flytekit.types.directory.types import FlyteDirectory, FlyteDirToMultipartBlobTransformer
+from flytekit.types.directory.types import (
+    MANIFEST_FILE_NAME,
+    MANIFEST_METADATA_KEY,
+    DirectoryManifest,
+    FlyteDirectory,
+    FlyteDirToMultipartBlobTransformer,
+)
 
 
 # Fixture that ensures a dummy local file
@@ -314,3 +321,57 @@ def test_list_dir(mock_get_data, mock_lsdir):
 
     with pytest.raises(Exception):
         open(paths[0], "r")
+
+
+def test_directory_manifest():
+    random_dir = context_manager.FlyteContext.current_context().file_access.get_random_local_directory()
+    fs = FileAccessProvider(local_sandbox_dir=random_dir, raw_output_prefix="memory://flyte-manifest-test/")
+    ctx = context_manager.FlyteContext.current_context()
+    with context_manager.FlyteContextManager.with_context(ctx.with_file_access(fs)) as ctx:
+        p = tempfile.mkdtemp(prefix="temp_example_")
+        os.makedirs(os.path.join(p, "sub", "deeper"))
+        for rel in ("a.txt", "sub/b.txt", "sub/deeper/c.txt"):
+            with open(os.path.join(p, *rel.split("/")), "w") as fh:
+                fh.write(f"content of {rel}")
+
+        tf = FlyteDirToMultipartBlobTransformer()
+        annotated = typing_extensions.Annotated[FlyteDirectory, DirectoryManifest()]
+        lt = tf.get_literal_type(FlyteDirectory)
+        lit = tf.to_literal(ctx, p, annotated, lt)
+        manifest_uri = lit.metadata[MANIFEST_METADATA_KEY]
+        assert manifest_uri.endswith(MANIFEST_FILE_NAME)
+
+        # Without the annotation no manifest is written
+        assert tf.to_literal(ctx, p, FlyteDirectory, lt).metadata is None
+
+        fd = tf.to_python_value(ctx, lit, FlyteDirectory)
+        assert fd.manifest_uri == manifest_uri
+
+        with mock.patch("fsspec.implementations.memory.MemoryFileSystem.walk") as mock_walk, mock.patch(
+            "fsspec.implementations.memory.MemoryFileSystem.ls"
+        ) as mock_ls:
+            mock_walk.side_effect = Exception("Should not list the remote directory")
+            mock_ls.side_effect = Exception("Should not list the remote directory")
+
+            assert sorted(f for _, f in fd.crawl()) == ["a.txt", "sub/b.txt", "sub/deeper/c.txt"]
+            assert [f for _, f in fd.crawl(maxdepth=1)] == ["a.txt"]
+            details = dict(d for _, x in fd.crawl(detail=True) for d in x.items())
+            assert details["sub/b.txt"]["size"] == len("content of sub/b.txt")
+            assert details["sub/b.txt"]["checksum"] is not None
+
+            entities = FlyteDirectory.listdir(fd)
+            assert len(entities) == 2
+            sub = [e for e in entities if isinstance(e, FlyteDirectory)][0]
+            assert sub.remote_source.endswith("sub")
+            assert sorted(f for _, f in sub.crawl()) == ["b.txt", "deeper/c.txt"]
+            with open(os.path.join(sub.download(), "deeper", "c.txt")) as fh:
+                assert fh.read() == "content of sub/deeper/c.txt"
+
+            local = fd.download()
+            with open(os.path.join(local, "sub", "deeper", "c.txt")) as fh:
+                assert fh.read() == "content of sub/deeper/c.txt"
+            assert not os.path.exists(os.path.join(local, MANIFEST_FILE_NAME))
+
+        # The manifest is carried along when the directory is passed on
+        lit2 = tf.to_literal(ctx, fd, FlyteDirectory, lt)
+        assert lit2.metadata[MANIFEST_METADATA_KEY] == manifest_uri
@@ -1,25 +1,30 @@
+import hashlib
 import os
 import pathlib
 import tempfile
 import typing
+from dataclasses import dataclass
 from unittest.mock import MagicMock, patch
 
+import fsspec
 import pytest
+from mashumaro.mixins.json import DataClassJSONMixin
 from typing_extensions import Annotated
 
 import flytekit.configuration
 from flytekit.configuration import Config, Image, ImageConfig
+from flytekit.core.compression import COMPRESSION_METADATA_KEY, Compression
 from flytekit.core.context_manager import ExecutionState, FlyteContextManager
 from flytekit.core.data_persistence import FileAccessProvider, flyte_tmp_dir
 from flytekit.core.dynamic_workflow_task import dynamic
 from flytekit.core.hash import HashMethod
 from flytekit.core.launch_plan import LaunchPlan
 from flytekit.core.task import task
-from flytekit.core.type_engine import TypeEngine
+from flytekit.core.type_engine import TypeEngine, TypeTransformerFailedError
 from flytekit.core.workflow import workflow
 from flytekit.models.core.types import BlobType
 from flytekit.models.literals import LiteralMap
-from flytekit.types.file.file import FlyteFile, FlyteFilePathTransformer
+from flytekit.types.file.file import ContentAddressed, FlyteFile, FlyteFilePathTransformer, StreamingRead
 
 
 # Fixture that ensures a dummy local file
@@ -593,6 +598,101 @@ def test_flyte_file_annotated_hashmethod(local_dummy_file):
     wf(path=local_dummy_file)
 
 
+def test_flyte_file_content_addressed(local_dummy_file):
+    store = tempfile.mkdtemp(prefix="flyte-cas-")
+    ctx = FlyteContextManager.current_context()
+    tf = FlyteFilePathTransformer()
+    lt = tf.get_literal_type(FlyteFile)
+    cas_type = Annotated[FlyteFile, ContentAddressed(store=store)]
+
+    lit = tf.to_literal(ctx, local_dummy_file, cas_type, lt)
+    digest = hashlib.sha256(b"Hello world").hexdigest()
+    assert lit.hash == f"sha256:{digest}"
+    assert lit.scalar.blob.uri == os.path.join(store, "sha256", digest, os.path.basename(local_dummy_file))
+    with open(lit.scalar.blob.uri) as fh:
+        assert fh.read() == "Hello world"
+
+    # The same contents again are not re-uploaded
+    with patch.object(FileAccessProvider, "put_data") as mock_put:
+        lit2 = tf.to_literal(ctx, FlyteFile(local_dummy_file), cas_type, lt)
+        mock_put.assert_not_called()
+    assert lit2.scalar.blob.uri == lit.scalar.blob.uri
+    assert lit2.hash == lit.hash
+
+    # Without the annotation a random path is used
+    lit3 = tf.to_literal(ctx, local_dummy_file, FlyteFile, lt)
+    assert lit3.hash is None
+    assert not lit3.scalar.blob.uri.startswith(store)
+
+    with pytest.raises(ValueError):
+        ContentAddressed(algorithm="not-a-hash")
+
+
+def test_flyte_file_streaming_read():
+    ctx = FlyteContextManager.current_context()
+    fs = fsspec.filesystem("memory")
+    uri = "memory://flyte-streaming-test/data.bin"
+    fs.pipe(uri, bytes(range(256)) * 4)
+
+    tf = FlyteFilePathTransformer()
+    lit = tf.to_literal(ctx, FlyteFile(uri), FlyteFile, tf.get_literal_type(FlyteFile))
+    streaming_type = Annotated[FlyteFile, StreamingRead(cache_type="blockcache", block_size=64)]
+    ff = tf.to_python_value(ctx, lit, streaming_type)
+
+    with patch("fsspec.implementations.memory.MemoryFileSystem.open", wraps=fs.open) as mock_open:
+        with ff.open("rb") as r:
+            r.seek(-4, 2)
+            assert r.read() == bytes([252, 253, 254, 255])
+        mock_open.assert_called_with(uri, "rb", cache_type="blockcache", cache_options=None, block_size=64)
+
+    assert ff.read_range(1, 4) == bytes([1, 2, 3])
+    assert ff.read_range(-2, None) == bytes([254, 255])
+    local_path = ff.download_range(0, 16)
+    with open(local_path, "rb") as fh:
+        assert fh.read() == bytes(range(16))
+    assert not ff.downloaded
+
+
+def test_flyte_file_compression(local_dummy_file):
+    ctx = FlyteContextManager.current_context()
+    tf = FlyteFilePathTransformer()
+    compressed_type = Annotated[FlyteFile, Compression("gzip")]
+    lit = tf.to_literal(ctx, FlyteFile(local_dummy_file), compressed_type, tf.get_literal_type(FlyteFile))
+    assert lit.metadata[COMPRESSION_METADATA_KEY] == "gzip"
+    assert lit.scalar.blob.uri.endswith(".gz")
+    with open(lit.scalar.blob.uri, "rb") as fh:
+        assert fh.read(2) == b"\x1f\x8b"
+
+    ff = tf.to_python_value(ctx, lit, FlyteFile)
+    with ff.open("r") as r:
+        assert r.read() == "Hello world"
+    with pytest.raises(ValueError):
+        ff.read_range(0, 2)
+    with open(ff, "r") as fh:
+        assert fh.read() == "Hello world"
+    assert not ff.path.endswith(".gz")
+
+    # Passing the file on keeps the codec
+    assert tf.to_literal(ctx, ff, FlyteFile, tf.get_literal_type(FlyteFile)).metadata == lit.metadata
+
+    # A compressed file cannot be put in a dataclass, whose JSON only keeps the path
+    @dataclass
+    class DC(DataClassJSONMixin):
+        f: FlyteFile
+
+    with pytest.raises(TypeTransformerFailedError, match="cannot be stored in a dataclass"):
+        TypeEngine.to_literal(ctx, DC(f=ff), DC, TypeEngine.to_literal_type(DC))
+
+    # Files uploaded to a path of the user's choice are not compressed
+    remote_path = os.path.join(tempfile.mkdtemp(), "explicit.txt")
+    lit = tf.to_literal(
+        ctx, FlyteFile(local_dummy_file, remote_path=remote_path), compressed_type, tf.get_literal_type(FlyteFile)
+    )
+    assert not lit.metadata
+    with open(lit.scalar.blob.uri) as fh:
+        assert fh.read() == "Hello world"
+
+
 @pytest.mark.sandbox_test
 def test_file_open_things():
     @task
@@ -0,0 +1,48 @@
+import io
+import typing
+
+import pytest
+from flyteidl.core import literals_pb2
+
+from flytekit.core.context_manager import FlyteContextManager
+from flytekit.core.literal_slicing import read_sliced_literal_map
+from flytekit.core.type_engine import TypeEngine
+
+
+@pytest.fixture
+def literal_map_bytes():
+    ctx = FlyteContextManager.current_context()
+    lm = TypeEngine.dict_to_literal_map(
+        ctx,
+        {
+            "a": list(range(300)),
+            "b": [{"x": [i] * i} for i in range(300)],
+            "c": 7,
+            "d": ["bound", "list"],
+        },
+        {
+            "a": typing.List[int],
+            "b": typing.List[typing.Dict[str, typing.List[int]]],
+            "c": int,
+            "d": typing.List[str],
+        },
+    )
+    return lm.to_flyte_idl().SerializeToString()
+
+
+@pytest.mark.parametrize("start, end", [(0, 1), (5, 6), (100, 110), (299, 300), (295, 310)])
+def test_read_sliced_literal_map(literal_map_bytes, start, end):
+    full = literals_pb2.LiteralMap()
+    full.ParseFromString(literal_map_bytes)
+
+    sliced = read_sliced_literal_map(io.BytesIO(literal_map_bytes), lambda k: k in ("a", "b", "c"), start, end)
+    assert set(sliced.literals) == {"a", "b", "c", "d"}
+    for k in ("a", "b"):
+        assert list(sliced.literals[k].collection.literals) == list(full.literals[k].collection.literals[start:end])
+    # Literals that are not collections and those that are not sliced are read as they are
+    assert sliced.literals["c"] == full.literals["c"]
+    assert sliced.literals["d"] == full.literals["d"]
+
+
+def test_read_sliced_literal_map_empty():
+    assert read_sliced_literal_map(io.BytesIO(b""), lambda k: True, 0, 1) == literals_pb2.LiteralMap()
@@ -0,0 +1,119 @@
+import sys
+
+import pytest
+
+from flytekit import Resources, task
+from flytekit.core.array_node_map_task import map_task
+from flytekit.core.local_resources import (
+    LocalCapacity,
+    TaskResources,
+    memory_limit,
+    parse_cpu,
+    parse_memory,
+    task_resources,
+)
+from flytekit.models import task as task_models
+
+
+@pytest.mark.parametrize("value, expected", [("2", 2.0), ("500m", 0.5), ("0.25", 0.25)])
+def test_parse_cpu(value, expected):
+    assert parse_cpu(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected", [("2048", 2048), ("500M", 500 * 1000**2), ("2Gi", 2 * 1024**3), ("1.5Ki", 1536)]
+)
+def test_parse_memory(value, expected):
+    assert parse_memory(value) == expected
+
+
+def test_parse_invalid():
+    with pytest.raises(ValueError):
+        parse_cpu("1Gi")
+    with pytest.raises(ValueError):
+        parse_memory("1Xi")
+
+
+def test_task_resources():
+    @task(requests=Resources(cpu="500m"), limits=Resources(mem="1Gi"))
+    def t1(a: int) -> int:
+        return a
+
+    r = TaskResources(cpu=0.5, mem=1024**3, mem_limit=1024**3)
+    assert task_resources(t1) == r
+    assert task_resources(map_task(t1)) == r
+
+    overrides = task_models.Resources(
+        requests=[task_models.Resources.ResourceEntry(task_models.Resources.ResourceName.CPU, "2")], limits=[]
+    )
+    assert task_resources(t1, overrides) == TaskResources(cpu=2.0)
+
+
+def test_local_capacity():
+    capacity = LocalCapacity(cpu=2, mem=1000)
+    r = TaskResources(cpu=1, mem=400)
+    assert capacity.max_concurrent(r) == 2
+    assert capacity.max_concurrent(TaskResources()) is None
+    assert capacity.try_acquire(r)
+    assert capacity.try_acquire(r)
+    assert not capacity.try_acquire(r)
+    capacity.release(r)
+    assert capacity.try_acquire(r)
+    capacity.release(r)
+    capacity.release(r)
+
+    # A task that does not fit at all still runs on its own
+    big = TaskResources(cpu=4)
+    assert capacity.max_concurrent(big) == 1
+    assert capacity.try_acquire(big)
+    assert not capacity.try_acquire(r)
+    # Tasks that request nothing always fit, and do not hold back the ones that do not fit at all
+    assert capacity.try_acquire(TaskResources())
+    capacity.release(big)
+    assert capacity.try_acquire(big)
+    capacity.release(big)
+
+
+def test_local_capacity_acquire_waits():
+    import threading
+
+    capacity = LocalCapacity(cpu=1, mem=None)
+    r = TaskResources(cpu=1)
+    capacity.acquire(r)
+    acquired = threading.Event()
+
+    def acquire():
+        capacity.acquire(r)
+        acquired.set()
+
+    t = threading.Thread(target=acquire)
+    t.start()
+    assert not acquired.wait(0.1)
+    capacity.release(r)
+    assert acquired.wait(5)
+    t.join()
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Memory limits are measured with /proc")
+def test_memory_limit_map_task_with_large_parent(monkeypatch):
+    monkeypatch.setenv("FLYTE_LOCAL_MAP_EXECUTOR", "process")
+
+    @task(limits=Resources(mem="100Mi"))
+    def allocate(mb: int) -> int:
+        return len(bytearray(mb * 1024 * 1024))
+
+    # The forked workers inherit this, only what the task allocates counts against its limit
+    parent = bytearray(300 * 1024 * 1024)
+    assert map_task(allocate)(mb=[20, 20]) == [20 * 1024 * 1024] * 2
+    with pytest.raises(Exception):
+        map_task(allocate)(mb=[200, 20])
+    del parent
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Memory limits are measured with /proc")
+def test_memory_limit():
+    with memory_limit(50 * 1024 * 1024):
+        bytearray(10 * 1024 * 1024)
+        with pytest.raises(MemoryError):
+            bytearray(100 * 1024 * 1024)
+    bytearray(100 * 1024 * 1024)
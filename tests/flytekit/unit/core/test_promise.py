@@ -47,6 +47,29 @@ def test_create_and_link_node():
     assert len(p.ref.node.bindings) == 0
 
 
+def test_create_and_link_node_upstream_nodes():
+    @task
+    def t1(a: int) -> int:
+        return a
+
+    @task
+    def t2(a: typing.List[int], b: int) -> int:
+        return b
+
+    ctx = context_manager.FlyteContext.current_context().with_compilation_state(CompilationState(prefix=""))
+    x = create_and_link_node(ctx, t1, a=1)
+    y = create_and_link_node(ctx, t1, a=2)
+    p = create_and_link_node(ctx, t2, a=[y, x, y], b=x)
+    # Every upstream node once, in the order they were bound
+    assert [n.id for n in p.ref.node.upstream_nodes] == ["n1", "n0"]
+
+    y.ref.node.runs_before(p.ref.node)
+    z = create_and_link_node(ctx, t1, a=3)
+    z.ref.node.runs_before(p.ref.node)
+    z.ref.node.runs_before(p.ref.node)
+    assert [n.id for n in p.ref.node.upstream_nodes] == ["n1", "n0", "n3"]
+
+
 def test_create_and_link_node_from_remote():
     @task
     def t1() -> None:
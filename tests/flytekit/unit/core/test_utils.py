@@ -23,6 +23,9 @@ from tests.flytekit.unit.test_translator import default_img
         ("test$", "test"),
         ("te$t$", "tet"),
         ("t" * 64, f"da4b348ebe-{'t'*52}"),
+        ("dn12", "dn12"),
+        ("a--b", "a--b"),
+        ("-a1", "a1"),
     ],
 )
 def test_dnsify(input, expected):
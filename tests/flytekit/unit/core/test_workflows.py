@@ -435,3 +435,154 @@ def test_compile_wf_at_compile_time():
             t4()
 
         assert ctx.compilation_state is None
+
+
+def test_concurrent_local_execution(monkeypatch):
+    import threading
+
+    monkeypatch.setenv("FLYTE_LOCAL_WORKFLOW_CONCURRENCY", "2")
+    # Both t1 nodes have to be running at the same time to get past the barrier
+    barrier = threading.Barrier(2, timeout=10)
+
+    @task
+    def t1(a: int) -> int:
+        barrier.wait()
+        return a + 1
+
+    @task
+    def t2(a: int, b: int) -> int:
+        return a + b
+
+    @workflow
+    def wf(a: int, b: int) -> typing.Tuple[int, typing.List[int]]:
+        x = t1(a=a)
+        y = t1(a=b)
+        return t2(a=x, b=y), [x, y]
+
+    assert wf(a=1, b=2) == (5, [2, 3])
+
+
+@pytest.mark.parametrize(
+    "failure_policy, expected",
+    [
+        (WorkflowFailurePolicy.FAIL_IMMEDIATELY, ["fail", "ok"]),
+        (WorkflowFailurePolicy.FAIL_AFTER_EXECUTABLE_NODES_COMPLETE, ["after_ok", "fail", "ok"]),
+    ],
+)
+def test_concurrent_local_execution_failure_policy(failure_policy, expected, monkeypatch):
+    import threading
+    import time
+
+    monkeypatch.setenv("FLYTE_LOCAL_WORKFLOW_CONCURRENCY", "2")
+    executed = []
+    failed = threading.Event()
+
+    @task
+    def fail():
+        executed.append("fail")
+        failed.set()
+        raise ValueError("fail")
+
+    @task
+    def ok():
+        failed.wait(timeout=10)
+        time.sleep(0.2)
+        executed.append("ok")
+
+    @task
+    def after_fail():
+        executed.append("after_fail")
+
+    @task
+    def after_ok():
+        executed.append("after_ok")
+
+    @workflow(failure_policy=failure_policy)
+    def wf():
+        fail() >> after_fail()
+        ok() >> after_ok()
+
+    with pytest.raises(ValueError):
+        wf()
+    assert sorted(executed) == expected
+
+
+def test_concurrent_local_execution_processes(monkeypatch):
+    monkeypatch.setenv("FLYTE_LOCAL_WORKFLOW_CONCURRENCY", "2")
+    monkeypatch.setenv("FLYTE_LOCAL_WORKFLOW_EXECUTOR", "process")
+
+    @task
+    def pid(a: int) -> str:
+        return f"{a}-{os.getpid()}"
+
+    @workflow
+    def wf() -> typing.List[str]:
+        return [pid(a=1), pid(a=2)]
+
+    outputs = wf()
+    assert [o.split("-")[0] for o in outputs] == ["1", "2"]
+    assert all(int(o.split("-")[1]) != os.getpid() for o in outputs)
+
+
+def test_concurrent_local_execution_resources(monkeypatch):
+    import threading
+    import time
+
+    from flytekit import Resources
+
+    monkeypatch.setenv("FLYTE_LOCAL_WORKFLOW_CONCURRENCY", "4")
+    monkeypatch.setenv("FLYTE_LOCAL_CPU", "1")
+    lock = threading.Lock()
+    running = []
+    max_running = []
+
+    @task(requests=Resources(cpu="1"))
+    def t1(a: int) -> int:
+        with lock:
+            running.append(a)
+            max_running.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(a)
+        return a
+
+    @workflow
+    def wf() -> typing.List[int]:
+        return [t1(a=1), t1(a=2), t1(a=3)]
+
+    assert wf() == [1, 2, 3]
+    # Only one task fits into the local capacity at a time
+    assert max(max_running) == 1
+
+
+def test_concurrent_local_execution_map_task_resources(monkeypatch):
+    import threading
+    import time
+
+    from flytekit import Resources
+    from flytekit.core.array_node_map_task import map_task
+
+    monkeypatch.setenv("FLYTE_LOCAL_WORKFLOW_CONCURRENCY", "2")
+    monkeypatch.setenv("FLYTE_LOCAL_MAP_EXECUTOR", "thread")
+    monkeypatch.setenv("FLYTE_LOCAL_CPU", "2")
+    lock = threading.Lock()
+    running = []
+    max_running = []
+
+    @task(requests=Resources(cpu="1"))
+    def t1(a: int) -> int:
+        with lock:
+            running.append(a)
+            max_running.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(a)
+        return a
+
+    @workflow
+    def wf() -> typing.Tuple[typing.List[int], int]:
+        return map_task(t1, concurrency=4)(a=[1, 2, 3, 4]), t1(a=5)
+
+    assert wf() == ([1, 2, 3, 4], 5)
+    # The map task instances and the other node acquire their resources from the same capacity
+    assert max(max_running) == 2
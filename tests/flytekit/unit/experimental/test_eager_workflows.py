@@ -1,6 +1,7 @@
 import asyncio
 import os
 import sys
+import threading
 import typing
 from pathlib import Path
 
@@ -11,6 +12,7 @@ from hypothesis import given, settings
 from flytekit import dynamic, task, workflow
 from flytekit.exceptions.user import FlyteValidationException
 from flytekit.experimental import EagerException, eager
+from flytekit.experimental.eager_function import LocalTaskRunner
 from flytekit.types.directory import FlyteDirectory
 from flytekit.types.file import FlyteFile
 from flytekit.types.structured import StructuredDataset
@@ -217,6 +219,70 @@ def test_local_workflow_within_eager_workflow_exception(x_input: int):
         asyncio.run(eager_wf(x=x_input))
 
 
+_barrier = threading.Barrier(3, timeout=10)
+
+
+@task
+def wait_for_others(x: int) -> int:
+    # Only returns once three tasks run at the same time
+    _barrier.wait()
+    return x
+
+
+@task
+def get_pid(x: int) -> int:
+    return os.getpid()
+
+
+def test_eager_workflow_local_concurrency(monkeypatch):
+    """Tasks awaited together in a local eager workflow run concurrently."""
+    monkeypatch.setenv("FLYTE_LOCAL_EAGER_CONCURRENCY", "3")
+
+    @eager
+    async def eager_wf(n: int) -> typing.List[int]:
+        return await asyncio.gather(*[wait_for_others(x=i) for i in range(n)])
+
+    assert asyncio.run(eager_wf(n=3)) == [0, 1, 2]
+
+
+@pytest.mark.parametrize("executor", ["process", "serial"])
+def test_eager_workflow_local_executor(executor, monkeypatch):
+    monkeypatch.setenv("FLYTE_LOCAL_EAGER_EXECUTOR", executor)
+
+    @eager
+    async def eager_wf(n: int) -> typing.List[int]:
+        return await asyncio.gather(*[get_pid(x=i) for i in range(n)])
+
+    pids = asyncio.run(eager_wf(n=2))
+    if executor == "process":
+        assert os.getpid() not in pids and len(set(pids)) == 2
+    else:
+        assert pids == [os.getpid()] * 2
+
+    @eager
+    async def failing_wf(x: int) -> int:
+        return await raises_exc(x=x)
+
+    with pytest.raises(EagerException):
+        asyncio.run(failing_wf(x=0))
+
+
+def test_eager_local_runner_runs_workflows_off_the_loop():
+    @task
+    def thread_name(x: int) -> str:
+        return threading.current_thread().name
+
+    @workflow
+    def wf(x: int) -> str:
+        return thread_name(x=x)
+
+    async def run() -> str:
+        # The workflow calls its tasks synchronously, which must not block the event loop
+        return await LocalTaskRunner().run_workflow(wf, {"x": 1})
+
+    assert asyncio.run(run()).startswith("flyte-eager")
+
+
 @task
 def create_structured_dataset() -> StructuredDataset:
     import pandas as pd
@@ -166,3 +166,21 @@ def test_launch_plan_with_fixed_input():
     assert len(task_spec.template.interface.outputs) == 1
     assert len(task_spec.template.nodes) == 1
     assert len(task_spec.template.nodes[0].inputs) == 2
+
+
+def test_sub_workflows_serialized_once():
+    @task
+    def t1(a: int) -> int:
+        return a
+
+    @workflow
+    def sub_wf(a: int) -> int:
+        return t1(a=a)
+
+    @workflow
+    def wf(a: int) -> typing.List[int]:
+        return [sub_wf(a=a), sub_wf(a=a), sub_wf(a=a)]
+
+    spec = get_serializable(OrderedDict(), serialization_settings, wf)
+    assert len(spec.template.nodes) == 3
+    assert [s.id.name for s in spec.sub_workflows] == [sub_wf.name]
@@ -64,3 +64,32 @@ def test_to_html():
     tf = PandasDataFrameTransformer()
     output = tf.to_html(FlyteContextManager.current_context(), df, pd.DataFrame)
     assert df.describe().to_html() == output
+
+
+def test_schema_write_options():
+    import os
+
+    import pandas as pd
+    import pyarrow.parquet as pq
+    from typing_extensions import Annotated
+
+    from flytekit.types.schema import SchemaWriteOptions
+
+    ctx = FlyteContextManager.current_context()
+    df = pd.DataFrame({"x": list(range(10)), "y": [str(i % 2) for i in range(10)]})
+    t = Annotated[FlyteSchema[kwtypes(x=int, y=str)], SchemaWriteOptions(rows_per_chunk=3, row_group_size=2)]
+    lt = TypeEngine.to_literal_type(t)
+    lv = TypeEngine.to_literal(ctx, df, t, lt)
+
+    local_dir = ctx.file_access.get_random_local_directory()
+    ctx.file_access.get_data(lv.scalar.schema.uri, local_dir, is_multipart=True)
+    files = sorted(os.listdir(local_dir))
+    assert files == ["00000", "00001", "00002", "00003"]
+    assert pq.ParquetFile(os.path.join(local_dir, files[0])).metadata.num_row_groups == 2
+
+    schema = TypeEngine.to_python_value(ctx, lv, FlyteSchema[kwtypes(x=int, y=str)])
+    assert schema.open().all().reset_index(drop=True).equals(df)
+    assert [len(chunk) for chunk in schema.open().iter()] == [3, 3, 3, 1]
+
+    with pytest.raises(ValueError):
+        SchemaWriteOptions(rows_per_chunk=0)
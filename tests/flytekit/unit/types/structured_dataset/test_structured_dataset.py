@@ -1,6 +1,8 @@
 import os
 import tempfile
 import typing
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
 import pyarrow as pa
 import pytest
@@ -13,13 +15,17 @@ from flytekit.core.base_task import kwtypes
 from flytekit.core.context_manager import ExecutionState, FlyteContext, FlyteContextManager
 from flytekit.core.data_persistence import FileAccessProvider
 from flytekit.core.task import task
-from flytekit.core.type_engine import TypeEngine
+from flytekit.core.type_engine import BatchSize, TypeEngine
 from flytekit.core.workflow import workflow
 from flytekit.models import literals
 from flytekit.models.literals import StructuredDatasetMetadata
 from flytekit.models.types import SchemaType, SimpleType, StructuredDatasetType
+from flytekit.types.structured import basic_dfs
 from flytekit.types.structured.structured_dataset import (
     PARQUET,
+    CollectStats,
+    ParquetPartitioning,
+    RowFilter,
     StructuredDataset,
     StructuredDatasetDecoder,
     StructuredDatasetEncoder,
@@ -290,6 +296,44 @@ def test_slash_register():
     assert res is not None
 
 
+def test_handler_lookup_cache():
+    class CacheDF:
+        ...
+
+    class TempEncoder(StructuredDatasetEncoder):
+        def __init__(self, fmt: str):
+            super().__init__(CacheDF, None, supported_format=fmt)
+
+        def encode(
+            self,
+            ctx: FlyteContext,
+            structured_dataset: StructuredDataset,
+            structured_dataset_type: StructuredDatasetType,
+        ) -> literals.StructuredDataset:
+            return literals.StructuredDataset(uri="")
+
+    first = TempEncoder("one")
+    StructuredDatasetTransformerEngine.register(first)
+    assert StructuredDatasetTransformerEngine.get_encoder(CacheDF, "s3", "") is first
+    assert (
+        StructuredDatasetTransformerEngine._HANDLER_CACHE[
+            (id(StructuredDatasetTransformerEngine.ENCODERS), CacheDF, "s3", "")
+        ]
+        is first
+    )
+
+    # Registering a generic handler changes how the same lookup resolves, so the cache must not be stale
+    generic = TempEncoder("")
+    StructuredDatasetTransformerEngine.register(generic)
+    assert StructuredDatasetTransformerEngine.get_encoder(CacheDF, "s3", "") is generic
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(lambda _: StructuredDatasetTransformerEngine.get_encoder(CacheDF, "gs", "one"), range(32))
+        )
+    assert all(r is first for r in results)
+
+
 def test_sd():
     sd = StructuredDataset(dataframe="hi")
     sd.uri = "my uri"
@@ -508,3 +552,113 @@ def test_list_of_annotated():
     @task
     def no_op(data: WineDataset) -> typing.List[WineDataset]:
         return [data]
+
+
+def test_parquet_partitioning_annotation():
+    ctx = FlyteContextManager.current_context()
+    partitioned_df = Annotated[pd.DataFrame, ParquetPartitioning(max_rows_per_file=1)]
+    lt = TypeEngine.to_literal_type(partitioned_df)
+    lit = TypeEngine.to_literal(ctx, df, partitioned_df, lt)
+    assert sorted(os.listdir(lit.scalar.structured_dataset.uri)) == ["00000", "00001"]
+    assert TypeEngine.to_python_value(ctx, lit, pd.DataFrame).equals(df)
+
+    # A partitioning set on the StructuredDataset itself takes precedence over the annotation
+    sd = StructuredDataset(dataframe=df, partitioning=ParquetPartitioning(max_rows_per_file=2))
+    lit = TypeEngine.to_literal(ctx, sd, Annotated[StructuredDataset, ParquetPartitioning(max_rows_per_file=1)], lt)
+    assert os.listdir(lit.scalar.structured_dataset.uri) == ["00000"]
+
+    with pytest.raises(ValueError):
+        ParquetPartitioning(max_rows_per_file=0)
+
+
+def test_iter_batch_size_annotation():
+    ctx = FlyteContextManager.current_context()
+
+    def frames():
+        for i in range(3):
+            yield pd.DataFrame({"Name": ["Tom", "Joseph"], "Age": [i, i]})
+
+    lt = TypeEngine.to_literal_type(StructuredDataset)
+    lit = TypeEngine.to_literal(ctx, StructuredDataset(dataframe=frames()), StructuredDataset, lt)
+
+    sd = TypeEngine.to_python_value(ctx, lit, StructuredDataset)
+    assert [len(df) for df in sd.open(pd.DataFrame).iter()] == [2, 2, 2]
+    assert [len(df) for df in sd.open(pd.DataFrame).iter(batch_size=4)] == [4, 2]
+
+    sd = TypeEngine.to_python_value(ctx, lit, Annotated[StructuredDataset, BatchSize(3)])
+    assert [len(df) for df in sd.open(pd.DataFrame).iter()] == [3, 3]
+    assert len(sd.open(pd.DataFrame).all()) == 6
+
+
+def test_row_filter():
+    ctx = FlyteContextManager.current_context()
+    lt = TypeEngine.to_literal_type(pd.DataFrame)
+    lit = TypeEngine.to_literal(ctx, df, pd.DataFrame, lt)
+
+    filtered_df = TypeEngine.to_python_value(ctx, lit, Annotated[pd.DataFrame, RowFilter([("Age", ">", 20)])])
+    assert list(filtered_df["Name"]) == ["Joseph"]
+
+    sd = TypeEngine.to_python_value(ctx, lit, Annotated[StructuredDataset, RowFilter([("Age", "<", 21)])])
+    assert list(sd.open(pd.DataFrame).all()["Name"]) == ["Tom"]
+    assert list(sd.open(pd.DataFrame).filter([("Name", "=", "Joseph")]).all()["Age"]) == [22]
+    assert [c.column("Age").to_pylist() for c in sd.open(pa.Table).iter()] == [[22]]
+
+    csv_literal = literals.StructuredDataset(
+        uri=lit.scalar.structured_dataset.uri, metadata=StructuredDatasetMetadata(StructuredDatasetType(format="csv"))
+    )
+    with mock.patch.object(
+        StructuredDatasetTransformerEngine, "get_decoder", return_value=basic_dfs.CSVToPandasDecodingHandler()
+    ):
+        with pytest.raises(ValueError, match="does not support row filters"):
+            StructuredDatasetTransformerEngine().open_as(
+                ctx, csv_literal, pd.DataFrame, csv_literal.metadata, filters=RowFilter([("Age", ">", 20)])
+            )
+
+
+def test_collect_stats():
+    @task
+    def produce() -> Annotated[pd.DataFrame, CollectStats()]:
+        return pd.DataFrame({"Name": ["Tom", None, "Ann"], "Age": [20, 22, 30]})
+
+    @task
+    def plain() -> pd.DataFrame:
+        return pd.DataFrame({"Age": [1]})
+
+    @task
+    def consume(sd: StructuredDataset) -> int:
+        assert sd.stats.columns["Name"].null_count == 1
+        assert (sd.stats.columns["Age"].min, sd.stats.columns["Age"].max) == (20, 30)
+        return sd.stats.num_rows
+
+    @task
+    def passthrough(sd: StructuredDataset) -> StructuredDataset:
+        return sd
+
+    @task
+    def no_stats(sd: StructuredDataset) -> bool:
+        return sd.stats is None
+
+    @workflow
+    def wf() -> typing.Tuple[int, int, bool]:
+        return consume(sd=produce()), consume(sd=passthrough(sd=produce())), no_stats(sd=plain())
+
+    assert wf() == (3, 3, True)
+
+
+def test_lazy_arrow_dataset():
+    import pyarrow.dataset as ds
+
+    @task
+    def produce() -> pd.DataFrame:
+        return pd.DataFrame({"Name": ["Tom", "Joseph", "Ann"], "Age": [20, 22, 30]})
+
+    @task
+    def consume(dataset: Annotated[ds.Dataset, kwtypes(Age=int), RowFilter([("Age", ">", 20)])]) -> int:
+        assert dataset.schema.names == ["Age"]
+        return sum(dataset.to_table().column("Age").to_pylist())
+
+    @workflow
+    def wf() -> int:
+        return consume(dataset=produce())
+
+    assert wf() == 52
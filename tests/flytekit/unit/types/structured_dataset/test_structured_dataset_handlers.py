@@ -1,18 +1,32 @@
+import os
+import tempfile
+import types
 import typing
 
 import mock
 import pyarrow as pa
 import pytest
+from typing_extensions import Annotated
 
+from flytekit import task, workflow
+from flytekit.configuration import DataConfig
 from flytekit.core import context_manager
 from flytekit.core.base_task import kwtypes
+from flytekit.core.context_manager import ExecutionState
+from flytekit.core.data_persistence import FileAccessProvider
+from flytekit.core.type_engine import TypeEngine
+from flytekit.models import literals
 from flytekit.models.literals import StructuredDatasetMetadata
-from flytekit.models.types import StructuredDatasetType
-from flytekit.types.structured import basic_dfs
+from flytekit.models.types import LiteralType, SimpleType, StructuredDatasetType
+from flytekit.types.structured import arrow_ipc, basic_dfs
 from flytekit.types.structured.structured_dataset import (
+    ColumnStats,
+    ParquetPartitioning,
+    RowFilter,
     StructuredDataset,
     StructuredDatasetDecoder,
     StructuredDatasetEncoder,
+    StructuredDatasetStats,
     StructuredDatasetTransformerEngine,
 )
 
@@ -36,6 +50,245 @@ def test_pandas():
     assert df.equals(df2)
 
 
+@pytest.mark.parametrize("partitioning", [None, ParquetPartitioning(max_rows_per_file=1)])
+def test_pandas_column_subset_keeps_index(partitioning):
+    df = pd.DataFrame({"a": [1, 2], "b": ["u", "v"]}, index=pd.Index(["x", "y"], name="key"))
+    ctx = context_manager.FlyteContextManager.current_context()
+    sd_lit = basic_dfs.PandasToParquetEncodingHandler().encode(
+        ctx, StructuredDataset(dataframe=df, partitioning=partitioning), StructuredDatasetType(format="parquet")
+    )
+    a = StructuredDatasetType.DatasetColumn("a", LiteralType(simple=SimpleType.INTEGER))
+    metadata = StructuredDatasetMetadata(StructuredDatasetType(columns=[a], format="parquet"))
+
+    decoder = basic_dfs.ParquetToPandasDecodingHandler()
+    # The index is restored like pd.read_parquet(columns=...) does
+    assert decoder.decode(ctx, sd_lit, metadata).equals(df[["a"]])
+    assert pd.concat(decoder.iter_decode(ctx, sd_lit, metadata)).equals(df[["a"]])
+
+
+@pytest.mark.parametrize(
+    "partitioning, files",
+    [
+        (ParquetPartitioning(max_rows_per_file=2), ["00000", "00001", "00002"]),
+        (ParquetPartitioning(max_bytes_per_file=1), ["00000", "00001", "00002", "00003", "00004"]),
+        (ParquetPartitioning(partition_cols=["Group"]), ["Group=a/part-0.parquet", "Group=b/part-0.parquet"]),
+    ],
+)
+def test_partitioned_parquet(partitioning, files):
+    df = pd.DataFrame({"Name": ["Tom", "Joseph", "Ann", "Bo", "Cy"], "Age": [20, 22, 1, 2, 3], "Group": list("abaab")})
+    ctx = context_manager.FlyteContextManager.current_context()
+    sd_type = StructuredDatasetType(format="parquet")
+
+    sd_lit = basic_dfs.PandasToParquetEncodingHandler().encode(
+        ctx, StructuredDataset(dataframe=df, partitioning=partitioning), sd_type
+    )
+    written = sorted(os.path.relpath(os.path.join(r, f), sd_lit.uri) for r, _, fs in os.walk(sd_lit.uri) for f in fs)
+    assert written == files
+    df2 = basic_dfs.ParquetToPandasDecodingHandler().decode(ctx, sd_lit, StructuredDatasetMetadata(sd_type))
+    if partitioning.partition_cols:
+        df2 = df2.astype({"Group": str}).sort_values("Age", ignore_index=True)
+        df = df.sort_values("Age", ignore_index=True)
+    assert df.equals(df2[df.columns])
+
+    table = pa.Table.from_pandas(df)
+    sd_lit = basic_dfs.ArrowToParquetEncodingHandler().encode(
+        ctx, StructuredDataset(dataframe=table, partitioning=partitioning), sd_type
+    )
+    table2 = basic_dfs.ParquetToArrowDecodingHandler().decode(ctx, sd_lit, StructuredDatasetMetadata(sd_type))
+    assert table2.num_rows == table.num_rows
+
+
+def test_streaming_parquet():
+    ctx = context_manager.FlyteContextManager.current_context()
+    sd_type = StructuredDatasetType(format="parquet")
+
+    def frames():
+        yield pd.DataFrame({"Name": ["Tom", "Joseph", "Ann"], "Age": [20, 22, 1]})
+        yield pa.Table.from_pydict({"Name": ["Bo", "Cy"], "Age": [2, 3]})
+
+    sd_lit = basic_dfs.GeneratorToParquetEncodingHandler().encode(ctx, StructuredDataset(dataframe=frames()), sd_type)
+    metadata = StructuredDatasetMetadata(sd_type)
+
+    pandas_decoder = basic_dfs.ParquetToPandasDecodingHandler()
+    assert [len(df) for df in pandas_decoder.iter_decode(ctx, sd_lit, metadata)] == [3, 2]
+    assert [len(df) for df in pandas_decoder.iter_decode(ctx, sd_lit, metadata, batch_size=4)] == [4, 1]
+    assert list(pd.concat(pandas_decoder.iter_decode(ctx, sd_lit, metadata, batch_size=4))["Age"]) == [20, 22, 1, 2, 3]
+
+    arrow_decoder = basic_dfs.ParquetToArrowDecodingHandler()
+    tables = list(arrow_decoder.iter_decode(ctx, sd_lit, metadata, batch_size=2))
+    assert [t.num_rows for t in tables] == [2, 2, 1]
+    assert pa.concat_tables(tables).equals(arrow_decoder.decode(ctx, sd_lit, metadata))
+
+    empty = (df for df in [])
+    with pytest.raises(ValueError):
+        basic_dfs.GeneratorToParquetEncodingHandler().encode(ctx, StructuredDataset(dataframe=empty), sd_type)
+
+    # Generators are encoded as the dataframe of a StructuredDataset, but are not dataframe types of their own
+    lt = TypeEngine.to_literal_type(StructuredDataset)
+    lit = StructuredDatasetTransformerEngine().to_literal(
+        ctx, StructuredDataset(dataframe=frames()), StructuredDataset, lt
+    )
+    assert lit.scalar.structured_dataset.metadata.structured_dataset_type.format == "parquet"
+    assert not isinstance(TypeEngine.get_transformer(types.GeneratorType), StructuredDatasetTransformerEngine)
+
+
+def test_parquet_row_filter():
+    ctx = context_manager.FlyteContextManager.current_context()
+    sd_type = StructuredDatasetType(format="parquet")
+    metadata = StructuredDatasetMetadata(sd_type)
+
+    def frames():
+        for i in range(4):
+            yield pd.DataFrame({"Age": [i * 10, i * 10 + 1], "Group": ["a", "b"]})
+
+    sd_lit = basic_dfs.GeneratorToParquetEncodingHandler().encode(ctx, StructuredDataset(dataframe=frames()), sd_type)
+    row_filter = RowFilter([("Age", ">=", 20), ("Group", "=", "a")])
+
+    df = basic_dfs.ParquetToPandasDecodingHandler().decode(ctx, sd_lit, metadata, filters=row_filter)
+    assert list(df["Age"]) == [20, 30]
+    table = basic_dfs.ParquetToArrowDecodingHandler().decode(ctx, sd_lit, metadata, filters=row_filter)
+    assert table.column("Age").to_pylist() == [20, 30]
+
+    # The first two row groups are skipped based on their statistics
+    chunks = list(basic_dfs.ParquetToPandasDecodingHandler().iter_decode(ctx, sd_lit, metadata, filters=row_filter))
+    assert [list(c["Age"]) for c in chunks] == [[20], [30]]
+
+    # Whole partitions are skipped too
+    df = pd.DataFrame({"Age": [1, 2, 3, 4], "Group": list("abab")})
+    sd_lit = basic_dfs.PandasToParquetEncodingHandler().encode(
+        ctx, StructuredDataset(dataframe=df, partitioning=ParquetPartitioning(partition_cols=["Group"])), sd_type
+    )
+    chunks = list(
+        basic_dfs.ParquetToArrowDecodingHandler().iter_decode(
+            ctx, sd_lit, metadata, filters=RowFilter([("Group", "=", "b")])
+        )
+    )
+    assert [c.column("Age").to_pylist() for c in chunks] == [[2, 4]]
+
+
+def test_parallel_parquet_read():
+    import pyarrow.parquet as pq
+
+    ctx = context_manager.FlyteContextManager.current_context()
+    # Laid out like a Spark output
+    uri = ctx.file_access.get_random_local_directory()
+    for i in range(6):
+        pq.write_table(pa.table({"a": [2 * i, 2 * i + 1]}), os.path.join(uri, f"part-{i:05}.parquet"))
+    open(os.path.join(uri, "_SUCCESS"), "w").close()
+
+    table = basic_dfs.read_parquet_table(ctx, uri, max_bytes_in_flight=1)
+    assert table.column("a").to_pylist() == list(range(12))
+    sd_lit = literals.StructuredDataset(uri=uri)
+    sd_type = StructuredDatasetType(format="parquet")
+    df = basic_dfs.ParquetToPandasDecodingHandler().decode(
+        ctx, sd_lit, StructuredDatasetMetadata(sd_type), filters=RowFilter([("a", ">=", 9)])
+    )
+    assert list(df["a"]) == [9, 10, 11]
+
+    df = pd.DataFrame({"Age": [1, 2, 3, 4], "Group": list("abab")})
+    sd_lit = basic_dfs.PandasToParquetEncodingHandler().encode(
+        ctx, StructuredDataset(dataframe=df, partitioning=ParquetPartitioning(partition_cols=["Group"])), sd_type
+    )
+    table = basic_dfs.read_parquet_table(ctx, sd_lit.uri)
+    assert sorted(zip(table.column("Age").to_pylist(), table.column("Group").to_pylist())) == [
+        (1, "a"),
+        (2, "b"),
+        (3, "a"),
+        (4, "b"),
+    ]
+
+
+def test_parquet_stats():
+    ctx = context_manager.FlyteContextManager.current_context()
+    df = pd.DataFrame({"Name": ["Tom", None, "Ann", "Bob"], "Age": [20, 22, 30, 5]})
+    sd = StructuredDataset(dataframe=df, partitioning=ParquetPartitioning(max_rows_per_file=3))
+    sd_lit = basic_dfs.PandasToParquetEncodingHandler().encode(ctx, sd, StructuredDatasetType(format="parquet"))
+
+    stats = basic_dfs.PandasToParquetEncodingHandler().collect_stats(ctx, sd_lit)
+    assert (stats.num_rows, stats.num_files) == (4, 2)
+    assert stats.num_bytes > 0
+    assert stats.columns["Name"] == ColumnStats(null_count=1, min="Ann", max="Tom")
+    assert stats.columns["Age"] == ColumnStats(null_count=0, min=5, max=30)
+    assert StructuredDatasetStats.from_json(stats.to_json()) == stats
+
+    sd = StructuredDataset(dataframe=df, collect_stats=True)
+    with mock.patch.object(arrow_ipc, "read_arrow_ipc") as read_arrow_ipc:
+        arrow_ipc.PandasToArrowIPCEncodingHandler().encode(ctx, sd, StructuredDatasetType())
+    # The statistics come from the table the encoder holds rather than the file it wrote
+    read_arrow_ipc.assert_not_called()
+    stats = sd.stats
+    assert stats.num_rows == 4
+    assert stats.columns["Name"].null_count == 1
+
+
+def test_arrow_ipc():
+    df = pd.DataFrame({"Name": ["Tom", "Joseph", "Ann"], "Age": [20, 22, 30]})
+    ctx = context_manager.FlyteContextManager.current_context()
+    sd_type = StructuredDatasetType(format="arrow")
+    sd_lit = arrow_ipc.PandasToArrowIPCEncodingHandler().encode(ctx, StructuredDataset(dataframe=df), sd_type)
+    assert sd_lit.metadata.structured_dataset_type.format == "arrow"
+    assert arrow_ipc._handoff_get(sd_lit.uri) is None
+
+    age = StructuredDatasetType.DatasetColumn("Age", LiteralType(simple=SimpleType.INTEGER))
+    metadata = StructuredDatasetMetadata(StructuredDatasetType(columns=[age]))
+    table = arrow_ipc.ArrowIPCToArrowDecodingHandler().decode(ctx, sd_lit, metadata)
+    assert table.column_names == ["Age"]
+    df2 = arrow_ipc.ArrowIPCToPandasDecodingHandler().decode(
+        ctx, sd_lit, StructuredDatasetMetadata(sd_type), filters=RowFilter([("Age", ">", 20)])
+    )
+    assert list(df2["Name"]) == ["Joseph", "Ann"]
+    chunks = list(arrow_ipc.ArrowIPCToPandasDecodingHandler().iter_decode(ctx, sd_lit, metadata, batch_size=2))
+    assert [list(c["Age"]) for c in chunks] == [[20, 22], [30]]
+
+
+def test_arrow_ipc_handoff():
+    table = pa.Table.from_pydict({"a": [1, 2, 3]})
+    with context_manager.FlyteContextManager.with_context(
+        context_manager.FlyteContextManager.current_context().with_execution_state(
+            context_manager.FlyteContextManager.current_context().execution_state.with_params(
+                mode=ExecutionState.Mode.LOCAL_TASK_EXECUTION
+            )
+        )
+    ) as ctx:
+        sd_type = StructuredDatasetType(format="arrow")
+        sd_lit = arrow_ipc.ArrowToArrowIPCEncodingHandler().encode(ctx, StructuredDataset(dataframe=table), sd_type)
+        # The very same table is handed to the consumer, and the file is written too
+        decoded = arrow_ipc.ArrowIPCToArrowDecodingHandler().decode(ctx, sd_lit, StructuredDatasetMetadata(sd_type))
+        assert decoded is table
+        assert os.path.exists(os.path.join(sd_lit.uri, "00000"))
+
+        arrow_ipc.clear_handoff()
+        decoded = arrow_ipc.ArrowIPCToArrowDecodingHandler().decode(ctx, sd_lit, StructuredDatasetMetadata(sd_type))
+        assert decoded is not table
+        assert decoded.equals(table)
+
+        with mock.patch.object(arrow_ipc, "HANDOFF_MAX_BYTES", table.nbytes):
+            first = arrow_ipc.write_arrow_ipc(ctx, table, None)
+            second = arrow_ipc.write_arrow_ipc(ctx, table, None)
+            assert arrow_ipc._handoff_get(first) is None
+            assert arrow_ipc._handoff_get(second) is table
+        arrow_ipc.clear_handoff()
+
+
+def test_arrow_ipc_handoff_cleared_after_execution():
+    @task
+    def produce() -> Annotated[StructuredDataset, "arrow"]:
+        return StructuredDataset(dataframe=pa.Table.from_pydict({"a": [1, 2, 3]}))
+
+    @task
+    def consume(sd: Annotated[StructuredDataset, "arrow"]) -> int:
+        assert len(arrow_ipc._handoff_tables) == 1
+        return sd.open(pa.Table).all().num_rows
+
+    @workflow
+    def wf() -> int:
+        return consume(sd=produce())
+
+    assert wf() == 3
+    # The tables of an execution are not kept past it
+    assert not arrow_ipc._handoff_tables
+
+
 def test_csv():
     df = pd.DataFrame({"Name": ["Tom", "Joseph"], "Age": [20, 22]})
     encoder = basic_dfs.PandasToCSVEncodingHandler()
@@ -51,49 +304,69 @@ def test_csv():
 
 
 @mock.patch("pandas.DataFrame.to_parquet")
-@mock.patch("pandas.read_parquet")
-@mock.patch("flytekit.types.structured.basic_dfs.get_fsspec_storage_options")
-def test_pandas_to_parquet_azure_storage_options(mock_get_fsspec_storage_options, mock_read_parquet, mock_to_parquet):
+@mock.patch("pyarrow.parquet.read_table")
+@mock.patch("flytekit.core.data_persistence.fsspec.filesystem")
+@mock.patch("flytekit.core.data_persistence.get_fsspec_storage_options")
+def test_pandas_to_parquet_azure_storage_options(
+    mock_get_fsspec_storage_options, mock_filesystem, mock_read_table, mock_to_parquet
+):
     df = pd.DataFrame({"Name": ["Tom", "Joseph"], "Age": [20, 22]})
     encoder = basic_dfs.PandasToParquetEncodingHandler()
     decoder = basic_dfs.ParquetToPandasDecodingHandler()
 
     mock_get_fsspec_storage_options.return_value = {"account_name": "accountname_from_storage_options"}
-    ctx = context_manager.FlyteContextManager.current_context()
+    fa = FileAccessProvider(local_sandbox_dir=tempfile.mkdtemp(), raw_output_prefix=tempfile.mkdtemp())
+    ctx = context_manager.FlyteContextManager.current_context().with_file_access(fa).build()
     sd = StructuredDataset(dataframe=df, uri="abfs://container/parquet_df")
     sd_type = StructuredDatasetType(format="parquet")
     sd_lit = encoder.encode(ctx, sd, sd_type)
+    mock_filesystem.assert_called_with("abfs", account_name="accountname_from_storage_options")
+    calls = mock_filesystem.call_count
+    fs = mock_filesystem.return_value
     mock_to_parquet.assert_called_once()
-    write_storage_options = mock_to_parquet.call_args.kwargs["storage_options"]
-    assert write_storage_options == {"account_name": "accountname_from_storage_options"}
+    assert mock_to_parquet.call_args.args[0] is fs.open.return_value.__enter__.return_value
 
+    fs.isdir.return_value = False
     decoder.decode(ctx, sd_lit, StructuredDatasetMetadata(sd_type))
-    mock_read_parquet.assert_called_once()
-    read_storage_options = mock_read_parquet.call_args.kwargs["storage_options"]
-    read_storage_options == {"account_name": "accountname_from_storage_options"}
+    mock_read_table.assert_called_once()
+    # The filesystem is pooled, and reused for the read
+    assert mock_read_table.call_args.kwargs["filesystem"] is fs
+    assert mock_filesystem.call_count == calls
 
 
 @mock.patch("pandas.DataFrame.to_csv")
 @mock.patch("pandas.read_csv")
-@mock.patch("flytekit.types.structured.basic_dfs.get_fsspec_storage_options")
-def test_pandas_to_csv_azure_storage_options(mock_get_fsspec_storage_options, mock_read_parquet, mock_to_parquet):
+@mock.patch("flytekit.core.data_persistence.fsspec.filesystem")
+@mock.patch("flytekit.core.data_persistence.get_fsspec_storage_options")
+def test_pandas_to_csv_azure_storage_options(
+    mock_get_fsspec_storage_options, mock_filesystem, mock_read_csv, mock_to_csv
+):
     df = pd.DataFrame({"Name": ["Tom", "Joseph"], "Age": [20, 22]})
     encoder = basic_dfs.PandasToCSVEncodingHandler()
     decoder = basic_dfs.CSVToPandasDecodingHandler()
 
     mock_get_fsspec_storage_options.return_value = {"account_name": "accountname_from_storage_options"}
-    ctx = context_manager.FlyteContextManager.current_context()
+    fa = FileAccessProvider(
+        local_sandbox_dir=tempfile.mkdtemp(),
+        raw_output_prefix=tempfile.mkdtemp(),
+        data_config=DataConfig(block_size=16 * 1024 * 1024),
+    )
+    ctx = context_manager.FlyteContextManager.current_context().with_file_access(fa).build()
     sd = StructuredDataset(dataframe=df, uri="abfs://container/csv_df")
     sd_type = StructuredDatasetType(format="csv")
     sd_lit = encoder.encode(ctx, sd, sd_type)
-    mock_to_parquet.assert_called_once()
-    write_storage_options = mock_to_parquet.call_args.kwargs["storage_options"]
-    assert write_storage_options == {"account_name": "accountname_from_storage_options"}
+    mock_filesystem.assert_called_with("abfs", account_name="accountname_from_storage_options")
+    fs = mock_filesystem.return_value
+    fs.open.assert_called_once_with("abfs://container/csv_df/.csv", "wb", block_size=16 * 1024 * 1024)
+    mock_to_csv.assert_called_once()
+    assert mock_to_csv.call_args.args[0] is fs.open.return_value.__enter__.return_value
 
     decoder.decode(ctx, sd_lit, StructuredDatasetMetadata(sd_type))
-    mock_read_parquet.assert_called_once()
-    read_storage_options = mock_read_parquet.call_args.kwargs["storage_options"]
-    read_storage_options == {"account_name": "accountname_from_storage_options"}
+    fs.open.assert_called_with(
+        "abfs://container/csv_df/.csv", "rb", block_size=16 * 1024 * 1024, cache_type="readahead"
+    )
+    mock_read_csv.assert_called_once()
+    assert mock_read_csv.call_args.args[0] is fs.open.return_value.__enter__.return_value
 
 
 def test_base_isnt_instantiable():